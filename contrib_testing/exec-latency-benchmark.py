@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Measure the latency of running trivial commands with Instance.execute.
+
+`true` is run in a running instance of the local LXD `rounds` times, and the
+median and slowest latencies are printed. This needs a LXD server.
+
+    python3 contrib_testing/exec-latency-benchmark.py instance [rounds]
+"""
+
+import statistics
+import sys
+import time
+
+from pylxd import Client
+
+
+def main():
+    name = sys.argv[1]
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    instance = Client().instances.get(name)
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = instance.execute(["true"])
+        latencies.append(time.perf_counter() - start)
+        assert result.exit_code == 0, result
+
+    print(f"`true` in {name}, {rounds} rounds")
+    print(f"  median: {statistics.median(latencies) * 1000:7.1f} ms")
+    print(f"     max: {max(latencies) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
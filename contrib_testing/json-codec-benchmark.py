@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare the JSON codecs pylxd can use on a large instance listing.
+
+A synthetic `GET /1.0/instances?recursion=2` response is decoded through
+pylxd's response wrapper with each installed codec. No LXD is needed.
+
+    python3 contrib_testing/json-codec-benchmark.py [instances] [rounds]
+"""
+
+import json
+import sys
+import timeit
+
+import requests
+
+from pylxd.client import _JSON_CODECS, _APIResponse, _get_json_codec
+
+
+def instance(i):
+    return {
+        "name": f"instance-{i}",
+        "architecture": "x86_64",
+        "created_at": "2026-01-01T00:00:00Z",
+        "status": "Running",
+        "status_code": 103,
+        "type": "container",
+        "profiles": ["default"],
+        "config": {f"user.key-{k}": f"value-{k}" * 4 for k in range(20)},
+        "devices": {"root": {"path": "/", "pool": "default", "type": "disk"}},
+        "expanded_config": {f"volatile.key-{k}": "x" * 36 for k in range(20)},
+        "state": {
+            "status": "Running",
+            "status_code": 103,
+            "cpu": {"usage": 123456789},
+            "memory": {"usage": 12345678, "usage_peak": 23456789},
+            "network": {
+                f"eth{n}": {
+                    "addresses": [
+                        {
+                            "family": "inet",
+                            "address": f"10.0.{n}.{i % 250}",
+                            "netmask": "24",
+                            "scope": "global",
+                        }
+                    ],
+                    "counters": {"bytes_received": 1234, "bytes_sent": 5678},
+                    "hwaddr": "00:16:3e:00:00:00",
+                    "mtu": 1500,
+                    "state": "up",
+                    "type": "broadcast",
+                }
+                for n in range(2)
+            },
+            "processes": 42,
+        },
+        "snapshots": [
+            {"name": f"snap{s}", "created_at": "2026-01-01T00:00:00Z"} for s in range(3)
+        ],
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    body = json.dumps(
+        {"type": "sync", "metadata": [instance(i) for i in range(count)]}
+    ).encode("utf-8")
+    print(f"{count} instances, {len(body) / 1e6:.1f} MB of JSON")
+
+    raw = requests.Response()
+    raw._content = body
+    raw.encoding = "utf-8"
+    raw.status_code = 200
+
+    for name in ("json",) + _JSON_CODECS:
+        try:
+            codec = _get_json_codec(name)
+        except ImportError:
+            print(f"{name:>8}: not installed")
+            continue
+        seconds = timeit.timeit(
+            lambda: _APIResponse(raw, codec).metadata, number=rounds
+        )
+        print(f"{name:>8}: {seconds / rounds * 1000:8.1f} ms per listing")
+
+
+if __name__ == "__main__":
+    main()
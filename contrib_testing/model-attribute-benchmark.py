@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Measure how long reading and writing model attributes takes.
+
+Instances are built from a canned listing, then their attributes are read
+and set in a loop. No LXD is needed.
+
+    python3 contrib_testing/model-attribute-benchmark.py [instances] [rounds]
+"""
+
+import sys
+import timeit
+from unittest import mock
+
+from pylxd import models
+
+ATTRIBUTES = ("name", "status", "config", "profiles", "created_at", "location")
+
+
+def instance(i):
+    return {
+        "name": f"instance-{i}",
+        "architecture": "x86_64",
+        "config": {"user.role": "worker"},
+        "devices": {},
+        "ephemeral": False,
+        "profiles": ["default"],
+        "stateful": False,
+        "description": "",
+        "created_at": "2026-01-01T00:00:00Z",
+        "expanded_config": {},
+        "expanded_devices": {},
+        "location": "none",
+        "status": "Running",
+        "status_code": 103,
+        "type": "container",
+        "project": "default",
+    }
+
+
+def read(instances):
+    for obj in instances:
+        for name in ATTRIBUTES:
+            getattr(obj, name)
+
+
+def write(instances):
+    for obj in instances:
+        obj.description = "updated"
+        obj.ephemeral = True
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    client = mock.MagicMock()
+    client.server_clustered = False
+    client.api.__getitem__.return_value.get.return_value.metadata = [
+        instance(i) for i in range(count)
+    ]
+    instances = models.Instance.all(client, recursion=1)
+
+    for label, func, ops in (
+        ("read", read, len(ATTRIBUTES)),
+        ("write", write, 2),
+    ):
+        seconds = timeit.timeit(lambda: func(instances), number=rounds)
+        per_access = seconds / rounds / count / ops * 1e9
+        print(f"{label:>5}: {per_access:.0f} ns per attribute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Measure how long building models from a listing takes.
+
+`Instance.all(recursion=1)` is called against a canned listing, so only
+the construction of the Instance objects is timed. No LXD is needed.
+
+    python3 contrib_testing/model-construction-benchmark.py [instances] [rounds]
+"""
+
+import sys
+import timeit
+from unittest import mock
+
+from pylxd import models
+
+
+def instance(i):
+    return {
+        "name": f"instance-{i}",
+        "architecture": "x86_64",
+        "config": {"user.role": "worker"},
+        "devices": {},
+        "ephemeral": False,
+        "profiles": ["default"],
+        "stateful": False,
+        "description": "",
+        "created_at": "2026-01-01T00:00:00Z",
+        "expanded_config": {},
+        "expanded_devices": {},
+        "location": "none",
+        "status": "Running",
+        "status_code": 103,
+        "type": "container",
+        "project": "default",
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    client = mock.MagicMock()
+    client.server_clustered = False
+    client.api.__getitem__.return_value.get.return_value.metadata = [
+        instance(i) for i in range(count)
+    ]
+
+    seconds = timeit.timeit(
+        lambda: models.Instance.all(client, recursion=1), number=rounds
+    )
+    per_object = seconds / rounds / count * 1e6
+    print(f"{count} instances: {seconds / rounds * 1000:.1f} ms per listing")
+    print(f"{per_object:.2f} us per instance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Compare uploads of a file over the unix socket with and without sendfile.
+
+A local file is POSTed to a unix socket server which discards the body, as
+`files.put` and `Image.create` send files to LXD, once with sendfile(2) and
+once read in chunks. No LXD is needed.
+
+    python3 contrib_testing/sendfile-benchmark.py [MiB] [rounds]
+"""
+
+import contextlib
+import http.server
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+from urllib import parse
+
+from pylxd import client
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        left = int(self.headers["Content-Length"])
+        buf = bytearray(1024 * 1024)
+        while left:
+            left -= self.rfile.readinto(memoryview(buf)[: min(left, len(buf))])
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def upload(session, url, path):
+    start = time.perf_counter()
+    with open(path, "rb") as fp:
+        session.post(url, data=client._FileStream(fp)).raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "file")
+        with open(path, "wb") as f:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(size):
+                f.write(chunk)
+
+        socket_path = os.path.join(tmpdir, "unix.socket")
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http+unix://{}/1.0/images".format(parse.quote(socket_path, safe=""))
+        session = client.get_session_for_url(url)
+
+        print(f"{size} MiB upload, best of {rounds}")
+        for name, patch in (
+            ("chunked", mock.patch.object(client._FileStream, "can_sendfile")),
+            ("sendfile", contextlib.nullcontext()),
+        ):
+            with patch as can_sendfile:
+                if can_sendfile is not None:
+                    can_sendfile.return_value = False
+                seconds = min(upload(session, url, path) for _ in range(rounds))
+            print(f"{name:>9}: {seconds:6.2f} s, {size / seconds:8.1f} MiB/s")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,9 @@
 
 from importlib.metadata import version
 
+from pylxd.async_client import AsyncClient
 from pylxd.client import Client, EventType
 
-__all__ = ["Client", "EventType"]
+__all__ = ["AsyncClient", "Client", "EventType"]
 
 __version__ = version("pylxd")
@@ -0,0 +1,685 @@
+# Copyright (c) 2026 Canonical Ltd
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import asyncio
+import hashlib
+import json
+import os
+import ssl
+from urllib import parse
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri
+
+from pylxd import exceptions, models
+from pylxd.client import (
+    _APINode,
+    _APIResponse,
+    _get_json_codec,
+    _resolve_endpoint,
+)
+from pylxd.models import _model as model
+from pylxd.models.instance import InstanceState
+
+DEFAULT_POOL_MAXSIZE = 100
+
+
+class _StaleConnection(ConnectionError):
+    """The server closed an idle connection before answering."""
+
+
+class _AsyncResponse:
+    """A fully read HTTP response from LXD.
+
+    This mirrors the parts of :class:`requests.Response` that pylxd relies
+    on, so it can be passed to the same error handling and models.
+    """
+
+    def __init__(self, status_code, reason, headers, content, url):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _AsyncConnection:
+    """A single keep-alive HTTP/1.1 connection over asyncio streams."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @property
+    def closed(self):
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+    async def request(self, method, target, headers, body):
+        lines = [f"{method} {target} HTTP/1.1"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self.writer.write(head + body if body else head)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise _StaleConnection("Connection closed by LXD")
+        version, status, *reason = status_line.decode("latin-1").split(" ", 2)
+        status_code = int(status)
+
+        response_headers = CaseInsensitiveDict()
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip()] = value.strip()
+
+        if version == "HTTP/1.0" or (
+            response_headers.get("Connection", "").lower() == "close"
+        ):
+            self.reusable = False
+
+        if method == "HEAD" or status_code in (204, 304) or status_code < 200:
+            content = b""
+        elif response_headers.get("Transfer-Encoding", "").lower() == "chunked":
+            content = await self._read_chunked()
+        elif "Content-Length" in response_headers:
+            content = await self.reader.readexactly(
+                int(response_headers["Content-Length"])
+            )
+        else:
+            content = await self.reader.read()
+            self.reusable = False
+
+        reason = reason[0].strip() if reason else ""
+        return status_code, reason, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b";")[0].strip(), 16)
+            if size == 0:
+                # Skip any trailers up to the terminating blank line.
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class _AsyncSession:
+    """Issue HTTP requests to LXD over a bounded pool of connections.
+
+    Up to `pool_maxsize` requests are in flight at once; further requests
+    wait for a free connection rather than opening new ones, and idle
+    connections are kept open and reused.
+    """
+
+    def __init__(self, endpoint, cert=None, verify=True, pool_maxsize=None):
+        parsed = parse.urlparse(endpoint)
+        self.scheme = parsed.scheme
+        self.cert = cert
+        self.verify = verify
+        if self.scheme == "http+unix":
+            self.host = "localhost"
+            self.socket_path = parse.unquote(parsed.netloc)
+        else:
+            self.host = parsed.netloc
+            self.hostname = parsed.hostname
+            self.port = parsed.port or (443 if self.scheme == "https" else 80)
+
+        self._fingerprint = None
+        self._ssl_context = None
+        if self.scheme == "https":
+            self._ssl_context = self._make_ssl_context()
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_maxsize or DEFAULT_POOL_MAXSIZE)
+
+    def _make_ssl_context(self):
+        if isinstance(self.verify, str):
+            # As with LXDSSLAdapter, the server certificate is pinned by its
+            # fingerprint rather than validated against a CA.
+            with open(self.verify, "rb") as fd:
+                servercert = x509.load_pem_x509_certificate(fd.read())
+            self._fingerprint = servercert.fingerprint(hashes.SHA256())
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif self.verify:
+            context = ssl.create_default_context()
+        else:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if self.cert:
+            context.load_cert_chain(self.cert[0], self.cert[1])
+        return context
+
+    async def _connect(self):
+        if self.scheme == "http+unix":
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(
+                self.hostname,
+                self.port,
+                ssl=self._ssl_context,
+                server_hostname=self.hostname if self._ssl_context else None,
+            )
+        if self._fingerprint is not None:
+            peercert = writer.get_extra_info("ssl_object").getpeercert(binary_form=True)
+            if hashlib.sha256(peercert).digest() != self._fingerprint:
+                writer.close()
+                raise ssl.SSLError("Server certificate fingerprint mismatch")
+        return _AsyncConnection(reader, writer)
+
+    def _acquire_idle(self):
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.closed:
+                return conn
+            conn.close()
+        return None
+
+    async def request(
+        self,
+        method,
+        url,
+        params=None,
+        json=None,
+        data=None,
+        headers=None,
+        timeout=None,
+        **kwargs,
+    ):
+        # e.g. stream=True, which responses read whole can't honour.
+        if kwargs:
+            names = ", ".join(sorted(kwargs))
+            raise TypeError(f"Unsupported request arguments: {names}")
+        target = requote_uri(parse.urlparse(url).path)
+        if params:
+            target = f"{target}?{parse.urlencode(params, doseq=True)}"
+
+        request_headers = {"Host": self.host, "Accept": "application/json"}
+        body = b""
+        if json is not None:
+            body = _json_dumps(json).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+        elif data is not None:
+            if hasattr(data, "read"):
+                data = data.read()
+            body = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        request_headers.update(headers or {})
+        if body or method in ("POST", "PUT", "PATCH"):
+            request_headers["Content-Length"] = str(len(body))
+
+        coro = self._request(method, target, request_headers, body)
+        if isinstance(timeout, tuple):
+            timeout = sum(t for t in timeout if t is not None) or None
+        result = await asyncio.wait_for(coro, timeout)
+        return _AsyncResponse(*result, url=url)
+
+    async def _request(self, method, target, headers, body):
+        async with self._slots:
+            while True:
+                conn = self._acquire_idle()
+                reused = conn is not None
+                if conn is None:
+                    conn = await self._connect()
+                try:
+                    result = await conn.request(method, target, headers, body)
+                except (_StaleConnection, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if reused:
+                        # The server dropped an idle connection; try again
+                        # with the next one.
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                if conn.reusable:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+                return result
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+def _json_dumps(obj):
+    return json.dumps(obj)
+
+
+class _AsyncAPINode(_APINode):
+    """An awaitable api node object.
+
+    Tree traversal works exactly as with :class:`pylxd.client._APINode`, but
+    `get`, `post`, `put`, `patch` and `delete` are coroutines.
+    """
+
+    async def _request(self, method, allowed_status_codes, kwargs):
+        is_api = kwargs.pop("is_api", True)
+        kwargs["timeout"] = kwargs.get("timeout", self._timeout)
+
+        target = kwargs.pop("target", None)
+        if target is not None:
+            params = kwargs.get("params", {})
+            params["target"] = target
+            kwargs["params"] = params
+
+        if self._project is not None:
+            params = kwargs.get("params", {})
+            params["project"] = self._project
+            kwargs["params"] = params
+
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            await self.session.request(method, self._api_endpoint, **kwargs),
+            self._json_codec,
+        )
+        self._assert_response(
+            response, allowed_status_codes=allowed_status_codes, is_api=is_api
+        )
+        return response
+
+    async def get(self, *args, **kwargs):
+        """Perform an HTTP GET."""
+        return await self._request("GET", (200,), kwargs)
+
+    async def post(self, *args, **kwargs):
+        """Perform an HTTP POST."""
+        return await self._request("POST", (200, 201, 202), kwargs)
+
+    async def put(self, *args, **kwargs):
+        """Perform an HTTP PUT."""
+        return await self._request("PUT", (200, 202), kwargs)
+
+    async def patch(self, *args, **kwargs):
+        """Perform an HTTP PATCH."""
+        return await self._request("PATCH", (200, 202), kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """Perform an HTTP delete."""
+        return await self._request("DELETE", (200, 202), kwargs)
+
+
+def _name_from_url(url):
+    return url.split("/")[-1].split("?")[0]
+
+
+class _AsyncModelManager:
+    """An awaitable manager for a collection of models.
+
+    Objects returned by the manager are regular :mod:`pylxd.models` objects,
+    fully populated from the server response.
+    """
+
+    def __init__(self, client, model, endpoint, key="name"):
+        self._client = client
+        self._model = model
+        self._endpoint = endpoint
+        self._key = key
+
+    @property
+    def _api(self):
+        return self._client.api[self._endpoint]
+
+    def _hydrate(self, data):
+        return self._model._from_api(self._client, data)
+
+    async def get(self, key):
+        """Get an object by its name (or fingerprint)."""
+        response = await self._api[key].get()
+        return self._model(self._client, **response.metadata)
+
+    async def exists(self, key):
+        """Determine whether an object exists."""
+        try:
+            await self.get(key)
+            return True
+        except exceptions.NotFound:
+            return False
+
+    async def all(self, recursion=1, filter=None):
+        """Get all objects.
+
+        With the default `recursion=1` a single request returns fully
+        populated objects; with `recursion=0` only the name is set.
+
+        `filter` is as for :meth:`pylxd.models.Instance.all`. LXD applies it
+        to instances and images if it supports the ``api_filtering``
+        extension; otherwise it is applied client side.
+        """
+        client_filter = None
+        if filter is not None and not (
+            self._endpoint in ("instances", "images")
+            and model._server_side_filtering(self._client, filter)
+        ):
+            if isinstance(filter, str):
+                raise exceptions.LXDAPIExtensionNotAvailable("api_filtering")
+            client_filter = filter
+            recursion = max(recursion, 1)
+
+        params = {"recursion": recursion} if recursion else {}
+        if filter is not None and client_filter is None:
+            params["filter"] = model._filter_expression(filter)
+        response = await self._api.get(params=params)
+
+        metadata = response.metadata
+        if client_filter is not None:
+            metadata = [i for i in metadata if model._filter_matches(i, client_filter)]
+
+        objects = []
+        for item in metadata:
+            if isinstance(item, dict):
+                objects.append(self._hydrate(item))
+            else:
+                objects.append(
+                    self._model(self._client, **{self._key: _name_from_url(item)})
+                )
+        return objects
+
+    async def create(self, config, wait=False):
+        """Create an object from its `config` and return it.
+
+        Objects whose key isn't in `config`, e.g. certificates, are found
+        from the response: its ``Location``, or the resources of its
+        operation, which is then waited for.
+        """
+        response = await self._api.post(json=config)
+        key = config.get(self._key)
+        if response.json()["type"] != "async":
+            if key is None:
+                key = _name_from_url(response.headers["Location"])
+        elif wait or key is None:
+            operation = await self._client.operations.wait_for_operation(
+                response.operation
+            )
+            if key is None:
+                key = next(
+                    _name_from_url(url)
+                    for urls in operation.resources.values()
+                    for url in urls
+                    if f"/{self._endpoint}/" in url
+                )
+        return await self.get(key)
+
+    async def delete(self, key, wait=False):
+        """Delete an object by its name (or fingerprint)."""
+        response = await self._api[key].delete()
+        await self._client.operations._handle_async_response(response, wait)
+
+
+class _AsyncInstanceManager(_AsyncModelManager):
+    """An awaitable manager for instances."""
+
+    async def create(self, config, wait=False, target=None):
+        """Create a new instance.
+
+        See :meth:`pylxd.models.Instance.create`.
+        """
+        instance_type = self._model._instance_type
+        if instance_type is not None and "type" not in config:
+            config = {**config, "type": instance_type}
+        response = await self._api.post(json=config, target=target)
+        name = config.get("name")
+
+        response_json = response.json()
+        if name is None:
+            entity_url = (response_json["metadata"].get("metadata") or {}).get(
+                "entity_url"
+            )
+            name = os.path.basename(entity_url) if entity_url else None
+        if wait or name is None:
+            operation = await self._client.operations.wait_for_operation(
+                response_json["operation"]
+            )
+            if name is None:
+                name = os.path.basename(operation.resources["instances"][0])
+        if wait:
+            return await self.get(name)
+        return self._model(self._client, name=name)
+
+    async def state(self, name):
+        """Get the state of an instance."""
+        response = await self._api[name].state.get()
+        return InstanceState(response.metadata)
+
+    async def set_state(self, name, action, timeout=30, force=True, wait=False):
+        """Change the state of an instance.
+
+        :param action: one of 'start', 'stop', 'restart', 'freeze' or
+            'unfreeze'.
+        :type action: str
+        """
+        response = await self._api[name].state.put(
+            json={"action": action, "timeout": timeout, "force": force}
+        )
+        await self._client.operations._handle_async_response(response, wait)
+
+    async def start(self, name, timeout=30, force=True, wait=False):
+        """Start an instance."""
+        await self.set_state(name, "start", timeout=timeout, force=force, wait=wait)
+
+    async def stop(self, name, timeout=30, force=True, wait=False):
+        """Stop an instance."""
+        await self.set_state(name, "stop", timeout=timeout, force=force, wait=wait)
+
+    async def restart(self, name, timeout=30, force=True, wait=False):
+        """Restart an instance."""
+        await self.set_state(name, "restart", timeout=timeout, force=force, wait=wait)
+
+    async def freeze(self, name, timeout=30, force=True, wait=False):
+        """Freeze an instance."""
+        await self.set_state(name, "freeze", timeout=timeout, force=force, wait=wait)
+
+    async def unfreeze(self, name, timeout=30, force=True, wait=False):
+        """Unfreeze an instance."""
+        await self.set_state(name, "unfreeze", timeout=timeout, force=force, wait=wait)
+
+
+class _AsyncImageManager(_AsyncModelManager):
+    """An awaitable manager for images."""
+
+    async def create(self, config, wait=True):
+        """Create an image from a source `config`.
+
+        Returns the new image when `wait` is True, otherwise the
+        :class:`pylxd.models.Operation` tracking the download.
+        """
+        response = await self._api.post(json=config)
+        operation_id = response.operation
+        if not wait:
+            return await self._client.operations.get(operation_id)
+        operation = await self._client.operations.wait_for_operation(operation_id)
+        return await self.get(operation.metadata["fingerprint"])
+
+
+class _AsyncOperationManager:
+    """An awaitable manager for operations."""
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get(self, operation_id):
+        """Get an operation."""
+        operation_id = models.Operation.extract_operation_id(operation_id)
+        response = await self._client.api.operations[operation_id].get()
+        return models.Operation(_client=self._client, **response.metadata)
+
+    async def wait_for_operation(self, operation_id):
+        """Wait for an operation to complete and return it.
+
+        Raises :class:`pylxd.exceptions.LXDAPIException` if the operation
+        fails.
+        """
+        operation_id = models.Operation.extract_operation_id(operation_id)
+        response = await self._client.api.operations[operation_id].wait.get()
+        metadata = models.Operation._wait_metadata(response)
+        if metadata is None:
+            return await self.get(operation_id)
+        return models.Operation(_client=self._client, **metadata)
+
+    async def _handle_async_response(self, response, wait):
+        if wait and response.json()["type"] == "async":
+            await self.wait_for_operation(response.operation)
+
+
+class AsyncClient:
+    """An asyncio client for the LXD REST API.
+
+    :class:`AsyncClient` speaks HTTP over the local unix socket or HTTPS
+    natively on the running event loop, so many requests can be awaited
+    concurrently (e.g. with :func:`asyncio.gather`) without a thread per
+    request.
+
+    The client must be connected before use, either by awaiting
+    :meth:`connect` or by using it as an asynchronous context manager:
+
+    .. code-block:: python
+
+        async with AsyncClient() as client:
+            instances = await client.instances.all()
+
+    Managers return the regular :mod:`pylxd.models` objects, fully populated
+    from the server. Methods on those objects that perform I/O are
+    synchronous and are not available through this client; use the
+    awaitable manager methods instead.
+
+    .. attribute:: api
+
+        As :attr:`pylxd.Client.api`, but `get`, `post`, `put`, `patch` and
+        `delete` are coroutines.
+    """
+
+    def __init__(
+        self,
+        endpoint=None,
+        version="1.0",
+        cert=None,
+        verify=True,
+        timeout=None,
+        project=None,
+        pool_maxsize=None,
+        json_codec=None,
+    ):
+        """Constructs an asyncio LXD client
+
+        The arguments are the same as for :class:`pylxd.Client`, except:
+
+        :param pool_maxsize: (optional) The maximum number of connections
+            kept open to LXD, which is also the number of requests that may
+            be in flight at once. Defaults to 100.
+        """
+        self.project = project
+        self.json_codec = _get_json_codec(json_codec)
+        endpoint, cert, verify = _resolve_endpoint(endpoint, cert, verify)
+        self.cert = cert
+        self.session = _AsyncSession(
+            endpoint, cert=cert, verify=verify, pool_maxsize=pool_maxsize
+        )
+        self.api = _AsyncAPINode(
+            f"{endpoint}/{version}",
+            self.session,
+            timeout=timeout,
+            project=project,
+            json_codec=self.json_codec,
+        )
+        self.host_info = None
+
+        self.certificates = _AsyncModelManager(
+            self, models.Certificate, "certificates", key="fingerprint"
+        )
+        self.instances = _AsyncInstanceManager(self, models.Instance, "instances")
+        self.containers = _AsyncInstanceManager(self, models.Container, "instances")
+        self.virtual_machines = _AsyncInstanceManager(
+            self, models.VirtualMachine, "instances"
+        )
+        self.images = _AsyncImageManager(
+            self, models.Image, "images", key="fingerprint"
+        )
+        self.networks = _AsyncModelManager(self, models.Network, "networks")
+        self.operations = _AsyncOperationManager(self)
+        self.profiles = _AsyncModelManager(self, models.Profile, "profiles")
+        self.projects = _AsyncModelManager(self, models.Project, "projects")
+        self.storage_pools = _AsyncModelManager(
+            self, models.StoragePool, "storage-pools"
+        )
+
+    async def connect(self):
+        """Connect to LXD and fetch the host information.
+
+        :raises: :class:`pylxd.exceptions.ClientConnectionFailed`
+        """
+        try:
+            response = await self.api.get()
+        except (OSError, ssl.SSLError) as e:
+            raise exceptions.ClientConnectionFailed(str(e))
+        self.host_info = response.metadata
+
+        if self.project not in (None, "default") and not self.has_api_extension(
+            "projects"
+        ):
+            raise exceptions.ClientConnectionFailed(
+                "Remote server doesn't handle projects"
+            )
+        return self
+
+    async def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def trusted(self):
+        return self.host_info["auth"] == "trusted"
+
+    @property
+    def server_clustered(self):
+        return self.host_info["environment"].get("server_clustered", False)
+
+    def has_api_extension(self, name):
+        """Return True if the `name` api extension exists."""
+        return name in self.host_info["api_extensions"]
+
+    def assert_has_api_extension(self, name):
+        """Asserts that the `name` api_extension exists.
+
+        :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable`
+        """
+        if not self.has_api_extension(name):
+            raise exceptions.LXDAPIExtensionNotAvailable(name)
@@ -12,10 +12,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 import base64
+import codecs
+import concurrent.futures
+import importlib
+import io
 import json
 import os
 import re
 import socket
+import ssl
+import stat
+import threading
+import time
+from contextlib import suppress
 from enum import Enum
 from typing import NamedTuple
 from urllib import parse
@@ -24,9 +33,11 @@ import requests
 import requests.adapters
 import urllib3
 import urllib3.connection
+import urllib3.util.ssl_
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes
 from ws4py.client import WebSocketBaseClient
+from ws4py.exc import WebSocketException
 
 from pylxd import exceptions, managers
 
@@ -56,6 +67,9 @@ DEFAULT_CERTS = Cert(
 DEFAULT_SCHEME = "http+unix://"
 SOCKET_CONNECTION_TIMEOUT = 60
 
+# The size of the chunks files are streamed in.
+_FILE_CHUNK_SIZE = 1024 * 1024
+
 
 class EventType(Enum):
     All = "all"
@@ -64,6 +78,68 @@ class EventType(Enum):
     Lifecycle = "lifecycle"
 
 
+class _FileStream:
+    """A request body streaming a file object in chunks.
+
+    Requests sends the body with a Content-Length if the number of bytes
+    left in the file is known, and with chunked transfer encoding otherwise.
+    Over the unix socket, the bodies of regular files opened in binary mode
+    are sent with sendfile(2) instead of read into memory.
+    """
+
+    def __init__(self, fp, progress=None):
+        self._fp = fp
+        self._progress = progress
+        self.len = None
+        with suppress(AttributeError, OSError):
+            if fp.seekable():
+                position = fp.tell()
+                self.len = fp.seek(0, io.SEEK_END) - position
+                fp.seek(position)
+
+    def __iter__(self):
+        sent = 0
+        # No more than the Content-Length, should the file have grown.
+        while self.len is None or sent < self.len:
+            size = _FILE_CHUNK_SIZE
+            if self.len is not None:
+                size = min(size, self.len - sent)
+            chunk = self._fp.read(size)
+            if not chunk:
+                return
+            sent += len(chunk)
+            if self._progress is not None:
+                self._progress(sent)
+            yield chunk
+
+    def can_sendfile(self):
+        """Return True if the body can be sent with `sendfile`."""
+        if self.len is None or not isinstance(self._fp, (io.BufferedReader, io.FileIO)):
+            return False
+        try:
+            return stat.S_ISREG(os.fstat(self._fp.fileno()).st_mode)
+        except (AttributeError, OSError, ValueError):
+            return False
+
+    def sendfile(self, sock):
+        """Send the body to `sock` with sendfile(2), without copying the
+        file through Python buffers."""
+        offset = self._fp.tell()
+        end = offset + self.len
+        sent = 0
+        # The whole file at once, unless progress is to be reported.
+        chunk_size = self.len if self._progress is None else _FILE_CHUNK_SIZE
+        while offset + sent < end:
+            count = min(chunk_size, end - offset - sent)
+            count = sock.sendfile(self._fp, offset + sent, count)
+            if not count:
+                # The file was truncated.
+                return
+            sent += count
+            if self._progress is not None:
+                self._progress(sent)
+
+
 class _UnixSocketHTTPConnection(urllib3.connection.HTTPConnection):
     def __init__(self, unix_socket_url):
         super().__init__("localhost", timeout=SOCKET_CONNECTION_TIMEOUT)
@@ -82,15 +158,51 @@ class _UnixSocketHTTPConnection(urllib3.connection.HTTPConnection):
         sock.connect(socket_path)
         self.sock = sock
 
+    def request(self, method, url, body=None, headers=None, *, chunked=False, **kw):
+        """Send a request, with sendfile(2) for bodies of regular files."""
+        if (
+            chunked
+            or not isinstance(body, _FileStream)
+            or not body.can_sendfile()
+            or "content-length" not in {k.lower() for k in headers or {}}
+        ):
+            # urllib3 < 2 has no `chunked` argument, and sends chunked
+            # requests with request_chunked() instead.
+            if chunked:
+                kw["chunked"] = chunked
+            return super().request(method, url, body=body, headers=headers, **kw)
+        super().request(method, url, body=None, headers=headers, **kw)
+        body.sendfile(self.sock)
+
 
 class _UnixSocketHTTPConnectionPool(urllib3.HTTPConnectionPool):
-    def __init__(self, socket_path):
-        super().__init__("localhost")
+    """A pool of connections to one unix socket.
+
+    Up to `maxsize` idle connections are kept for reuse; if `block` is True
+    no more than `maxsize` connections are open at once. The pool is
+    thread-safe and counts how many connections were opened and reused.
+    """
+
+    def __init__(self, socket_path, maxsize=1, block=False):
+        super().__init__("localhost", maxsize=maxsize, block=block)
         self.socket_path = socket_path
+        self.num_connections_opened = 0
+        self.num_connections_reused = 0
+        self._stats_lock = threading.Lock()
 
     def _new_conn(self):
         return _UnixSocketHTTPConnection(self.socket_path)
 
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        # A connection without a socket connects when it is next used.
+        with self._stats_lock:
+            if conn.sock is None:
+                self.num_connections_opened += 1
+            else:
+                self.num_connections_reused += 1
+        return conn
+
 
 class _UnixAdapter(requests.adapters.HTTPAdapter):
     def __init__(self, pool_connections=25, *args, **kwargs):
@@ -100,16 +212,37 @@ class _UnixAdapter(requests.adapters.HTTPAdapter):
         )
 
     def get_connection(self, url, proxies):
+        # Every request to the same socket shares one pool of connections,
+        # whatever its path.
+        parsed = parse.urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
         with self.pools.lock:
-            conn = self.pools.get(url)
+            conn = self.pools.get(key)
             if conn:
                 return conn
 
-            conn = _UnixSocketHTTPConnectionPool(url)
-            self.pools[url] = conn
+            conn = _UnixSocketHTTPConnectionPool(
+                key, maxsize=self._pool_maxsize, block=self._pool_block
+            )
+            self.pools[key] = conn
 
         return conn
 
+    def connection_stats(self):
+        """Return how many connections were opened and reused.
+
+        :returns: a dict with the `opened` and `reused` counts summed over
+            all sockets served by this adapter.
+        :rtype: dict
+        """
+        stats = {"opened": 0, "reused": 0}
+        for key in self.pools.keys():
+            pool = self.pools.get(key)
+            if pool is not None:
+                stats["opened"] += pool.num_connections_opened
+                stats["reused"] += pool.num_connections_reused
+        return stats
+
     # This method is needed fo compatibility with later requests versions.
     def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
         return self.get_connection(request.url, None)
@@ -122,32 +255,311 @@ class _UnixAdapter(requests.adapters.HTTPAdapter):
 
 
 class LXDSSLAdapter(requests.adapters.HTTPAdapter):
-    def cert_verify(self, conn, url, verify, cert):
-        with open(verify, "rb") as fd:
-            servercert = x509.load_pem_x509_certificate(fd.read())
-            fingerprint = servercert.fingerprint(hashes.SHA256())
+    """Pin the server certificate given as `verify` by its fingerprint.
+
+    Each certificate file is read and hashed once and its fingerprint cached
+    until reload_fingerprint() is called. All pooled connections share a
+    single SSL context, into which the client certificate `cert`, a file or
+    a (cert, key) tuple of files, is loaded once rather than for each
+    connection.
+    """
+
+    def __init__(self, *args, cert=None, **kwargs):
+        self._fingerprints = {}
+        self._cert = cert
+        # Verification is done by fingerprint, not against a CA.
+        self._ssl_context = urllib3.util.ssl_.create_urllib3_context(
+            cert_reqs=ssl.CERT_NONE
+        )
+        if isinstance(cert, str):
+            self._ssl_context.load_cert_chain(cert)
+        elif cert:
+            self._ssl_context.load_cert_chain(*cert)
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("ssl_context", self._ssl_context)
+        super().init_poolmanager(*args, **kwargs)
+
+    def _fingerprint(self, verify):
+        fingerprint = self._fingerprints.get(verify)
+        if fingerprint is None:
+            with open(verify, "rb") as fd:
+                servercert = x509.load_pem_x509_certificate(fd.read())
+            fingerprint = servercert.fingerprint(hashes.SHA256()).hex()
+            self._fingerprints[verify] = fingerprint
+        return fingerprint
+
+    def reload_fingerprint(self, verify=None):
+        """Re-read the pinned server certificate on the next request.
 
-        conn.assert_fingerprint = "".join([f"{i:02x}" for i in fingerprint])
+        Pooled connections, which were verified against the old
+        certificate, are closed.
+
+        :param verify: (optional) The certificate file to reload. All of them
+            are reloaded if not given.
+        :type verify: str
+        """
+        if verify is None:
+            self._fingerprints.clear()
+        else:
+            self._fingerprints.pop(verify, None)
+        self.poolmanager.clear()
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        if cert == self._cert:
+            # Already in the SSL context; urllib3 would load it again for
+            # each connection of a pool with these.
+            pool_kwargs.pop("cert_file", None)
+            pool_kwargs.pop("key_file", None)
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        conn.assert_fingerprint = self._fingerprint(verify)
+        if cert == self._cert:
+            # Already in the SSL context.
+            cert = None
         super().cert_verify(conn, url, False, cert)
 
 
-def get_session_for_url(url: str, verify=None, cert=None) -> requests.Session:
+def get_session_for_url(
+    url: str,
+    verify=None,
+    cert=None,
+    pool_maxsize=requests.adapters.DEFAULT_POOLSIZE,
+    pool_block=requests.adapters.DEFAULT_POOLBLOCK,
+) -> requests.Session:
     """Create a Session for use with requests for the given URL.
 
     Call sites can use this to customise the session before passing into a Client.
+
+    `pool_maxsize` is the number of connections kept open for reuse, which
+    should be at least the number of threads sharing the session. If
+    `pool_block` is True, no more than `pool_maxsize` connections are opened
+    and further requests wait for a free one.
     """
     session = requests.Session()
+    pool_kwargs = {"pool_maxsize": pool_maxsize, "pool_block": pool_block}
     if url.startswith(DEFAULT_SCHEME):
-        session.mount(DEFAULT_SCHEME, _UnixAdapter())
+        session.mount(DEFAULT_SCHEME, _UnixAdapter(**pool_kwargs))
     else:
         session.cert = cert
         session.verify = verify
 
         if isinstance(verify, str):
-            session.mount(url, LXDSSLAdapter())
+            session.mount(url, LXDSSLAdapter(cert=cert, **pool_kwargs))
+        else:
+            session.mount(url, requests.adapters.HTTPAdapter(**pool_kwargs))
     return session
 
 
+_UNSET = object()
+
+# Faster JSON libraries that can replace the json module, in order of
+# preference.
+_JSON_CODECS = ("orjson", "ujson")
+
+
+def _get_json_codec(json_codec):
+    """Return the module used to encode and decode JSON.
+
+    :param json_codec: ``None`` or ``"json"`` for the standard library,
+        ``"orjson"`` or ``"ujson"`` for those libraries, ``"auto"`` for the
+        first of them that is installed, or any object with `loads` and
+        `dumps` functions.
+    :returns: the codec, or ``None`` for the standard library.
+    :raises: ValueError if the codec is unknown.
+    :raises: ImportError if the requested library is not installed.
+    """
+    if json_codec is None or json_codec == "json":
+        return None
+    if json_codec == "auto":
+        for name in _JSON_CODECS:
+            try:
+                return importlib.import_module(name)
+            except ImportError:
+                pass
+        return None
+    if isinstance(json_codec, str):
+        if json_codec not in _JSON_CODECS:
+            raise ValueError(f"Unknown JSON codec: {json_codec}")
+        return importlib.import_module(json_codec)
+    if not (hasattr(json_codec, "loads") and hasattr(json_codec, "dumps")):
+        raise ValueError("A JSON codec must have loads() and dumps()")
+    return json_codec
+
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NUMBER_START = "-0123456789"
+_JSON_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def _iter_json_metadata(chunks):
+    """Yield the items of the `metadata` array of a streamed LXD response.
+
+    The response body is parsed incrementally from `chunks` of bytes, so
+    only one item and the unparsed remainder of the current chunk are held
+    in memory at a time. Nothing is yielded if `metadata` is not an array.
+
+    :param chunks: the body of the response as an iterable of bytes
+    :raises: ValueError if the body is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        try:
+            text = utf8.decode(next(chunks))
+        except StopIteration:
+            text = utf8.decode(b"", final=True)
+            eof = True
+        buf = buf[pos:] + text
+        pos = 0
+        return not eof
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    def expect(char):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"Expecting {char!r} in response body")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number may continue in the next chunk, e.g. after its
+                # "." or "e", so it is only complete once followed by a
+                # character which can't be part of it.
+                if eof or (
+                    end < len(buf)
+                    and not (
+                        buf[pos] in _JSON_NUMBER_START
+                        and buf[end] in _JSON_NUMBER_CHARS
+                    )
+                ):
+                    pos = end
+                    return obj
+            fill()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        expect(":")
+        if key == "metadata" and peek() == "[":
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield value()
+                    if peek() != ",":
+                        break
+                    pos += 1
+                expect("]")
+        else:
+            value()
+        if peek() != ",":
+            break
+        pos += 1
+    expect("}")
+
+
+class _APIResponse:
+    """A response from the LXD API.
+
+    The JSON body is decoded once, the first time it is needed, and the
+    fields of LXD's response envelope are available as attributes. Anything
+    else is looked up on the wrapped :class:`requests.Response`.
+    """
+
+    __slots__ = ("_response", "_json", "_json_codec")
+
+    def __init__(self, response, json_codec=None):
+        self._response = response
+        self._json = _UNSET
+        self._json_codec = json_codec
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __bool__(self):
+        return bool(self._response)
+
+    def __iter__(self):
+        return iter(self._response)
+
+    def __repr__(self):
+        return repr(self._response)
+
+    def json(self, **kwargs):
+        """Return the decoded JSON body, decoding it only once."""
+        if kwargs:
+            return self._response.json(**kwargs)
+        if self._json is _UNSET:
+            if self._json_codec is None:
+                self._json = self._response.json()
+            else:
+                self._json = self._json_codec.loads(self._response.content)
+        return self._json
+
+    @property
+    def type(self):
+        """The response type: `sync`, `async` or `error`."""
+        return self.json().get("type")
+
+    @property
+    def metadata(self):
+        """The metadata of the response, i.e. the requested object."""
+        return self.json().get("metadata")
+
+    @property
+    def operation(self):
+        """The url of the background operation of an `async` response."""
+        return self.json().get("operation")
+
+    @property
+    def etag(self):
+        """The ETag header of the response, if any."""
+        return self._response.headers.get("ETag")
+
+    def iter_metadata(self, chunk_size=65536):
+        """Iterate over the items of a listing as the body is received.
+
+        The request must have been made with ``stream=True``. The standard
+        library decoder is used, whatever the JSON codec.
+
+        :param chunk_size: the number of bytes read at a time
+        :type chunk_size: int
+        """
+        return _iter_json_metadata(self._response.iter_content(chunk_size))
+
+
 class _APINode:
     """An api node object.
 
@@ -161,10 +573,12 @@ class _APINode:
         session,
         timeout=None,
         project=None,
+        json_codec=None,
     ):
         self._api_endpoint = api_endpoint
         self._timeout = timeout
         self._project = project
+        self._json_codec = json_codec
         self.session = session
 
     def __getattr__(self, name):
@@ -184,6 +598,7 @@ class _APINode:
             session=self.session,
             timeout=self._timeout,
             project=self._project,
+            json_codec=self._json_codec,
         )
 
     def __getitem__(self, item):
@@ -199,6 +614,7 @@ class _APINode:
             session=self.session,
             timeout=self._timeout,
             project=self._project,
+            json_codec=self._json_codec,
         )
 
     def _assert_response(
@@ -241,6 +657,15 @@ class _APINode:
                 # Missing 'type' in response
                 raise exceptions.LXDAPIException(response)
 
+    def _encode_json(self, kwargs):
+        """Encode the `json` argument of a request with the JSON codec."""
+        if self._json_codec is None or kwargs.get("json") is None:
+            return
+        kwargs["data"] = self._json_codec.dumps(kwargs.pop("json"))
+        headers = dict(kwargs.get("headers") or {})
+        headers["Content-Type"] = "application/json"
+        kwargs["headers"] = headers
+
     @property
     def scheme(self):
         return parse.urlparse(self.api._api_endpoint).scheme
@@ -264,12 +689,58 @@ class _APINode:
             params["project"] = self._project
             kwargs["params"] = params
 
-        response = self.session.get(self._api_endpoint, *args, **kwargs)
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            self.session.get(self._api_endpoint, *args, **kwargs),
+            self._json_codec,
+        )
         self._assert_response(
             response, stream=kwargs.get("stream", False), is_api=is_api
         )
         return response
 
+    def upgrade(self, protocol, **kwargs):
+        """Perform an HTTP GET which switches the connection to `protocol`.
+
+        The connection is taken out of the pool of the session for good: it
+        speaks `protocol` once LXD switched to it, and is closed by closing
+        the response. Its socket keeps the read timeout of the client.
+
+        :param protocol: The protocol to upgrade to, e.g. ``"sftp"``.
+        :type protocol: str
+        :returns: the response, and the socket of the upgraded connection.
+        :rtype: tuple
+        :raises: LXDAPIException if LXD didn't switch protocols.
+        """
+        kwargs["timeout"] = kwargs.get("timeout", self._timeout)
+
+        if self._project is not None:
+            params = kwargs.get("params", {})
+            params["project"] = self._project
+            kwargs["params"] = params
+
+        headers = dict(kwargs.get("headers") or {})
+        headers.update({"Connection": "Upgrade", "Upgrade": protocol})
+        kwargs["headers"] = headers
+        response = _APIResponse(
+            self.session.get(self._api_endpoint, stream=True, **kwargs),
+            self._json_codec,
+        )
+        try:
+            self._assert_response(response, allowed_status_codes=(101,), stream=True)
+        except exceptions.LXDAPIException:
+            response.close()
+            raise
+        # The socket of the connection the response holds on to, with
+        # nothing read past the headers as LXD waits for the client to speak
+        # first.
+        sock = response.raw.connection.sock
+        timeout = kwargs["timeout"]
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+        sock.settimeout(timeout)
+        return response, sock
+
     def post(self, *args, **kwargs):
         """Perform an HTTP POST."""
         kwargs["timeout"] = kwargs.get("timeout", self._timeout)
@@ -285,7 +756,11 @@ class _APINode:
             params["project"] = self._project
             kwargs["params"] = params
 
-        response = self.session.post(self._api_endpoint, *args, **kwargs)
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            self.session.post(self._api_endpoint, *args, **kwargs),
+            self._json_codec,
+        )
         # Prior to LXD 2.0.3, successful synchronous requests returned 200,
         # rather than 201.
         self._assert_response(response, allowed_status_codes=(200, 201, 202))
@@ -300,7 +775,11 @@ class _APINode:
             params["project"] = self._project
             kwargs["params"] = params
 
-        response = self.session.put(self._api_endpoint, *args, **kwargs)
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            self.session.put(self._api_endpoint, *args, **kwargs),
+            self._json_codec,
+        )
         self._assert_response(response, allowed_status_codes=(200, 202))
         return response
 
@@ -313,7 +792,11 @@ class _APINode:
             params["project"] = self._project
             kwargs["params"] = params
 
-        response = self.session.patch(self._api_endpoint, *args, **kwargs)
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            self.session.patch(self._api_endpoint, *args, **kwargs),
+            self._json_codec,
+        )
         self._assert_response(response, allowed_status_codes=(200, 202))
         return response
 
@@ -326,7 +809,11 @@ class _APINode:
             params["project"] = self._project
             kwargs["params"] = params
 
-        response = self.session.delete(self._api_endpoint, *args, **kwargs)
+        self._encode_json(kwargs)
+        response = _APIResponse(
+            self.session.delete(self._api_endpoint, *args, **kwargs),
+            self._json_codec,
+        )
         self._assert_response(response, allowed_status_codes=(200, 202))
         return response
 
@@ -363,6 +850,9 @@ class _WebsocketClient(WebSocketBaseClient):
     then be read are parsed.
     """
 
+    # The JSON codec of the client, see _get_json_codec().
+    json_codec = None
+
     def __init__(self, *args, **kwargs):
         _ws_exclude_origin(kwargs)
         super().__init__(*args, **kwargs)
@@ -371,10 +861,220 @@ class _WebsocketClient(WebSocketBaseClient):
         self.messages = []
 
     def received_message(self, message):
-        json_message = json.loads(message.data.decode("utf-8"))
+        if self.json_codec is None:
+            json_message = json.loads(message.data.decode("utf-8"))
+        else:
+            json_message = self.json_codec.loads(message.data)
         self.messages.append(json_message)
 
 
+class _OperationEventsClient(_WebsocketClient):
+    """The events websocket of an _OperationTracker."""
+
+    tracker = None
+
+    def received_message(self, message):
+        if self.json_codec is None:
+            event = json.loads(message.data.decode("utf-8"))
+        else:
+            event = self.json_codec.loads(message.data)
+        self.tracker._received(event)
+
+    def closed(self, code, reason=None):
+        self.tracker._closed(self)
+
+
+class _OperationTracker:
+    """Wait for operations to end using a single events websocket.
+
+    The websocket subscribes to operation events the first time an operation
+    is waited for, and each waiter is woken by the event reporting the end of
+    its operation, so any number of operations can be awaited without
+    holding a `GET /operations/<id>/wait` request for each.
+
+    When the websocket can't be opened, or gets closed, waiters are given
+    ``None`` and should fall back to `GET /operations/<id>/wait`. Once it
+    couldn't be opened, it isn't tried again for `retry_interval` seconds.
+    """
+
+    #: The number of seconds to wait before trying to open the websocket
+    #: again after failing to.
+    retry_interval = 60
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        # Held while opening the websocket, so that only one is opened,
+        # without blocking the events of an open one behind the handshake.
+        self._connect_lock = threading.Lock()
+        self._waiters = {}
+        self._listeners = {}
+        self._websocket = None
+        # The time.monotonic() of the last failure to open the websocket.
+        self._failed_at = None
+
+    def _connect(self):
+        with self._connect_lock:
+            with self._lock:
+                if self._websocket is not None:
+                    return True
+            if (
+                self._failed_at is not None
+                and time.monotonic() - self._failed_at < self.retry_interval
+            ):
+                return False
+            try:
+                websocket = self._client.events(
+                    websocket_client=_OperationEventsClient,
+                    event_types={EventType.Operation},
+                )
+                websocket.tracker = self
+                websocket.connect()
+            except (OSError, WebSocketException):
+                self._failed_at = time.monotonic()
+                return False
+            self._failed_at = None
+            with self._lock:
+                self._websocket = websocket
+            threading.Thread(
+                target=websocket.run, name="pylxd-operation-events", daemon=True
+            ).start()
+            return True
+
+    def _add(self, registry, operation_id, item):
+        """Add `item` for an operation to the `registry` attribute, e.g.
+        ``"_waiters"``, if the websocket is open.
+
+        :returns: False if operation events are unavailable.
+        :rtype: bool
+        """
+        if not self._connect():
+            return False
+        with self._lock:
+            # The websocket may have been closed since it was opened.
+            if self._websocket is None:
+                return False
+            getattr(self, registry).setdefault(operation_id, []).append(item)
+        return True
+
+    def _received(self, event):
+        metadata = event.get("metadata") or {}
+        with self._lock:
+            listeners = list(self._listeners.get(metadata.get("id"), ()))
+        for listener in listeners:
+            listener(metadata)
+        if metadata.get("status_code", 0) >= 200:
+            self._resolve(metadata["id"], metadata)
+
+    def _resolve(self, operation_id, metadata):
+        with self._lock:
+            waiters = self._waiters.pop(operation_id, ())
+        for waiter in waiters:
+            waiter.set_result(metadata)
+
+    def _closed(self, websocket):
+        with self._lock:
+            if self._websocket is not websocket:
+                return
+            self._websocket = None
+            waiters, self._waiters = self._waiters, {}
+            listeners, self._listeners = self._listeners, {}
+        for operation_waiters in waiters.values():
+            for waiter in operation_waiters:
+                waiter.set_result(None)
+        for operation_listeners in listeners.values():
+            for listener in operation_listeners:
+                listener(None)
+
+    def listen(self, operation_id, listener):
+        """Call `listener` with each event of an operation.
+
+        The listener is called from the websocket thread with the operation
+        metadata of each event, or with ``None`` if the websocket gets closed,
+        after which it is no longer called.
+
+        :param operation_id: the id of the operation
+        :type operation_id: str
+        :param listener: the function to call
+        :type listener: callable
+        :returns: False if operation events are unavailable.
+        :rtype: bool
+        """
+        return self._add("_listeners", operation_id, listener)
+
+    def unlisten(self, operation_id, listener):
+        """Stop calling `listener` with the events of an operation."""
+        with self._lock:
+            listeners = self._listeners.get(operation_id, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(operation_id, None)
+
+    def watch(self, operation_id):
+        """Return a future of the end of an operation.
+
+        :param operation_id: the id of the operation
+        :type operation_id: str
+        :returns: a future of the final operation metadata, which is ``None``
+            if the websocket gets closed first; or ``None`` if operation
+            events are unavailable.
+        :rtype: concurrent.futures.Future
+        """
+        waiter = concurrent.futures.Future()
+        if not self._add("_waiters", operation_id, waiter):
+            return None
+        try:
+            # The operation may have ended before the websocket subscribed.
+            metadata = self._client.api.operations[operation_id].get().metadata
+        except BaseException:
+            self._discard(operation_id, waiter)
+            raise
+        if metadata["status_code"] >= 200:
+            self._discard(operation_id, waiter)
+            waiter.set_result(metadata)
+        return waiter
+
+    def wait(self, operation_id, timeout=None):
+        """Wait for an operation to end.
+
+        :param operation_id: the id of the operation
+        :type operation_id: str
+        :param timeout: the number of seconds to wait for at most, or
+            ``None`` to wait until the operation ends.
+        :type timeout: float
+        :returns: the final operation metadata, or ``None`` if operation
+            events are unavailable.
+        :rtype: dict
+        :raises TimeoutError: if the operation doesn't end in time.
+        """
+        waiter = self.watch(operation_id)
+        if waiter is None:
+            return None
+        try:
+            return waiter.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self._discard(operation_id, waiter)
+            raise TimeoutError(
+                f"Operation {operation_id} did not end in {timeout}s"
+            ) from None
+
+    def _discard(self, operation_id, waiter):
+        with self._lock:
+            waiters = self._waiters.get(operation_id, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(operation_id, None)
+
+    def close(self):
+        """Close the events websocket."""
+        with self._lock:
+            websocket = self._websocket
+        if websocket is not None:
+            websocket.close()
+
+
 # Helper function used by Client.authenticate()
 def _is_a_token(secret):
     """Inspect the provided secret to determine if it is a trust token.
@@ -407,6 +1107,48 @@ def _is_a_token(secret):
         return False
 
 
+# Helper function shared by Client and AsyncClient
+def _resolve_endpoint(endpoint, cert, verify):
+    """Work out the endpoint URL, client certificate and verification to use.
+
+    A missing `endpoint` selects the local unix socket (honouring `LXD_DIR`
+    and the snap location), a path to an existing socket is converted to an
+    `http+unix://` URL, and remote endpoints pick up the default client
+    certificate and any stored server certificate when none are given.
+
+    :returns: a tuple of `(endpoint, cert, verify)`
+    """
+    if endpoint:
+        if endpoint.startswith("/") and os.path.exists(endpoint):
+            endpoint = f"http+unix://{parse.quote(endpoint, safe='')}"
+        else:
+            # Extra trailing slashes cause LXD to 301
+            endpoint = endpoint.rstrip("/")
+            if cert is None and (
+                os.path.exists(DEFAULT_CERTS.cert) and os.path.exists(DEFAULT_CERTS.key)
+            ):
+                cert = DEFAULT_CERTS
+
+            # Try to use an existing server certificate if one exists
+            if isinstance(verify, bool) and endpoint.startswith("https://"):
+                no_proto = re.sub(r"^https://\[?", "", endpoint)
+                remote = re.sub(r"]?(:[0-9]+)?$", "", no_proto)
+                remote_cert_path = os.path.join(
+                    CERTS_PATH, "servercerts", remote + ".crt"
+                )
+                if os.path.exists(remote_cert_path):
+                    verify = remote_cert_path
+    else:
+        if "LXD_DIR" in os.environ:
+            path = os.path.join(os.environ.get("LXD_DIR"), "unix.socket")
+        elif os.path.exists("/var/snap/lxd/common/lxd/unix.socket"):
+            path = "/var/snap/lxd/common/lxd/unix.socket"
+        else:
+            path = "/var/lib/lxd/unix.socket"
+        endpoint = f"http+unix://{parse.quote(path, safe='')}"
+    return endpoint, cert, verify
+
+
 class Client:
     """Client class for LXD REST API.
 
@@ -441,6 +1183,11 @@ class Client:
 
         A :class:`models.Project <pylxd.models.Project>`.
 
+    .. attribute:: operation_tracker
+
+        Waits for operations using a single events websocket, if the client
+        was created with ``track_operations=True``; ``None`` otherwise.
+
     .. attribute:: api
 
         This attribute provides tree traversal syntax to LXD's REST API for
@@ -467,6 +1214,10 @@ class Client:
         timeout=None,
         project=None,
         session=None,
+        pool_maxsize=requests.adapters.DEFAULT_POOLSIZE,
+        pool_block=requests.adapters.DEFAULT_POOLBLOCK,
+        json_codec=None,
+        track_operations=False,
     ):
         """Constructs a LXD client
 
@@ -486,43 +1237,41 @@ class Client:
         :param session: (optional) A requests.Session to use for
             interactions with the endpoint. If given, cert and verify
             arguments are ignored - see get_session_for_url().
+        :param pool_maxsize: (optional) The number of connections to LXD kept
+            open for reuse. Set it to at least the number of threads sharing
+            the client. Ignored if `session` is given.
+        :param pool_block: (optional) If ``True``, never open more than
+            `pool_maxsize` connections; further requests wait for a free one.
+            Ignored if `session` is given.
+        :param json_codec: (optional) The library used to encode and decode
+            JSON: ``"json"`` (the default) for the standard library,
+            ``"orjson"`` or ``"ujson"`` if installed, ``"auto"`` for the
+            fastest one installed, or any object with `loads` and `dumps`
+            functions.
+        :param track_operations: (optional) If ``True``, wait for operations
+            with a single events websocket shared by all waiters, rather
+            than a `GET /operations/<id>/wait` request for each. See
+            :attr:`operation_tracker`.
         """
 
         self.project = project
-        if endpoint:
-            if endpoint.startswith("/") and os.path.exists(endpoint):
-                endpoint = f"http+unix://{parse.quote(endpoint, safe='')}"
-            else:
-                # Extra trailing slashes cause LXD to 301
-                endpoint = endpoint.rstrip("/")
-                if cert is None and (
-                    os.path.exists(DEFAULT_CERTS.cert)
-                    and os.path.exists(DEFAULT_CERTS.key)
-                ):
-                    cert = DEFAULT_CERTS
-
-                # Try to use an existing server certificate if one exists
-                if isinstance(verify, bool) and endpoint.startswith("https://"):
-                    no_proto = re.sub(r"^https://\[?", "", endpoint)
-                    remote = re.sub(r"]?(:[0-9]+)?$", "", no_proto)
-                    remote_cert_path = os.path.join(
-                        CERTS_PATH, "servercerts", remote + ".crt"
-                    )
-                    if os.path.exists(remote_cert_path):
-                        verify = remote_cert_path
-        else:
-            if "LXD_DIR" in os.environ:
-                path = os.path.join(os.environ.get("LXD_DIR"), "unix.socket")
-            elif os.path.exists("/var/snap/lxd/common/lxd/unix.socket"):
-                path = "/var/snap/lxd/common/lxd/unix.socket"
-            else:
-                path = "/var/lib/lxd/unix.socket"
-            endpoint = f"http+unix://{parse.quote(path, safe='')}"
+        self.json_codec = _get_json_codec(json_codec)
+        endpoint, cert, verify = _resolve_endpoint(endpoint, cert, verify)
         self.cert = cert
         if session is None:
-            session = get_session_for_url(endpoint, cert=cert, verify=verify)
+            session = get_session_for_url(
+                endpoint,
+                cert=cert,
+                verify=verify,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
         self.api = _APINode(
-            f"{endpoint}/{version}", session, timeout=timeout, project=project
+            f"{endpoint}/{version}",
+            session,
+            timeout=timeout,
+            project=project,
+            json_codec=self.json_codec,
         )
         use_ssl = self.api.scheme == "https" and self.cert
         self.ssl_options = (
@@ -561,6 +1310,7 @@ class Client:
         self.projects = managers.ProjectManager(self)
         self.storage_pools = managers.StoragePoolManager(self)
         self._resource_cache = None
+        self.operation_tracker = _OperationTracker(self) if track_operations else None
 
     @property
     def trusted(self):
@@ -672,13 +1422,19 @@ class Client:
             websocket_client = _WebsocketClient
 
         client = websocket_client(self.websocket_url, ssl_options=self.ssl_options)
+        if isinstance(client, _WebsocketClient):
+            client.json_codec = self.json_codec
         parsed = parse.urlparse(self.api.events._api_endpoint)
 
         resource = parsed.path
 
+        query = {}
+        # Events are only sent for the project given, or the default one.
+        if self.project is not None:
+            query["project"] = self.project
         if event_types and EventType.All not in event_types:
-            query = parse.parse_qs(parsed.query)
-            query.update({"type": ",".join(t.value for t in event_types)})
+            query["type"] = ",".join(t.value for t in event_types)
+        if query:
             resource = f"{resource}?{parse.urlencode(query)}"
 
         client.resource = resource
@@ -43,6 +43,18 @@ class Conflict(LXDAPIException):
     """An exception raised when there is a conflict."""
 
 
+class FileTransferError(Exception):
+    """An exception raised when files fail to transfer to or from an instance.
+
+    The exception of each failed file is in `errors`, by its path in the
+    instance.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} file(s) failed to transfer")
+        self.errors = errors
+
+
 class LXDAPIExtensionNotAvailable(Exception):
     """An exception raised when requested LXD API Extension is not present
     on current host."""
@@ -4,26 +4,50 @@ import inspect
 from contextlib import contextmanager
 
 
+@functools.cache
+def _manager_methods(manager_for):
+    """Return the class methods of the model `manager_for`, by name."""
+    module = ".".join(manager_for.split(".")[0:-1])
+    obj = manager_for.split(".")[-1]
+    target_module = importlib.import_module(module)
+    target = getattr(target_module, obj)
+
+    return dict(inspect.getmembers(target, predicate=inspect.ismethod))
+
+
 class BaseManager:
-    """A BaseManager class for handling collection operations."""
+    """A BaseManager class for handling collection operations.
+
+    The class methods of the model named by `manager_for` are available on
+    the manager, with the arguments of the manager passed first. They are
+    bound on first access.
+    """
 
     @property
     def manager_for(self):  # pragma: no cover
         raise AttributeError("Manager class requires 'manager_for' attribute")
 
     def __init__(self, *args, **kwargs):
-        manager_for = self.manager_for
-        module = ".".join(manager_for.split(".")[0:-1])
-        obj = manager_for.split(".")[-1]
-        target_module = importlib.import_module(module)
-        target = getattr(target_module, obj)
-
-        methods = inspect.getmembers(target, predicate=inspect.ismethod)
-        for name, method in methods:
-            func = functools.partial(method, *args, **kwargs)
-            setattr(self, name, func)
+        self._args = args
+        self._kwargs = kwargs
         return super().__init__()
 
+    def __getattr__(self, name):
+        if name in ("_args", "_kwargs"):
+            raise AttributeError(name)
+        try:
+            method = _manager_methods(self.manager_for)[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            ) from None
+        func = functools.partial(method, *self._args, **self._kwargs)
+        setattr(self, name, func)
+        return func
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_manager_methods(self.manager_for)))
+
 
 class CertificateManager(BaseManager):
     manager_for = "pylxd.models.Certificate"
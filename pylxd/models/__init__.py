@@ -4,7 +4,7 @@ from pylxd.models.container import Container
 from pylxd.models.image import Image
 from pylxd.models.instance import Instance, Snapshot
 from pylxd.models.network import Network, NetworkForward
-from pylxd.models.operation import Operation
+from pylxd.models.operation import Operation, OperationFuture
 from pylxd.models.profile import Profile
 from pylxd.models.project import Project
 from pylxd.models.storage_pool import (
@@ -26,6 +26,7 @@ __all__ = [
     "Network",
     "NetworkForward",
     "Operation",
+    "OperationFuture",
     "Profile",
     "Project",
     "Snapshot",
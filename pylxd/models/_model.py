@@ -11,10 +11,12 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import contextlib
 import os
 import warnings
 
 from pylxd import exceptions
+from pylxd.models.operation import OperationFuture
 
 MISSING = object()
 
@@ -43,9 +45,35 @@ class Manager:
     """A manager declaration.
 
     This class signals to the model that it will have a Manager
-    attribute.
+    attribute. If a `factory` is given, the manager is created by calling
+    it with the model object the first time the attribute is read, rather
+    than being set by the model's constructor.
     """
 
+    def __init__(self, factory=None):
+        self.factory = factory
+
+
+class _LazyManager:
+    """The descriptor of a manager created on first access."""
+
+    def __init__(self, slot, factory):
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            manager = self.factory(obj)
+            setattr(obj, self.slot, manager)
+            return manager
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
 
 class Parent:
     """A parent declaration.
@@ -76,7 +104,10 @@ class ModelType(type):
             if isinstance(val, Attribute):
                 attributes[key] = val
                 for_removal.append(key)
-            if isinstance(val, Manager) or isinstance(val, Parent):
+            if isinstance(val, Manager) and val.factory is not None:
+                managers.append(f"_{key}_manager")
+                attrs[key] = _LazyManager(f"_{key}_manager", val.factory)
+            elif isinstance(val, Manager) or isinstance(val, Parent):
                 managers.append(key)
                 for_removal.append(key)
         for key in for_removal:
@@ -96,6 +127,79 @@ class ModelType(type):
         return super().__new__(cls, name, bases, attrs)
 
 
+def _filter_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _filter_expression(filters):
+    """Build a LXD filter expression.
+
+    :param filters: a filter expression, or a dict of fields and the values
+        they must equal. Fields are dotted paths such as
+        ``config.user.role``.
+    :type filters: str or dict
+    :returns: the filter expression
+    :rtype: str
+    """
+    if isinstance(filters, str):
+        return filters
+    clauses = []
+    for field, value in filters.items():
+        value = _filter_value(value)
+        if not value or any(c.isspace() for c in value):
+            value = f'"{value}"'
+        clauses.append(f"{field} eq {value}")
+    return " and ".join(clauses)
+
+
+def _filter_lookup(data, field):
+    if field in data:
+        return data[field]
+    # Keys may contain dots themselves (e.g. config keys), so try each way
+    # of splitting the path.
+    parts = field.split(".")
+    for i in range(1, len(parts)):
+        head = ".".join(parts[:i])
+        if isinstance(data.get(head), dict):
+            try:
+                return _filter_lookup(data[head], ".".join(parts[i:]))
+            except KeyError:
+                pass
+    raise KeyError(field)
+
+
+def _filter_matches(data, filters):
+    """Return whether an object from the API matches a dict of filters.
+
+    This is the client side equivalent of _filter_expression() for servers
+    without the `api_filtering` extension.
+    """
+    for field, value in filters.items():
+        try:
+            found = _filter_lookup(data, field)
+        except KeyError:
+            return False
+        if _filter_value(found) != _filter_value(value):
+            return False
+    return True
+
+
+def _server_side_filtering(client, filters):
+    """Return whether `filters` can be sent to the server.
+
+    :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable` if the
+        'api_filtering' api extension is missing and `filters` is an
+        expression, which can't be applied client side.
+    """
+    if client.has_api_extension("api_filtering"):
+        return True
+    if isinstance(filters, str):
+        raise exceptions.LXDAPIExtensionNotAvailable("api_filtering")
+    return False
+
+
 # Global used to record which warnings have been issued already for unknown
 # attributes.
 _seen_attribute_warnings: set[str] = set()
@@ -125,7 +229,7 @@ class Model(metaclass=ModelType):
     """
 
     NotFound = exceptions.NotFound
-    __slots__ = ["client", "__dirty__"]
+    __slots__ = ["client", "__dirty__", "_operation"]
 
     def __init__(self, client, **kwargs):
         self.__dirty__ = set()
@@ -135,28 +239,56 @@ class Model(metaclass=ModelType):
             try:
                 setattr(self, key, val)
             except AttributeError:
-                env = os.environ.get("PYLXD_WARNINGS", "").lower()
-                item = f"{self.__class__.__name__}.{key}"
-                if env != "always" and item in _seen_attribute_warnings:
-                    continue
-                _seen_attribute_warnings.add(item)
-                if env == "none":
-                    continue
-                warnings.warn(
-                    f'Attempted to set unknown attribute "{key}" '
-                    f'on instance of "{self.__class__.__name__}"'
-                )
+                self._warn_unknown_attribute(key)
         self.__dirty__.clear()
 
-    def __getattribute__(self, name):
-        try:
-            return super().__getattribute__(name)
-        except AttributeError:
-            if name in self.__attributes__:
-                self.sync()
-                return super().__getattribute__(name)
-            else:
-                raise
+    @classmethod
+    def _warn_unknown_attribute(cls, key):
+        env = os.environ.get("PYLXD_WARNINGS", "").lower()
+        item = f"{cls.__name__}.{key}"
+        if env != "always" and item in _seen_attribute_warnings:
+            return
+        _seen_attribute_warnings.add(item)
+        if env == "none":
+            return
+        warnings.warn(
+            f'Attempted to set unknown attribute "{key}" '
+            f'on instance of "{cls.__name__}"'
+        )
+
+    @classmethod
+    def _from_api(cls, client, data, **kwargs):
+        """Build an object from data sent by LXD.
+
+        Unlike the constructor, the attributes are stored as they are, without
+        running their validators or marking them dirty. Unknown attributes
+        are warned about in the same way.
+
+        :param data: the object, as returned by the API
+        :type data: dict
+        :param kwargs: further attributes to set on the object, e.g. parents
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dirty__", set())
+        object.__setattr__(obj, "client", client)
+        for items in (data.items(), kwargs.items()):
+            for key, val in items:
+                try:
+                    object.__setattr__(obj, key, val)
+                except AttributeError:
+                    cls._warn_unknown_attribute(key)
+        return obj
+
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails, e.g. for an attribute whose
+        # slot has not been filled yet, so reading set attributes is as fast
+        # as for any other object.
+        if name in self.__attributes__:
+            self.sync()
+            return object.__getattribute__(self, name)
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
 
     def __setattr__(self, name, value):
         if name in self.__attributes__:
@@ -175,8 +307,8 @@ class Model(metaclass=ModelType):
     def _raw_attr(self, name, default=None):
         """Read a model attribute slot without triggering sync.
 
-        Unlike normal attribute access, this bypasses Model.__getattribute__
-        so it never calls sync(). Returns default when the slot is unset or
+        Unlike normal attribute access, this bypasses Model.__getattr__ so
+        it never calls sync(). Returns default when the slot is unset or
         holds the MISSING sentinel.
         """
         try:
@@ -206,6 +338,12 @@ class Model(metaclass=ModelType):
     def dirty(self):
         return len(self.__dirty__) > 0
 
+    @property
+    def operation(self):
+        """The :class:`~pylxd.models.operation.OperationFuture` of the call
+        creating this object with ``wait=False``, or ``None``."""
+        return self._raw_attr("_operation")
+
     def sync(self, rollback=False):
         """Sync from the server.
 
@@ -217,7 +355,7 @@ class Model(metaclass=ModelType):
         # XXX: rockstar (25 Jun 2016) - This has the potential to step
         # on existing attributes.
         response = self.api.get()
-        payload = response.json()["metadata"]
+        payload = response.metadata
         for key, val in payload.items():
             if key not in self.__dirty__ or rollback:
                 try:
@@ -240,14 +378,50 @@ class Model(metaclass=ModelType):
         """Reset the object from the server."""
         return self.sync(rollback=True)
 
+    @classmethod
+    def _from_listing(cls, client, item, key="name", **kwargs):
+        """Build an object from an item of a collection listing.
+
+        With recursion, LXD lists complete objects, which populate the
+        models. Otherwise it lists urls, and only `key` is set from the last
+        segment of each url; other attributes are fetched by `sync`.
+
+        :param item: the object or url listed by LXD
+        :param key: the attribute identifying an object in its url
+        :param kwargs: further attributes to set on the object
+        """
+        if isinstance(item, dict):
+            return cls._from_api(client, item, **kwargs)
+        value = item.split("/")[-1].split("?")[0]
+        return cls(client, **{key: value}, **kwargs)
+
+    @classmethod
+    def _all_from_metadata(cls, client, metadata, key="name", **kwargs):
+        """Build the objects of a collection listing, see _from_listing()."""
+        return [cls._from_listing(client, item, key, **kwargs) for item in metadata]
+
+    @classmethod
+    def _iter_from_response(cls, client, response, key="name", filters=None, **kwargs):
+        """Yield the objects of a streamed collection listing.
+
+        :param response: the listing, requested with ``stream=True``
+        :param filters: a dict of filters to apply client side
+        """
+        with contextlib.closing(response):
+            for item in response.iter_metadata():
+                if filters is None or _filter_matches(item, filters):
+                    yield cls._from_listing(client, item, key, **kwargs)
+
     def _handle_async_response(self, response, wait):
         """Handle async response if wait is True.
 
         :param response: The HTTP response object
         :param wait: If True, wait for async operations to complete
+        :returns: the future of the async operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         """
         if not wait:
-            return
+            return OperationFuture._from_response(self.client, response)
 
         response_json = response.json()
         if response_json["type"] == "async":
@@ -260,12 +434,14 @@ class Model(metaclass=ModelType):
         :param client: The LXD client instance
         :param response: The HTTP response object
         :param wait: If True, wait for async operations to complete
+        :returns: the future of the async operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         """
         if not wait:
             # If not waiting, just validate the response was accepted
             if response.status_code not in (200, 201, 202):
                 raise exceptions.LXDAPIException(response)
-            return
+            return OperationFuture._from_response(client, response)
 
         response_json = response.json()
         if response_json["type"] == "async":
@@ -277,21 +453,32 @@ class Model(metaclass=ModelType):
         This method should write the new data to the server via marshalling.
         It should be a no-op when the object is not dirty, to prevent needless
         I/O.
+
+        :returns: the future of the operation, if LXD runs the change as one
+            and `wait` is False
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         """
         marshalled = self.marshall()
         response = self.api.put(json=marshalled)
 
         # Use helper method for JSON parsing
-        self._handle_async_response(response, wait)
+        operation = self._handle_async_response(response, wait)
         self.__dirty__.clear()
+        return operation
 
     def delete(self, wait=False):
-        """Delete an object from the server."""
+        """Delete an object from the server.
+
+        :returns: the future of the operation, if LXD runs the deletion as one
+            and `wait` is False
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
+        """
         response = self.api.delete()
 
         # Use helper method for JSON parsing
-        self._handle_async_response(response, wait)
+        operation = self._handle_async_response(response, wait)
         self.client = None
+        return operation
 
     def marshall(self, skip_readonly=True):
         """Marshall the object in preparation for updating to the server."""
@@ -317,12 +504,15 @@ class Model(metaclass=ModelType):
         :type wait: bool
         :param json: Dictionary that the represents the request body used on the POST method.
         :type wait: dict
+        :returns: the future of the operation, if LXD runs the request as one
+            and `wait` is False
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         :raises: :class:`pylxd.exception.LXDAPIException` on error
         """
         response = self.api.post(json=json)
 
         # Use helper method for JSON parsing
-        self._handle_async_response(response, wait)
+        return self._handle_async_response(response, wait)
 
     def put(self, put_object, wait=False):
         """Access the PUT method directly for the object.
@@ -374,12 +564,15 @@ class Model(metaclass=ModelType):
         :type wait: bool
         :param put_object: jsonable dictionary to use as the PUT json object.
         :type put_object: dict
+        :returns: the future of the operation, if LXD runs the request as one
+            and `wait` is False
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         :raises: :class:`pylxd.exception.LXDAPIException` on error
         """
         response = self.api.put(json=put_object)
 
         # Use helper method for JSON parsing
-        self._handle_async_response(response, wait)
+        return self._handle_async_response(response, wait)
 
     def patch(self, patch_object, wait=False):
         """Access the PATCH method directly for the object.
@@ -432,9 +625,12 @@ class Model(metaclass=ModelType):
         :type wait: bool
         :param patch_object: jsonable dictionary to use as the PUT json object.
         :type patch_object: dict
+        :returns: the future of the operation, if LXD runs the request as one
+            and `wait` is False
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         :raises: :class:`pylxd.exception.LXDAPIException` on error
         """
         response = self.api.patch(json=patch_object)
 
         # Use helper method for JSON parsing
-        self._handle_async_response(response, wait)
+        return self._handle_async_response(response, wait)
@@ -35,18 +35,32 @@ class Certificate(model.Model):
         """Get a certificate by fingerprint."""
         response = client.api.certificates[fingerprint].get()
 
-        return cls(client, **response.json()["metadata"])
+        return cls(client, **response.metadata)
 
     @classmethod
-    def all(cls, client):
-        """Get all certificates."""
-        response = client.api.certificates.get()
+    def all(cls, client, recursion=1):
+        """Get all certificates.
 
-        certs = []
-        for cert in response.json()["metadata"]:
-            fingerprint = cert.split("/")[-1]
-            certs.append(cls(client, fingerprint=fingerprint))
-        return certs
+        :param recursion: 1 (the default) to fetch every certificate in full in a
+            single request, or 0 to only fetch their fingerprints; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        """
+        response = client.api.certificates.get(params={"recursion": recursion})
+
+        return cls._all_from_metadata(client, response.metadata, key="fingerprint")
+
+    @classmethod
+    def iter_all(cls, client, recursion=1):
+        """Iterate over all certificates.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and certificates are yielded one at a time.
+        """
+        response = client.api.certificates.get(
+            params={"recursion": recursion}, stream=True
+        )
+        yield from cls._iter_from_response(client, response, key="fingerprint")
 
     @classmethod
     def create(
@@ -106,7 +120,7 @@ class Certificate(model.Model):
         if projects is not None:
             data["projects"] = projects
         response = client.api.certificates.post(json=data)
-        metadata = response.json()["metadata"]["metadata"]
+        metadata = response.metadata["metadata"]
 
         # Assemble a token from the returned metadata
         token = {
@@ -23,13 +23,12 @@ class Cluster(model.Model):
     enabled = model.Attribute(readonly=True)
     member_config = model.Attribute(readonly=True)
 
-    members = model.Manager()
-    certificate = model.Manager()
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.members = managers.ClusterMemberManager(self.client, self)
-        self.certificate = managers.ClusterCertificateManager(self.client, self)
+    members = model.Manager(
+        lambda cluster: managers.ClusterMemberManager(cluster.client, cluster)
+    )
+    certificate = model.Manager(
+        lambda cluster: managers.ClusterCertificateManager(cluster.client, cluster)
+    )
 
     def __eq__(self, other):
         if not isinstance(other, Cluster):
@@ -51,7 +50,7 @@ class Cluster(model.Model):
         )
 
         # Wait for operation to complete
-        operation = client.operations.wait_for_operation(response.json()["operation"])
+        operation = client.operations.wait_for_operation(response.operation)
 
         if operation.status_code == 200:
             return
@@ -62,7 +61,7 @@ class Cluster(model.Model):
         """Get cluster details"""
         client.assert_has_api_extension("clustering")
         response = client.api.cluster.get()
-        container = cls(client, **response.json()["metadata"])
+        container = cls(client, **response.metadata)
         return container
 
 
@@ -88,18 +87,20 @@ class ClusterMember(model.Model):
         """Get a cluster member by name."""
         response = client.api.cluster.members[server_name].get()
 
-        return cls(client, **response.json()["metadata"])
+        return cls(client, **response.metadata)
 
     @classmethod
-    def all(cls, client, *args):
-        """Get all cluster members."""
-        response = client.api.cluster.members.get()
-
-        nodes = []
-        for node in response.json()["metadata"]:
-            server_name = node.split("/")[-1]
-            nodes.append(cls(client, server_name=server_name))
-        return nodes
+    def all(cls, client, *args, recursion=1):
+        """Get all cluster members.
+
+        :param recursion: 1 (the default) to fetch every member in full in a
+            single request, or 0 to only fetch their server_names; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        """
+        response = client.api.cluster.members.get(params={"recursion": recursion})
+
+        return cls._all_from_metadata(client, response.metadata, key="server_name")
 
     @property
     def api(self):
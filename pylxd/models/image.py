@@ -18,7 +18,9 @@ import warnings
 
 from requests_toolbelt import MultipartEncoder
 
+from pylxd.client import _FileStream
 from pylxd.models import _model as model
+from pylxd.models.operation import OperationFuture
 
 
 def _image_create_from_config(client, config, wait=False):
@@ -28,8 +30,8 @@ def _image_create_from_config(client, config, wait=False):
     """
     response = client.api.images.post(json=config)
     if wait:
-        return client.operations.wait_for_operation(response.json()["operation"])
-    return response.json()["operation"]
+        return client.operations.wait_for_operation(response.operation)
+    return response.operation
 
 
 class Image(model.Model):
@@ -87,7 +89,7 @@ class Image(model.Model):
         """Get an image."""
         response = client.api.images[fingerprint].get()
 
-        image = cls(client, **response.json()["metadata"])
+        image = cls(client, **response.metadata)
         return image
 
     @classmethod
@@ -95,19 +97,64 @@ class Image(model.Model):
         """Get an image by its alias."""
         response = client.api.images.aliases[alias].get()
 
-        fingerprint = response.json()["metadata"]["target"]
+        fingerprint = response.metadata["target"]
         return cls.get(client, fingerprint)
 
     @classmethod
-    def all(cls, client):
-        """Get all images."""
-        response = client.api.images.get()
+    def all(cls, client, recursion=1, filter=None):
+        """Get all images.
+
+        If `filter` is provided, only the matching images are returned, e.g.
+        ``{"properties.os": "Ubuntu", "public": True}``. The filter is
+        applied by the server if it supports the ``api_filtering``
+        extension, and otherwise client side, in which case complete images
+        are fetched.
+
+        :param recursion: 1 (the default) to fetch every image in full in a
+            single request, or 0 to only fetch their fingerprints; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        :param filter: A dict of fields and the values they must equal, or a
+            LXD filter expression (requires ``api_filtering``).
+        :type filter: dict or str
+        :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable` if
+            `filter` is an expression and the 'api_filtering' api extension
+            is missing.
+        """
+        params, client_filter = cls._all_params(client, recursion, filter)
+        response = client.api.images.get(params=params)
+
+        metadata = response.metadata
+        if client_filter is not None:
+            metadata = [i for i in metadata if model._filter_matches(i, client_filter)]
+
+        return cls._all_from_metadata(client, metadata, key="fingerprint")
+
+    @classmethod
+    def iter_all(cls, client, recursion=1, filter=None):
+        """Iterate over all images.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and images are yielded one at a time.
+        """
+        params, client_filter = cls._all_params(client, recursion, filter)
+        response = client.api.images.get(params=params, stream=True)
+        yield from cls._iter_from_response(
+            client, response, key="fingerprint", filters=client_filter
+        )
 
-        images = []
-        for url in response.json()["metadata"]:
-            fingerprint = url.split("/")[-1]
-            images.append(cls(client, fingerprint=fingerprint))
-        return images
+    @classmethod
+    def _all_params(cls, client, recursion, filter):
+        """Return the query parameters and client side filters of a listing."""
+        client_filter = None
+        if filter is not None and not model._server_side_filtering(client, filter):
+            client_filter = filter
+            recursion = max(recursion, 1)
+
+        params = {"recursion": recursion}
+        if filter is not None and client_filter is None:
+            params["filter"] = model._filter_expression(filter)
+        return params, client_filter
 
     @classmethod
     def create(
@@ -119,6 +166,10 @@ class Image(model.Model):
         push metadata and image together in a single request. The metadata must
         be a tar archive.
 
+        `image_data` may be a file object opened in binary mode, which is
+        streamed rather than read into memory; over the unix socket, a
+        regular file is sent with sendfile(2).
+
         `wait` parameter is now ignored, as the image fingerprint cannot be
         reliably determined consistently until after the image is indexed.
         """
@@ -156,11 +207,13 @@ class Image(model.Model):
                 )
             data = MultipartEncoder(files)
             headers.update({"Content-Type": data.content_type})
+        elif hasattr(image_data, "read"):
+            data = _FileStream(image_data)
         else:
             data = image_data
 
         response = client.api.images.post(data=data, headers=headers)
-        operation = client.operations.wait_for_operation(response.json()["operation"])
+        operation = client.operations.wait_for_operation(response.operation)
         return cls(client, fingerprint=operation.metadata["fingerprint"])
 
     @classmethod
@@ -234,6 +287,9 @@ class Image(model.Model):
 
         Destination host information is contained in the client
         connection passed in.
+
+        If wait=True, the copied Image is returned; otherwise the future of
+        the operation.
         """
         self.sync()  # Make sure the object isn't stale
 
@@ -261,13 +317,13 @@ class Image(model.Model):
 
         if self.public is not True:
             response = self.api.secret.post(json={})
-            secret = response.json()["metadata"]["metadata"]["secret"]
+            secret = response.metadata["metadata"]["secret"]
             config["source"]["secret"] = secret
             cert = self.client.host_info["environment"]["certificate"]
             config["source"]["certificate"] = cert
 
-        _image_create_from_config(new_client, config, wait)
-
         if wait:
+            _image_create_from_config(new_client, config, wait)
             return new_client.images.get(self.fingerprint)
-        return None
+        response = new_client.api.images.post(json=config)
+        return OperationFuture._from_response(new_client, response)
@@ -11,26 +11,301 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import concurrent.futures
 import errno
+import functools
+import hashlib
+import importlib
+import io
 import json
 import logging
 import os
 import stat
-import time
+import sys
+import tarfile
+import threading
 import warnings
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from typing import IO, NamedTuple, Optional
 from urllib import parse
 
+import requests
 from ws4py.client import WebSocketBaseClient
 from ws4py.manager import WebSocketManager
 from ws4py.messaging import BinaryMessage
 
 from pylxd import managers
-from pylxd.client import _ws_exclude_origin
-from pylxd.exceptions import LXDAPIException
+from pylxd.client import _FILE_CHUNK_SIZE, _FileStream, _ws_exclude_origin
+from pylxd.exceptions import FileTransferError, LXDAPIException, NotFound
 from pylxd.models import _model as model
-from pylxd.models.operation import Operation
+from pylxd.models.operation import Operation, OperationFuture
+
+# The status and status code of instances after a successful state action.
+_ACTION_STATUS = {
+    "start": ("Running", 103),
+    "restart": ("Running", 103),
+    "unfreeze": ("Running", 103),
+    "stop": ("Stopped", 102),
+    "freeze": ("Frozen", 110),
+}
+
+# The manifest of the files synced by sync_tree, kept in the synced directory.
+_MANIFEST_NAME = ".pylxd-manifest.json"
+
+logger = logging.getLogger(__name__)
+
+
+class _Counter:
+    """A thread-safe count of transferred files, reported to `progress`."""
+
+    def __init__(self, total, progress=None):
+        self.total = total
+        self.count = 0
+        self._progress = progress
+        self._lock = threading.Lock()
+
+    def add(self):
+        with self._lock:
+            self.count += 1
+            if self._progress is not None:
+                self._progress(self.count, self.total)
+
+
+def _run_all(executor, calls):
+    """Run the calls, by key, in `executor` and wait for them all.
+
+    :raises: :class:`pylxd.exceptions.FileTransferError` with the error of
+        each failed call, by key.
+    """
+    futures = {key: executor.submit(call) for key, call in calls.items()}
+    errors = {}
+    for key, future in futures.items():
+        try:
+            future.result()
+        except (LXDAPIException, OSError) as e:
+            errors[key] = e
+    if errors:
+        raise FileTransferError(errors)
+
+
+def _tree_entries(src):
+    """Yield the path, path relative to `src` and lstat of each entry of `src`.
+
+    Directories come before their content. Symlinks to directories are
+    yielded but not walked into.
+    """
+    for path, dirnames, filenames in os.walk(src):
+        links = [d for d in dirnames if os.path.islink(os.path.join(path, d))]
+        names = [path] + [os.path.join(path, name) for name in filenames + links]
+        for name in names:
+            yield name, os.path.relpath(name, src), os.lstat(name)
+
+
+def _tar_stream(src, uid=0, gid=0, include=None):
+    """Yield a tar archive of the directory `src`, built as it is read.
+
+    Directories, regular files and symlinks are archived with their mode and
+    modification time, owned by `uid` and `gid`; other files are skipped.
+    If `include` is given, only the files and symlinks whose path relative
+    to `src` is in it are archived, along with every directory. The content
+    of files is read in chunks, so memory use doesn't depend on their size.
+    """
+    size = 0
+    for name, relpath, st in _tree_entries(src):
+        if include is not None and relpath not in include:
+            if not stat.S_ISDIR(st.st_mode):
+                continue
+        info = tarfile.TarInfo(relpath)
+        info.mode = stat.S_IMODE(st.st_mode)
+        info.mtime = st.st_mtime
+        info.uid, info.gid = uid, gid
+        if stat.S_ISDIR(st.st_mode):
+            info.type = tarfile.DIRTYPE
+        elif stat.S_ISLNK(st.st_mode):
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.readlink(name)
+        elif stat.S_ISREG(st.st_mode):
+            info.size = st.st_size
+        else:
+            continue
+        header = info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+        size += len(header) + info.size
+        yield header
+        if info.type == tarfile.REGTYPE:
+            yield from _read_exactly(name, info.size)
+            padding = -info.size % tarfile.BLOCKSIZE
+            size += padding
+            yield bytes(padding)
+    # The end of the archive, padded to a whole record.
+    end = 2 * tarfile.BLOCKSIZE
+    yield bytes(end + -(size + end) % tarfile.RECORDSIZE)
+
+
+def _tree_manifest(src, cache_path=None):
+    """Return the size, mtime and sha256 of each file and symlink of `src`.
+
+    The manifest maps the path of each file, relative to `src`, to its
+    ``[size, mtime_ns, sha256]``; symlinks are hashed by their target. It is
+    saved to the JSON file `cache_path`, if given, and the hashes there are
+    reused for the files whose size and mtime didn't change.
+    """
+    cache = {}
+    if cache_path is not None:
+        with suppress(OSError, ValueError):
+            with open(cache_path) as f:
+                cache = json.load(f)
+
+    manifest = {}
+    for name, relpath, st in _tree_entries(src):
+        if stat.S_ISLNK(st.st_mode):
+            target = os.fsencode(os.readlink(name))
+            digest = hashlib.sha256(b"symlink:" + target).hexdigest()
+        elif stat.S_ISREG(st.st_mode):
+            cached = cache.get(relpath)
+            if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+                digest = cached[2]
+            else:
+                digest = hashlib.sha256()
+                for chunk in _read_exactly(name, st.st_size):
+                    digest.update(chunk)
+                digest = digest.hexdigest()
+        else:
+            continue
+        manifest[relpath] = [st.st_size, st.st_mtime_ns, digest]
+
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(f"{cache_path}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{cache_path}.tmp", cache_path)
+    return manifest
+
+
+def _manifest_cache_path(src):
+    """Return the path caching the manifest of the local directory `src`."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    key = hashlib.sha256(os.fsencode(os.path.abspath(src))).hexdigest()
+    return os.path.join(cache_home, "pylxd", "manifests", f"{key}.json")
+
+
+def _read_exactly(path, size):
+    """Yield `size` bytes of the file `path` in chunks.
+
+    The file is truncated, or padded with zeros, if its size changed since
+    `size` was found.
+    """
+    with open(path, "rb") as f:
+        while size:
+            chunk = f.read(min(_FILE_CHUNK_SIZE, size))
+            if not chunk:
+                break
+            size -= len(chunk)
+            yield chunk
+    while size:
+        chunk = bytes(min(_FILE_CHUNK_SIZE, size))
+        size -= len(chunk)
+        yield chunk
+
+
+class _SFTPSocket:
+    """The upgraded connection of an SFTP session, as paramiko uses it.
+
+    paramiko polls plain sockets with select, which misses data a TLS socket
+    already decrypted, so it is given this wrapper instead, which it reads
+    with blocking calls.
+    """
+
+    def __init__(self, response, sock):
+        self._response = response
+        self._sock = sock
+
+    def send(self, data):
+        return self._sock.send(data)
+
+    def recv(self, size):
+        return self._sock.recv(size)
+
+    def settimeout(self, timeout):
+        self._sock.settimeout(timeout)
+
+    def get_name(self):
+        return "sftp"
+
+    def close(self):
+        self._response.close()
+
+
+def _open_sftp(endpoint):
+    """Open an SFTP session on the upgraded connection of `endpoint`.
+
+    :returns: the ``paramiko.SFTPClient``, or None if paramiko isn't
+        installed.
+    """
+    try:
+        paramiko = importlib.import_module("paramiko")
+    except ImportError:
+        return None
+    response, sock = endpoint.upgrade("sftp")
+    try:
+        return paramiko.SFTPClient(_SFTPSocket(response, sock))
+    except BaseException:
+        response.close()
+        raise
+
+
+def _sftp_info(attrs):
+    """Return the type, mode, uid and gid of the SFTP attributes of a file."""
+    if stat.S_ISDIR(attrs.st_mode):
+        file_type = "directory"
+    elif stat.S_ISLNK(attrs.st_mode):
+        file_type = "symlink"
+    else:
+        file_type = "file"
+    return {
+        "type": file_type,
+        "mode": stat.S_IMODE(attrs.st_mode),
+        "uid": attrs.st_uid,
+        "gid": attrs.st_gid,
+    }
+
+
+@contextmanager
+def _sftp_errors():
+    """Raise the errors of SFTP requests as the files API would.
+
+    :raises: NotFound for missing files, and LXDAPIException otherwise, with
+        the SFTP error as their cause.
+    """
+    try:
+        yield
+    except Exception as e:
+        paramiko = sys.modules.get("paramiko")
+        if not isinstance(e, (OSError, EOFError)) and not (
+            paramiko is not None and isinstance(e, paramiko.SSHException)
+        ):
+            raise
+        status = {errno.ENOENT: 404, errno.EACCES: 403}.get(
+            getattr(e, "errno", None), 500
+        )
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(
+            {"type": "error", "error": str(e) or type(e).__name__, "error_code": status}
+        ).encode("utf-8")
+        raise (NotFound if status == 404 else LXDAPIException)(response) from e
+
+
+def _sftp_usable_after(error):
+    """Return True if an SFTP session can be used after the exception
+    `error`, i.e. unless it was raised by the connection failing."""
+    cause = error.__cause__
+    if cause is None:
+        return True
+    # paramiko raises EOFError at the end of files, and OSError without
+    # errno or with these for the other status responses of the server.
+    return isinstance(cause, EOFError) or (
+        isinstance(cause, OSError) and cause.errno in (None, errno.ENOENT, errno.EACCES)
+    )
 
 
 class InstanceState(model.AttributeDict):
@@ -43,6 +318,13 @@ class _InstanceExecuteResult(NamedTuple):
     stderr: IO
 
 
+class _SyncTreeResult(NamedTuple):
+    transferred: list
+    deleted: list
+    bytes_transferred: int
+    bytes_saved: int
+
+
 class Instance(model.Model):
     """An LXD Instance.
 
@@ -69,8 +351,10 @@ class Instance(model.Model):
     status_code = model.Attribute(readonly=True)
     stateful = model.Attribute(readonly=True)
 
-    snapshots = model.Manager()
-    files = model.Manager()
+    snapshots = model.Manager(
+        lambda instance: managers.SnapshotManager(instance.client, instance)
+    )
+    files = model.Manager(lambda instance: instance.FilesManager(instance))
 
     _endpoint = "instances"
     _instance_type: Optional[str] = None
@@ -95,28 +379,191 @@ class Instance(model.Model):
         return self.client.api[self._endpoint][self.name]
 
     class FilesManager:
-        """A pseudo-manager for namespacing file operations."""
+        """A pseudo-manager for namespacing file operations.
+
+        If `use_sftp` is True, LXD has the ``instances_sftp`` extension and
+        paramiko is installed, files are transferred over SFTP sessions of
+        the instance rather than with a request to the files endpoint each.
+        Unlike the files endpoint, `get` of a directory fails rather than
+        returning its listing, and files pushed without a `mode` get the
+        default mode of the SFTP server. Each thread
+        transferring files at once takes a session of its own, opened the
+        first time it is needed and kept for reuse until `close` is called.
+        Reads and writes of a file are pipelined. Errors are raised as
+        LXDAPIException, or NotFound, as with the files endpoint.
+        """
+
+        #: Whether to use SFTP sessions when LXD supports them.
+        use_sftp = False
 
         def __init__(self, instance):
             self._instance = instance
             self._endpoint = instance.client.api[instance._endpoint][
                 instance.name
             ].files
+            self._sftp_endpoint = instance.client.api.instances[instance.name].sftp
+            # The sessions not in use by a thread.
+            self._sftp_idle = []
+            self._sftp_unavailable = False
+            self._sftp_lock = threading.Lock()
+
+        @contextmanager
+        def _sftp_session(self):
+            """Use an SFTP session of the instance which no other thread uses
+            meanwhile, or None to use the files endpoint.
+
+            The session is kept for reuse afterwards, unless its connection
+            failed.
+            """
+            sftp = self._sftp_checkout()
+            if sftp is None:
+                yield None
+                return
+            usable = False
+            try:
+                yield sftp
+                usable = True
+            except LXDAPIException as e:
+                usable = _sftp_usable_after(e)
+                raise
+            except (Exception, GeneratorExit):
+                # A local error, e.g. reading a file to push, or `iter_get`
+                # being closed after its file was.
+                usable = True
+                raise
+            finally:
+                if usable:
+                    with self._sftp_lock:
+                        self._sftp_idle.append(sftp)
+                else:
+                    sftp.close()
+
+        def _sftp_checkout(self):
+            if not self.use_sftp:
+                return None
+            with self._sftp_lock:
+                if self._sftp_idle:
+                    return self._sftp_idle.pop()
+                if self._sftp_unavailable:
+                    return None
+            sftp = None
+            if self._instance.client.has_api_extension("instances_sftp"):
+                try:
+                    sftp = _open_sftp(self._sftp_endpoint)
+                except Exception as e:
+                    logger.warning(
+                        "SFTP unavailable for %s, using the files API: %s",
+                        self._instance.name,
+                        e,
+                    )
+            if sftp is None:
+                with self._sftp_lock:
+                    self._sftp_unavailable = True
+            return sftp
+
+        def close(self):
+            """Close the SFTP sessions of the instance not in use.
 
-        def put(self, filepath, data, mode=None, uid=None, gid=None):
+            The next transfer opens a new session.
+            """
+            with self._sftp_lock:
+                sessions, self._sftp_idle = self._sftp_idle, []
+                self._sftp_unavailable = False
+            for sftp in sessions:
+                sftp.close()
+
+        def _sftp_put(
+            self, sftp, filepath, fp, mode=None, uid=None, gid=None, progress=None
+        ):
+            """Write the file object `fp` to `filepath` over SFTP, pipelining
+            the writes."""
+            if mode is not None:
+                mode = self._mode_bits(mode)
+            with _sftp_errors():
+                f = sftp.open(filepath, "wb")
+                f.set_pipelined(True)
+            try:
+                # Set before writing, so the content is never readable with
+                # other permissions than those asked for.
+                with _sftp_errors():
+                    self._sftp_attrs(sftp, filepath, mode, uid, gid)
+                sent = 0
+                while True:
+                    chunk = fp.read(_FILE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    with _sftp_errors():
+                        f.write(chunk)
+                    sent += len(chunk)
+                    if progress is not None:
+                        progress(sent)
+            finally:
+                with _sftp_errors():
+                    f.close()
+
+        def _sftp_mkdir(self, sftp, path, mode=None, uid=None, gid=None):
+            """Create the directory `path` over SFTP, unless it exists."""
+            if mode is not None:
+                mode = self._mode_bits(mode)
+            with _sftp_errors():
+                try:
+                    sftp.mkdir(path)
+                except OSError:
+                    if not stat.S_ISDIR(sftp.lstat(path).st_mode):
+                        raise
+                self._sftp_attrs(sftp, path, mode, uid, gid)
+
+        @staticmethod
+        def _sftp_attrs(sftp, path, mode=None, uid=None, gid=None):
+            if mode is not None:
+                sftp.chmod(path, mode)
+            if uid is not None or gid is not None:
+                sftp.chown(path, uid or 0, gid or 0)
+
+        @staticmethod
+        def _sftp_iter(sftp, filepath, chunk_size=_FILE_CHUNK_SIZE):
+            """Iterate over the content of `filepath` in chunks, read over
+            SFTP with the reads pipelined."""
+            with _sftp_errors():
+                f = sftp.open(filepath, "rb")
+                f.prefetch()
+            try:
+                while True:
+                    with _sftp_errors():
+                        chunk = f.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+            finally:
+                with _sftp_errors():
+                    f.close()
+
+        @staticmethod
+        def _mode_bits(mode):
+            """Return the permission bits of a mode given as to `put`."""
+            if isinstance(mode, str):
+                mode = int(mode, 8)
+            if not isinstance(mode, int):
+                raise ValueError("'mode' parameter must be int or string")
+            return stat.S_IMODE(mode)
+
+        def put(self, filepath, data, mode=None, uid=None, gid=None, progress=None):
             """Push a file to the instance.
 
             This pushes a single file to the instances file system named by
-            the `filepath`.
+            the `filepath`. File objects and local files are streamed in
+            chunks rather than read into memory.
 
             :param filepath: The path in the instance to to store the data in.
             :type filepath: str
-            :param data: The data to store in the file.
-            :type data: bytes or str
+            :param data: The data to store in the file, a file object opened
+                in binary mode to read it from, or the path of a local file.
+            :type data: bytes or str or file or os.PathLike
             :param mode: The unit mode to store the file with.  The default of
                 None stores the file with the current mask of 0700, which is
                 the lxd default. If mode is True, preserve the file permissions
-                from filepath.
+                from the local file if `data` is its path, or else from
+                filepath.
             :type mode: Union[oct, int, str, bool]
             :param uid: The uid to use inside the instance. Default of None
                 results in 0 (root).
@@ -124,10 +571,31 @@ class Instance(model.Model):
             :param gid: The gid to use inside the instance.  Default of None
                 results in 0 (root).
             :type gid: int
+            :param progress: A function called with the number of bytes sent
+                so far each time a chunk of `data` is sent.
+            :type progress: callable
             :raises: LXDAPIException if something goes wrong
             """
+            if isinstance(data, os.PathLike):
+                if isinstance(mode, bool):
+                    mode = os.stat(data).st_mode if mode else None
+                with open(data, "rb") as fp:
+                    return self.put(filepath, fp, mode, uid, gid, progress)
             if isinstance(mode, bool):
                 mode = os.stat(filepath).st_mode if mode else None
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    if not hasattr(data, "read"):
+                        data = io.BytesIO(data)
+                    return self._sftp_put(
+                        sftp, filepath, data, mode, uid, gid, progress
+                    )
+            if progress is not None and not hasattr(data, "read"):
+                data = io.BytesIO(data)
+            if hasattr(data, "read"):
+                data = _FileStream(data, progress)
             headers = self._resolve_headers(mode=mode, uid=uid, gid=gid)
             response = self._endpoint.post(
                 params={"path": filepath}, data=data, headers=headers or None
@@ -155,6 +623,9 @@ class Instance(model.Model):
             :type gid: int
             :raises: LXDAPIException if something goes wrong
             """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    return self._sftp_mkdir(sftp, path, mode, uid, gid)
             headers = self._resolve_headers(mode=mode, uid=uid, gid=gid)
             headers["X-LXD-type"] = "directory"
             response = self._endpoint.post(params={"path": path}, headers=headers)
@@ -187,20 +658,181 @@ class Instance(model.Model):
             return self._instance.client.has_api_extension("file_delete")
 
         def delete(self, filepath):
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    with _sftp_errors():
+                        return sftp.remove(filepath)
             self._instance.client.assert_has_api_extension("file_delete")
             response = self._endpoint.delete(params={"path": filepath})
             if response.status_code != 200:
                 raise LXDAPIException(response)
 
         def get(self, filepath):
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    return b"".join(self._sftp_iter(sftp, filepath))
             response = self._endpoint.get(params={"path": filepath}, is_api=False)
             return response.content
 
-        def recursive_put(self, src, dst, mode=None, uid=None, gid=None):
+        def stat(self, filepath):
+            """Return the type, mode and owner of a file of the instance.
+
+            Symlinks are not followed.
+
+            :param filepath: The path of the file in the instance.
+            :type filepath: str
+            :returns: the `type` of the file, ``"file"``, ``"directory"`` or
+                ``"symlink"``, and its `mode`, `uid` and `gid`.
+            :rtype: dict
+            :raises: LXDAPIException or OSError if something goes wrong
+            """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    with _sftp_errors():
+                        return _sftp_info(sftp.lstat(filepath))
+            response = self._endpoint.get(
+                params={"path": filepath}, is_api=False, stream=True
+            )
+            response.close()
+            info = {"type": response.headers.get("X-LXD-type", "file")}
+            info.update(self._file_info(response.headers))
+            return info
+
+        def listdir(self, path):
+            """Return the names of the entries of a directory of the instance.
+
+            :param path: The path of the directory in the instance.
+            :type path: str
+            :rtype: list
+            :raises: NotADirectoryError if `path` isn't a directory
+            :raises: LXDAPIException or OSError if something goes wrong
+            """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    with _sftp_errors():
+                        return sftp.listdir(path)
+            response = self._endpoint.get(params={"path": path}, is_api=False)
+            if response.headers.get("X-LXD-type") != "directory":
+                raise NotADirectoryError(path)
+            return response.json().get("metadata") or []
+
+        def iter_get(self, filepath, chunk_size=_FILE_CHUNK_SIZE):
+            """Iterate over the content of a file of the instance in chunks.
+
+            The file is streamed, so only a chunk of it is in memory at once.
+
+            :param filepath: The path of the file in the instance.
+            :type filepath: str
+            :param chunk_size: The number of bytes of each chunk.
+            :type chunk_size: int
+            :raises: LXDAPIException if something goes wrong
+            """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    yield from self._sftp_iter(sftp, filepath, chunk_size)
+                    return
+            response = self._endpoint.get(
+                params={"path": filepath}, is_api=False, stream=True
+            )
+            try:
+                yield from response.iter_content(chunk_size)
+            finally:
+                response.close()
+
+        def get_to(self, filepath, dst, chunk_size=_FILE_CHUNK_SIZE):
+            """Pull a file from the instance to a local file.
+
+            The file is streamed to `dst` in chunks rather than read into
+            memory.
+
+            :param filepath: The path of the file in the instance.
+            :type filepath: str
+            :param dst: The local path to store the file at, created with
+                the mode of the file in the instance, or a file object opened
+                in binary mode to write the file to.
+            :type dst: str or os.PathLike or file
+            :param chunk_size: The number of bytes read at once.
+            :type chunk_size: int
+            :returns: the `mode`, `uid` and `gid` of the file in the
+                instance, as far as LXD reported them.
+            :rtype: dict
+            :raises: LXDAPIException if something goes wrong
+            """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    with _sftp_errors():
+                        info = _sftp_info(sftp.lstat(filepath))
+                    # The files API returns the target of symlinks.
+                    if info.pop("type") == "symlink":
+                        with _sftp_errors():
+                            chunks = [os.fsencode(sftp.readlink(filepath))]
+                    else:
+                        chunks = self._sftp_iter(sftp, filepath, chunk_size)
+                    self._write_to(dst, info["mode"], lambda f: f.writelines(chunks))
+                    return info
+            response = self._endpoint.get(
+                params={"path": filepath}, is_api=False, stream=True
+            )
+            info = self._file_info(response.headers)
+            try:
+                self._write_to(
+                    dst,
+                    info.get("mode", 0o666),
+                    lambda f: self._write_chunks(response, f, chunk_size),
+                )
+            finally:
+                response.close()
+            return info
+
+        @staticmethod
+        def _write_to(dst, mode, write):
+            """Call `write` with the file object `dst`, or with a local file
+            created at the path `dst` with `mode`."""
+            if hasattr(dst, "write"):
+                return write(dst)
+
+            def opener(path, flags):
+                return os.open(path, flags, mode=mode)
+
+            with open(dst, "wb", opener=opener) as f:
+                write(f)
+
+        @staticmethod
+        def _file_info(headers):
+            """Return the mode, uid and gid in the X-LXD-* headers of a file."""
+            info = {}
+            if "X-LXD-mode" in headers:
+                info["mode"] = int(headers["X-LXD-mode"], 8)
+            for key in ("uid", "gid"):
+                if f"X-LXD-{key}" in headers:
+                    info[key] = int(headers[f"X-LXD-{key}"])
+            return info
+
+        @staticmethod
+        def _write_chunks(response, f, chunk_size=_FILE_CHUNK_SIZE):
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+
+        def recursive_put(
+            self,
+            src,
+            dst,
+            mode=None,
+            uid=None,
+            gid=None,
+            max_workers=None,
+            progress=None,
+        ):
             """Recursively push directory to the instance.
 
             Recursively pushes directory to the instances
-            named by the `dst`
+            named by the `dst`. Symlinks, to files or directories, are
+            pushed as symlinks.
+
+            With `max_workers`, the directories are created level by level,
+            each level's concurrently, and then the files are pushed
+            concurrently, by up to `max_workers` threads sharing the pooled
+            connections of the client.
 
             :param src: The source path of directory to copy.
             :type src: str
@@ -218,97 +850,473 @@ class Instance(model.Model):
             :param gid: The gid to use inside the instance.  Default of None
                 results in 0 (root).
             :type gid: int
+            :param max_workers: The number of files pushed at once, or None
+                to push them one at a time.
+            :type max_workers: int
+            :param progress: A function called with the number of files
+                pushed so far and the total number of files, after each file.
+            :type progress: callable
             :raises: NotADirectoryError if src is not a directory
-            :raises: LXDAPIException if an error occurs
+            :raises: LXDAPIException if an error occurs, or
+                :class:`pylxd.exceptions.FileTransferError` with the error of
+                each path if an error occurs with `max_workers`.
             """
             norm_src = os.path.normpath(src)
             if not os.path.isdir(norm_src):
                 raise NotADirectoryError("'src' parameter must be a directory ")
 
             idx = len(norm_src)
-            dst_items = set()
-
-            for path, dirname, files in os.walk(norm_src):
+            # The directories to create, in walk order, with their depth, and
+            # the files to push in each.
+            dirs = []
+            files = {}
+            for path, dirnames, filenames in os.walk(norm_src):
                 dst_path = os.path.normpath(
                     os.path.join(dst, path[idx:].lstrip(os.path.sep))
                 )
-                # create directory or symlink (depending on what's there)
-                if path not in dst_items:
-                    dst_items.add(path)
-                    fmode = os.stat(path).st_mode
-                    current_mode = mode
-                    if isinstance(mode, bool):
-                        current_mode = fmode if mode else None
-                    headers = self._resolve_headers(mode=current_mode, uid=uid, gid=gid)
-                    # determine what the file is: a directory or a symlink
-                    if stat.S_ISLNK(fmode):
-                        headers["X-LXD-type"] = "symlink"
-                    else:
-                        headers["X-LXD-type"] = "directory"
-                    self._endpoint.post(params={"path": dst_path}, headers=headers)
+                dirs.append((path, dst_path, path[idx:].count(os.path.sep)))
+                # Symlinks to directories aren't walked, but pushed as files.
+                links = [d for d in dirnames if os.path.islink(os.path.join(path, d))]
+                files[path] = [
+                    (os.path.join(path, f), os.path.join(dst_path, f))
+                    for f in filenames + links
+                ]
+
+            counter = _Counter(sum(map(len, files.values())), progress)
+            if max_workers is None:
+                for path, dst_path, _ in dirs:
+                    self._put_dir(path, dst_path, mode, uid, gid)
+                    for src_file, filepath in files[path]:
+                        self._put_file(src_file, filepath, mode, uid, gid)
+                        counter.add()
+                return
 
-                # copy files
-                for f in files:
-                    src_file = os.path.join(path, f)
+            def put_file(src_file, filepath):
+                self._put_file(src_file, filepath, mode, uid, gid)
+                counter.add()
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                # Directories are created after their parents, a level at once.
+                for depth in range(max(depth for _, _, depth in dirs) + 1):
+                    _run_all(
+                        executor,
+                        {
+                            dst_path: functools.partial(
+                                self._put_dir, path, dst_path, mode, uid, gid
+                            )
+                            for path, dst_path, d in dirs
+                            if d == depth
+                        },
+                    )
+                _run_all(
+                    executor,
+                    {
+                        filepath: functools.partial(put_file, src_file, filepath)
+                        for path in files
+                        for src_file, filepath in files[path]
+                    },
+                )
+
+        def _put_dir(self, path, dst_path, mode=None, uid=None, gid=None):
+            """Create the directory, or symlink, at `path` in the instance."""
+            fmode = os.stat(path).st_mode
+            if isinstance(mode, bool):
+                mode = fmode if mode else None
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    return self._sftp_mkdir(sftp, dst_path, mode, uid, gid)
+            headers = self._resolve_headers(mode=mode, uid=uid, gid=gid)
+            # determine what the file is: a directory or a symlink
+            if stat.S_ISLNK(fmode):
+                headers["X-LXD-type"] = "symlink"
+            else:
+                headers["X-LXD-type"] = "directory"
+            self._endpoint.post(params={"path": dst_path}, headers=headers)
+
+        def _put_file(self, src_file, filepath, mode=None, uid=None, gid=None):
+            """Push the local file, or symlink, `src_file` to `filepath` in
+            the instance."""
+            if os.path.islink(src_file):
+                return self._put_symlink(src_file, filepath, uid, gid)
+            if isinstance(mode, bool):
+                mode = os.stat(src_file).st_mode if mode else None
+            with self._sftp_session() as sftp:
+                if sftp is not None:
                     with open(src_file, "rb") as fp:
-                        filepath = os.path.join(dst_path, f)
-                        current_mode = mode
-                        if isinstance(mode, bool):
-                            current_mode = os.stat(src_file).st_mode if mode else None
-                        headers = self._resolve_headers(
-                            mode=current_mode, uid=uid, gid=gid
-                        )
-                        response = self._endpoint.post(
-                            params={"path": filepath},
-                            data=fp.read(),
-                            headers=headers or None,
-                        )
-                        if response.status_code != 200:
-                            raise LXDAPIException(response)
+                        return self._sftp_put(sftp, filepath, fp, mode, uid, gid)
+            headers = self._resolve_headers(mode=mode, uid=uid, gid=gid)
+            with open(src_file, "rb") as fp:
+                response = self._endpoint.post(
+                    params={"path": filepath},
+                    data=_FileStream(fp),
+                    headers=headers or None,
+                )
+            if response.status_code != 200:
+                raise LXDAPIException(response)
 
-        def recursive_get(self, remote_path, local_path):
+        def _put_symlink(self, src_link, filepath, uid=None, gid=None):
+            """Create `filepath` in the instance as a symlink with the target
+            of the local symlink `src_link`."""
+            target = os.readlink(src_link)
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    with _sftp_errors():
+                        # Replace whatever is there, as pushing a file does.
+                        with suppress(OSError):
+                            sftp.remove(filepath)
+                        return sftp.symlink(target, filepath)
+            headers = self._resolve_headers(uid=uid, gid=gid)
+            headers["X-LXD-type"] = "symlink"
+            response = self._endpoint.post(
+                params={"path": filepath},
+                data=os.fsencode(target),
+                headers=headers,
+            )
+            if response.status_code != 200:
+                raise LXDAPIException(response)
+
+        def put_tree(self, src, dst, uid=None, gid=None):
+            """Push a directory tree to the instance in a single stream.
+
+            A tar archive of `src` is built as it is sent to the stdin of
+            ``tar`` run in the instance, which unpacks it into `dst`. This
+            takes one request whatever the number of files, rather than one
+            per file and directory as `recursive_put` does. The mode of the
+            files and symlinks are preserved.
+
+            If ``tar`` can't be run in the instance, e.g. as it isn't
+            installed, the instance is stopped or LXD doesn't support running
+            commands, the tree is pushed with `recursive_put` instead.
+
+            :param src: The source path of directory to copy.
+            :type src: str
+            :param dst: The destination path in the instance, created if
+                missing.
+            :type dst: str
+            :param uid: The uid to use inside the instance. Default of None
+                results in 0 (root).
+            :type uid: int
+            :param gid: The gid to use inside the instance.  Default of None
+                results in 0 (root).
+            :type gid: int
+            :raises: NotADirectoryError if src is not a directory
+            :raises: :class:`pylxd.exceptions.FileTransferError` if unpacking
+                fails, with an OSError of tar's exit code and error output.
+            """
+            norm_src = os.path.normpath(src)
+            if not os.path.isdir(norm_src):
+                raise NotADirectoryError("'src' parameter must be a directory ")
+
+            if not self._put_tar(norm_src, dst, uid, gid):
+                self.recursive_put(norm_src, dst, mode=True, uid=uid, gid=gid)
+
+        def _put_tar(self, src, dst, uid=None, gid=None, include=None):
+            """Unpack a tar stream of `src` into `dst` with tar in the instance.
+
+            :returns: False if tar can't be run in the instance.
+            :rtype: bool
+            """
+            try:
+                result = self._instance.execute(
+                    [
+                        "sh",
+                        "-c",
+                        'mkdir -p "$1" && exec tar -x -f - -C "$1"',
+                        "sh",
+                        dst,
+                    ],
+                    stdin_payload=_tar_stream(src, uid or 0, gid or 0, include),
+                )
+            except LXDAPIException:
+                # LXD refused to run the command, e.g. as the instance isn't
+                # running or exec isn't supported.
+                return False
+            # The shell couldn't run tar.
+            if result.exit_code in (126, 127):
+                return False
+            if result.exit_code != 0:
+                raise FileTransferError(
+                    {dst: OSError(result.exit_code, str(result.stderr).strip())}
+                )
+            return True
+
+        def sync_tree(self, src, dst, delete=True, verify=False, uid=None, gid=None):
+            """Make a directory of the instance a copy of a local directory.
+
+            Only the files which are new or changed since the last sync are
+            pushed, as a tar stream like `put_tree` does, and the files which
+            were removed are deleted from the instance.
+
+            Files are compared by the sha256 of their content. Local hashes
+            are cached on disk, in ``$XDG_CACHE_HOME/pylxd/manifests``, and
+            only recomputed for files whose size or mtime changed. The hashes
+            of the files in the instance are read from a manifest saved in
+            `dst` by the last sync. Without this manifest, or with `verify`,
+            they are computed in the instance with ``sha256sum``; if that
+            fails, every file is pushed.
+
+            Directories which end up empty are left in the instance.
+
+            :param src: The source path of directory to copy.
+            :type src: str
+            :param dst: The destination path in the instance.
+            :type dst: str
+            :param delete: Delete the files of `dst` not in `src`.
+            :type delete: bool
+            :param verify: Hash the files in the instance rather than trust
+                the manifest of the last sync.
+            :type verify: bool
+            :param uid: The uid to use inside the instance. Default of None
+                results in 0 (root).
+            :type uid: int
+            :param gid: The gid to use inside the instance.  Default of None
+                results in 0 (root).
+            :type gid: int
+            :returns: the paths pushed and deleted, relative to `dst`, the
+                number of bytes pushed, and the number of bytes not pushed as
+                they were already in the instance.
+            :rtype: _SyncTreeResult() namedtuple
+            :raises: NotADirectoryError if src is not a directory
+            :raises: :class:`pylxd.exceptions.FileTransferError` if files
+                fail to be pushed or deleted.
+            """
+            norm_src = os.path.normpath(src)
+            if not os.path.isdir(norm_src):
+                raise NotADirectoryError("'src' parameter must be a directory ")
+
+            local = _tree_manifest(norm_src, _manifest_cache_path(norm_src))
+            remote = self._remote_manifest(dst, verify)
+            transferred = [
+                path
+                for path, (_, _, digest) in local.items()
+                if remote.get(path) != digest
+            ]
+            deleted = sorted(set(remote) - set(local)) if delete else []
+
+            if transferred or not remote:
+                include = set(transferred)
+                if not self._put_tar(norm_src, dst, uid, gid, include):
+                    for name, relpath, st in _tree_entries(norm_src):
+                        target = os.path.normpath(os.path.join(dst, relpath))
+                        if stat.S_ISDIR(st.st_mode):
+                            self._put_dir(name, target, True, uid, gid)
+                        elif relpath not in include:
+                            continue
+                        elif stat.S_ISLNK(st.st_mode):
+                            self._put_symlink(name, target, uid, gid)
+                        elif stat.S_ISREG(st.st_mode):
+                            self._put_file(name, target, True, uid, gid)
+            if deleted:
+                self._delete_files(dst, deleted)
+            self.put(
+                os.path.join(dst, _MANIFEST_NAME),
+                json.dumps({path: digest for path, (_, _, digest) in local.items()}),
+            )
+
+            sizes = {path: size for path, (size, _, _) in local.items()}
+            bytes_transferred = sum(sizes[path] for path in transferred)
+            return _SyncTreeResult(
+                transferred,
+                deleted,
+                bytes_transferred,
+                sum(sizes.values()) - bytes_transferred,
+            )
+
+        def _remote_manifest(self, dst, verify=False):
+            """Return the sha256 of each file and symlink of `dst`, by
+            relative path, as `_tree_manifest` hashes them."""
+            if not verify:
+                with suppress(LXDAPIException, ValueError):
+                    return json.loads(self.get(os.path.join(dst, _MANIFEST_NAME)))
+            try:
+                result = self._instance.execute(
+                    [
+                        "sh",
+                        "-c",
+                        'cd "$1" && find . -type f ! -path "./$2" -exec sha256sum {} +'
+                        " && find . -type l -exec sh -c '"
+                        'for l; do printf "%s  %s\\n" "$(printf "symlink:%s"'
+                        ' "$(readlink "$l")" | sha256sum | cut -d " " -f 1)" "$l";'
+                        " done' sh {} +",
+                        "sh",
+                        dst,
+                        _MANIFEST_NAME,
+                    ]
+                )
+            except LXDAPIException:
+                # LXD refused to run the command, e.g. as the instance isn't
+                # running or exec isn't supported.
+                return {}
+            if result.exit_code != 0:
+                return {}
+            manifest = {}
+            for line in str(result.stdout).splitlines():
+                digest, _, path = line.partition("  ")
+                if path.startswith("./"):
+                    manifest[path[2:]] = digest
+            return manifest
+
+        def _delete_files(self, dst, paths):
+            """Delete the files at `paths`, relative to `dst`, in one exec."""
+            try:
+                result = self._instance.execute(
+                    ["sh", "-c", 'cd "$1" && exec xargs -0 rm -f --', "sh", dst],
+                    stdin_payload=b"\0".join(os.fsencode(path) for path in paths),
+                )
+            except LXDAPIException:
+                # LXD refused to run the command, e.g. as the instance isn't
+                # running or exec isn't supported.
+                result = None
+            if result is None or result.exit_code in (126, 127):
+                for path in paths:
+                    self.delete(os.path.join(dst, path))
+            elif result.exit_code != 0:
+                raise FileTransferError(
+                    {dst: OSError(result.exit_code, str(result.stderr).strip())}
+                )
+
+        def recursive_get(
+            self, remote_path, local_path, max_workers=None, progress=None
+        ):
             """Recursively pulls a directory from the container.
             Pulls the directory named `remote_path` from the container and
             creates a local folder named `local_path` with the
             content of `remote_path`.
             If `remote_path` is a file, it will be copied to `local_path`.
 
+            With `max_workers`, the entries of each directory are pulled
+            concurrently once the directory is created, by up to
+            `max_workers` threads sharing the pooled connections of the
+            client.
+
             :param remote_path: The directory path on the container.
             :type remote_path: str
             :param local_path: The path at which the directory will be stored.
             :type local_path: str
-            :raises: LXDAPIException if an error occurs
+            :param max_workers: The number of entries pulled at once, or None
+                to pull them one at a time.
+            :type max_workers: int
+            :param progress: A function called with the number of files
+                pulled so far, and None as the total isn't known up front,
+                after each file.
+            :type progress: callable
+            :raises: LXDAPIException if an error occurs, or
+                :class:`pylxd.exceptions.FileTransferError` with the error of
+                each path if an error occurs with `max_workers`.
             """
-            response = self._endpoint.get(params={"path": remote_path}, is_api=False)
+            counter = _Counter(None, progress)
 
-            if "X-LXD-type" in response.headers and "X-LXD-mode" in response.headers:
+            def get_entry(remote_path, local_path):
+                return self._get_entry(remote_path, local_path, counter.add)
+
+            if max_workers is None:
+                pending = [(remote_path, local_path)]
+                while pending:
+                    entries = get_entry(*pending.pop(0))
+                    pending[:0] = entries or []
+                return
+
+            errors = {}
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                futures = {
+                    executor.submit(get_entry, remote_path, local_path): remote_path
+                }
+                while futures:
+                    done, _ = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        path = futures.pop(future)
+                        try:
+                            entries = future.result()
+                        except (LXDAPIException, OSError) as e:
+                            errors[path] = e
+                            continue
+                        for entry in entries or []:
+                            futures[executor.submit(get_entry, *entry)] = entry[0]
+            if errors:
+                raise FileTransferError(errors)
+
+        def _get_entry(self, remote_path, local_path, pulled):
+            """Pull a file, or create a directory, from the instance.
+
+            `pulled` is called once a file was pulled; symlinks and other
+            entries are skipped without calling it.
+
+            :returns: the remote and local paths of the entries of the
+                directory, or None if `remote_path` isn't a directory.
+            :rtype: list
+            """
+            with self._sftp_session() as sftp:
+                if sftp is not None:
+                    return self._sftp_get_entry(sftp, remote_path, local_path, pulled)
+            response = self._endpoint.get(
+                params={"path": remote_path}, is_api=False, stream=True
+            )
+            try:
+                if (
+                    "X-LXD-type" not in response.headers
+                    or "X-LXD-mode" not in response.headers
+                ):
+                    return None
                 unix_permissions = int(response.headers["X-LXD-mode"], 8)
                 if response.headers["X-LXD-type"] == "directory":
                     os.makedirs(local_path, unix_permissions, exist_ok=True)
                     content = json.loads(response.content)
+                    entries = []
                     if "metadata" in content and content["metadata"]:
-                        for file in content["metadata"]:
-                            # Reject entries that are empty, are dot-dirs, are
-                            # absolute paths, or contain path separators. Any
-                            # of these could escape the intended local directory.
-                            if (
-                                not file
-                                or file in (".", "..")
-                                or "/" in file
-                                or "\\" in file
-                            ):
-                                continue
-                            self.recursive_get(
-                                os.path.join(remote_path, file),
-                                os.path.join(local_path, file),
-                            )
-                elif response.headers["X-LXD-type"] == "file":
-
-                    def opener(path, flags):
-                        return os.open(path, flags, mode=unix_permissions)
+                        entries = self._entries(
+                            remote_path, local_path, content["metadata"]
+                        )
+                    return entries
+                if response.headers["X-LXD-type"] == "file":
+                    self._write_to(
+                        local_path,
+                        unix_permissions,
+                        functools.partial(self._write_chunks, response),
+                    )
+                    pulled()
+                return None
+            finally:
+                # Give the connection back to the pool, whether or not the
+                # body was read.
+                response.close()
+
+        def _sftp_get_entry(self, sftp, remote_path, local_path, pulled):
+            # Symlinks are skipped, as with the files API, rather than
+            # followed out of, or in a loop around, the directory.
+            with _sftp_errors():
+                attrs = sftp.lstat(remote_path)
+            unix_permissions = stat.S_IMODE(attrs.st_mode)
+            if stat.S_ISDIR(attrs.st_mode):
+                os.makedirs(local_path, unix_permissions, exist_ok=True)
+                with _sftp_errors():
+                    names = sftp.listdir(remote_path)
+                return self._entries(remote_path, local_path, names)
+            if stat.S_ISREG(attrs.st_mode):
+                self._write_to(
+                    local_path,
+                    unix_permissions,
+                    lambda f: f.writelines(self._sftp_iter(sftp, remote_path)),
+                )
+                pulled()
+            return None
 
-                    with open(local_path, "wb", opener=opener) as f:
-                        f.write(response.content)
+        @staticmethod
+        def _entries(remote_path, local_path, names):
+            """Return the remote and local paths of the entries `names` of a
+            directory."""
+            entries = []
+            for file in names:
+                # Reject entries that are empty, are dot-dirs, are
+                # absolute paths, or contain path separators. Any
+                # of these could escape the intended local directory.
+                if not file or file in (".", "..") or "/" in file or "\\" in file:
+                    continue
+                entries.append(
+                    (os.path.join(remote_path, file), os.path.join(local_path, file))
+                )
+            return entries
 
     @classmethod
     def exists(cls, client, name):
@@ -324,10 +1332,10 @@ class Instance(model.Model):
         """Get a instance by name."""
         response = client.api[cls._endpoint][name].get()
 
-        return cls(client, **response.json()["metadata"])
+        return cls._from_api(client, response.metadata)
 
     @classmethod
-    def all(cls, client, recursion=0, fields=None):
+    def all(cls, client, recursion=0, fields=None, filter=None):
         """Get all instances.
 
         This method returns an Instance array. If recursion is unset,
@@ -346,12 +1354,52 @@ class Instance(model.Model):
         extension is unavailable (in which case the server returns all
         state fields as usual).
 
+        If `filter` is provided, only the matching instances are returned,
+        e.g. ``{"status": "Running", "config.user.role": "worker"}``. The
+        filter is applied by the server if it supports the ``api_filtering``
+        extension, and otherwise client side, in which case recursion is at
+        least 1 as complete instances are needed.
+
         :param recursion: Recursion level (0, 1, or 2).
         :type recursion: int
         :param fields: Selective state fields to fetch (requires
             ``instances_state_selective_recursion`` extension).
         :type fields: list[str] or None
+        :param filter: A dict of fields and the values they must equal, or a
+            LXD filter expression (requires ``api_filtering``).
+        :type filter: dict or str
+        :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable` if
+            `filter` is an expression and the 'api_filtering' api extension
+            is missing.
         """
+        params, client_filter = cls._all_params(client, recursion, fields, filter)
+        response = client.api[cls._endpoint].get(params=params)
+
+        metadata = response.metadata
+        if client_filter is not None:
+            metadata = [i for i in metadata if model._filter_matches(i, client_filter)]
+        return cls._all_from_metadata(client, metadata)
+
+    @classmethod
+    def iter_all(cls, client, recursion=0, fields=None, filter=None):
+        """Iterate over all instances.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and instances are yielded one at a time, so memory
+        use stays flat however many instances there are.
+        """
+        params, client_filter = cls._all_params(client, recursion, fields, filter)
+        response = client.api[cls._endpoint].get(params=params, stream=True)
+        yield from cls._iter_from_response(client, response, filters=client_filter)
+
+    @classmethod
+    def _all_params(cls, client, recursion, fields, filter):
+        """Return the query parameters and client side filters of a listing."""
+        client_filter = None
+        if filter is not None and not model._server_side_filtering(client, filter):
+            client_filter = filter
+            recursion = max(recursion, 1)
+
         params = {}
         if recursion != 0:
             if (
@@ -370,23 +1418,28 @@ class Instance(model.Model):
                 params = {"recursion": f"2;fields={fields_str}"}
             else:
                 params = {"recursion": recursion}
-        response = client.api[cls._endpoint].get(params=params)
+        if filter is not None and client_filter is None:
+            params["filter"] = model._filter_expression(filter)
+        return params, client_filter
 
-        instances = []
-        for instance in response.json()["metadata"]:
-            if isinstance(instance, dict):
-                # User specified recursion so returning all data for each instance at once
-                instance_class = cls(client, name=instance["name"])
-                for key, data in instance.items():
-                    try:
-                        setattr(instance_class, key, data)
-                    except AttributeError:
-                        pass
-                instances.append(instance_class)
-            else:
-                name = instance.split("/")[-1]
-                instances.append(cls(client, name=name))
-        return instances
+    @classmethod
+    def _from_listing(cls, client, item, key="name", **kwargs):
+        if not isinstance(item, dict):
+            return cls(client, name=item.split("/")[-1])
+        # User specified recursion so returning all data for each instance at
+        # once. With recursion=2 this includes state and snapshots, which
+        # aren't model attributes and are dropped silently.
+        attributes = cls.__attributes__
+        return cls._from_api(
+            client, {key: val for key, val in item.items() if key in attributes}
+        )
+
+    @classmethod
+    def _from_api(cls, client, data, **kwargs):
+        if "location" in data and not client.server_clustered:
+            # LXD reports "none" as location when not in a cluster
+            data = {**data, "location": None}
+        return super()._from_api(client, data, **kwargs)
 
     @classmethod
     def create(cls, client, config, wait=False, target=None):
@@ -401,7 +1454,8 @@ class Instance(model.Model):
         :param target: If in cluster mode, the target member.
         :type target: str
         :raises LXDAPIException: if something goes wrong.
-        :returns: an instance if successful
+        :returns: an instance if successful. If not waiting, its `operation`
+            is the future of the creation.
         :rtype: :class:`Instance`
         """
         if cls._instance_type is not None and "type" not in config:
@@ -442,59 +1496,213 @@ class Instance(model.Model):
                 raise ValueError(
                     "Could not automatically determine instance name from LXD response. Please include the 'name' field in the config."
                 )
-        return cls(client, name=instance_name)
+        instance = cls(client, name=instance_name)
+        if not wait:
+            instance._operation = OperationFuture._from_response(client, response)
+        return instance
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    @classmethod
+    def create_many(cls, client, configs, max_concurrency=10, target=None, start=False):
+        """Create many instances concurrently.
+
+        Up to `max_concurrency` instances are created at once, each by a
+        thread posting its config and waiting for the creation to end. The
+        waits share the events websocket of the client if it tracks
+        operations.
+
+        :param configs: the configuration of each new instance.
+        :type configs: list[dict]
+        :param max_concurrency: the number of instances created at once.
+        :type max_concurrency: int
+        :param target: If in cluster mode, the target member.
+        :type target: str
+        :param start: start each instance as soon as it is created.
+        :type start: bool
+        :returns: for each config, in order, the new :class:`Instance`, the
+            exception raised creating it, or, for an instance created which
+            failed to start, an ``(Instance, exception)`` tuple.
+        :rtype: list
+        """
 
-        self.snapshots = managers.SnapshotManager(self.client, self)
-        self.files = self.FilesManager(self)
+        def create(config):
+            instance = cls.create(client, config, wait=True, target=target)
+            if start:
+                try:
+                    instance.start(wait=True)
+                except Exception as e:
+                    return instance, e
+            return instance
+
+        with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+            futures = [executor.submit(create, config) for config in configs]
+        return [future.exception() or future.result() for future in futures]
 
     def rename(self, name, wait=False):
-        """Rename an instance."""
+        """Rename an instance.
+
+        :returns: the future of the operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
+        """
         response = self.api.post(json={"name": name})
 
+        operation = None
         if wait:
-            self.client.operations.wait_for_operation(response.json()["operation"])
+            self.client.operations.wait_for_operation(response.operation)
+        else:
+            operation = OperationFuture._from_response(self.client, response)
         self.name = name
+        return operation
+
+    def _set_state(self, state, timeout=30, force=True, wait=False, refresh="status"):
+        """Change the state of the instance.
+
+        When waiting, the instance is refreshed once its state changed as
+        chosen by `refresh`:
 
-    def _set_state(self, state, timeout=30, force=True, wait=False):
+        - ``"status"`` only updates `status` and `status_code`, from the
+          state reached by the successful operation. They are left as is
+          for actions whose resulting state isn't known.
+        - ``"full"`` syncs every attribute, with another request.
+        - ``"none"`` leaves the instance as is.
+
+        :param refresh: how to refresh the instance
+        :type refresh: str
+        :returns: the future of the operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
+        """
+        if refresh not in ("status", "full", "none"):
+            raise ValueError(f"Unknown refresh: {refresh!r}")
         response = self.api.state.put(
             json={"action": state, "timeout": timeout, "force": force}
         )
+        if not wait:
+            return OperationFuture._from_response(self.client, response)
+        self.client.operations.wait_for_operation(response.operation)
+        if "status" in self.__dirty__:
+            self.__dirty__.remove("status")
+        if state == "stop" and self.ephemeral:
+            self.client = None
+        elif refresh == "full":
+            self.sync()
+        elif refresh == "status" and state in _ACTION_STATUS:
+            status, status_code = _ACTION_STATUS[state]
+            object.__setattr__(self, "status", status)
+            object.__setattr__(self, "status_code", status_code)
+
+    @classmethod
+    def set_state_all(
+        cls, client, action, filter=None, timeout=30, force=True, wait=False
+    ):
+        """Change the state of many instances, e.g. stop them all.
+
+        Without a `filter`, the state of every instance of the project is
+        changed with a single ``PUT /1.0/instances`` request if the server
+        supports the ``instance_bulk_state_change`` extension. Otherwise, or
+        for containers or virtual machines only, as that request changes
+        every type of instance, the matching instances are listed and their
+        state is changed with requests made in parallel. If some of these
+        fail, the others are still made, and the first failure is raised
+        once they all are done.
+
+        :param action: the state action: start, stop, restart, freeze or
+            unfreeze.
+        :type action: str
+        :param filter: only change the state of the matching instances, as
+            for `all`.
+        :type filter: dict or str
+        :param wait: wait for the state of all instances to change, raising
+            the first failure.
+        :type wait: bool
+        :returns: the futures of the operations if not waiting for them
+        :rtype: list[:class:`~pylxd.models.operation.OperationFuture`]
+        """
+        state = {"action": action, "timeout": timeout, "force": force}
+        responses = []
+        errors = []
+        if (
+            filter is None
+            and cls._instance_type is None
+            and client.has_api_extension("instance_bulk_state_change")
+        ):
+            responses.append(client.api[cls._endpoint].put(json={"state": state}))
+        else:
+            # Complete instances, so that their type is known without
+            # fetching each.
+            instances = cls.all(client, recursion=1, filter=filter)
+            if cls._instance_type is not None:
+                instances = [i for i in instances if i.type == cls._instance_type]
+            if instances:
+                with concurrent.futures.ThreadPoolExecutor(
+                    min(len(instances), 32)
+                ) as executor:
+                    pending = [
+                        executor.submit(i.api.state.put, json=state) for i in instances
+                    ]
+                for future in pending:
+                    try:
+                        responses.append(future.result())
+                    except Exception as e:
+                        errors.append(e)
+        futures = [OperationFuture._from_response(client, r) for r in responses]
+        futures = [future for future in futures if future is not None]
         if wait:
-            self.client.operations.wait_for_operation(response.json()["operation"])
-            if "status" in self.__dirty__:
-                self.__dirty__.remove("status")
-            if self.ephemeral and state == "stop":
-                self.client = None
-            else:
-                self.sync()
+            for outcome in client.operations.wait_all(futures).values():
+                if isinstance(outcome, Exception):
+                    errors.append(outcome)
+        if errors:
+            raise errors[0]
+        if not wait:
+            return futures
 
     def state(self):
         response = self.api.state.get()
-        state = InstanceState(response.json()["metadata"])
+        state = InstanceState(response.metadata)
         return state
 
-    def start(self, timeout=30, force=True, wait=False):
-        """Start the instance."""
-        return self._set_state("start", timeout=timeout, force=force, wait=wait)
+    def start(self, timeout=30, force=True, wait=False, refresh="status"):
+        """Start the instance.
+
+        See `_set_state` for how the instance is refreshed when waiting.
+        """
+        return self._set_state(
+            "start", timeout=timeout, force=force, wait=wait, refresh=refresh
+        )
 
-    def stop(self, timeout=30, force=True, wait=False):
-        """Stop the instance."""
-        return self._set_state("stop", timeout=timeout, force=force, wait=wait)
+    def stop(self, timeout=30, force=True, wait=False, refresh="status"):
+        """Stop the instance.
 
-    def restart(self, timeout=30, force=True, wait=False):
-        """Restart the instance."""
-        return self._set_state("restart", timeout=timeout, force=force, wait=wait)
+        See `_set_state` for how the instance is refreshed when waiting.
+        """
+        return self._set_state(
+            "stop", timeout=timeout, force=force, wait=wait, refresh=refresh
+        )
 
-    def freeze(self, timeout=30, force=True, wait=False):
-        """Freeze the instance."""
-        return self._set_state("freeze", timeout=timeout, force=force, wait=wait)
+    def restart(self, timeout=30, force=True, wait=False, refresh="status"):
+        """Restart the instance.
 
-    def unfreeze(self, timeout=30, force=True, wait=False):
-        """Unfreeze the instance."""
-        return self._set_state("unfreeze", timeout=timeout, force=force, wait=wait)
+        See `_set_state` for how the instance is refreshed when waiting.
+        """
+        return self._set_state(
+            "restart", timeout=timeout, force=force, wait=wait, refresh=refresh
+        )
+
+    def freeze(self, timeout=30, force=True, wait=False, refresh="status"):
+        """Freeze the instance.
+
+        See `_set_state` for how the instance is refreshed when waiting.
+        """
+        return self._set_state(
+            "freeze", timeout=timeout, force=force, wait=wait, refresh=refresh
+        )
+
+    def unfreeze(self, timeout=30, force=True, wait=False, refresh="status"):
+        """Unfreeze the instance.
+
+        See `_set_state` for how the instance is refreshed when waiting.
+        """
+        return self._set_state(
+            "unfreeze", timeout=timeout, force=force, wait=wait, refresh=refresh
+        )
 
     def execute(
         self,
@@ -599,6 +1807,10 @@ class Instance(model.Model):
 
             manager.start()
 
+            # Suppress the error if the command exited without reading stdin
+            with suppress(BrokenPipeError, ConnectionResetError):
+                stdin.send_payload()
+
             # Block until the exec operation completes by using the
             # /wait endpoint, which is efficient and race-free.
             operation = self.client.operations.wait_for_operation(
@@ -616,8 +1828,8 @@ class Instance(model.Model):
             with suppress(BrokenPipeError):
                 manager.close_all()
 
-            while not stdout.finished or not stderr.finished:
-                time.sleep(0.1)  # progma: no cover
+            stdout.wait_finished()
+            stderr.wait_finished()
 
             manager.stop()
             manager.join()
@@ -773,7 +1985,8 @@ class Instance(model.Model):
         method does not enforce that constraint, so a LXDAPIException may be
         raised if this method is called on a running instance.
 
-        If wait=True, an Image is returned.
+        If wait=True, an Image is returned; otherwise the future of the
+        operation, whose resources include the image.
         """
         data = {
             "public": public,
@@ -787,12 +2000,10 @@ class Instance(model.Model):
 
         response = self.client.api.images.post(json=data)
         if wait:
-            operation = self.client.operations.wait_for_operation(
-                response.json()["operation"]
-            )
+            operation = self.client.operations.wait_for_operation(response.operation)
 
             return self.client.images.get(operation.metadata["fingerprint"])
-        return None
+        return OperationFuture._from_response(self.client, response)
 
     def restore_snapshot(self, snapshot_name, wait=False, stateful=False):
         """Restore a snapshot using its name.
@@ -815,7 +2026,7 @@ class Instance(model.Model):
         """
         response = self.api.put(json={"restore": snapshot_name, "stateful": stateful})
         if wait:
-            self.client.operations.wait_for_operation(response.json()["operation"])
+            self.client.operations.wait_for_operation(response.operation)
         return response
 
 
@@ -831,7 +2042,7 @@ class _CommandWebsocketClient(WebSocketBaseClient):  # pragma: no cover
         self.handler = kwargs.pop("handler", None)
         self.message_encoding = None
         self.finish_off = False
-        self.finished = False
+        self._finished = threading.Event()
         self.last_message_empty = False
         self.buffer = []
         _ws_exclude_origin(kwargs)
@@ -845,7 +2056,7 @@ class _CommandWebsocketClient(WebSocketBaseClient):  # pragma: no cover
         if message.data is None or len(message.data) == 0:
             self.last_message_empty = True
             if self.finish_off:
-                self.finished = True
+                self._finished.set()
             return
         else:
             self.last_message_empty = False
@@ -856,15 +2067,27 @@ class _CommandWebsocketClient(WebSocketBaseClient):  # pragma: no cover
         else:
             self.buffer.append(message.data)
         if self.finish_off and isinstance(message, BinaryMessage):
-            self.finished = True
+            self._finished.set()
 
     def closed(self, code, reason=None):
-        self.finished = True
+        self._finished.set()
 
     def finish_soon(self):
         self.finish_off = True
         if self.last_message_empty:
-            self.finished = True
+            self._finished.set()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def wait_finished(self, timeout=None):
+        """Block until the stream is finished, or `timeout` seconds pass.
+
+        :returns: True if the stream is finished.
+        :rtype: bool
+        """
+        return self._finished.wait(timeout)
 
     def _maybe_decode(self, buffer):
         if self.decode and buffer is not None:
@@ -910,7 +2133,13 @@ class _StdinWebsocket(WebSocketBaseClient):  # pragma: no cover
             return msg.encode(self.encoding)
         return msg
 
-    def handshake_ok(self):
+    def send_payload(self):
+        """Send the payload, then an empty message to close stdin.
+
+        This is called once every websocket of the command is connected, as
+        LXD only starts the command then: a payload larger than the buffers
+        on the way would otherwise never be read.
+        """
         if self.payload:
             if hasattr(self.payload, "read"):
                 self.send(
@@ -947,21 +2176,31 @@ class Snapshot(model.Model):
     def get(cls, client, instance, name):
         response = client.api[instance._endpoint][instance.name].snapshots[name].get()
 
-        snapshot = cls(client, instance=instance, **response.json()["metadata"])
+        return cls._from_api(client, response.metadata, instance=instance)
+
+    @classmethod
+    def _from_api(cls, client, data, **kwargs):
+        snapshot = super()._from_api(client, data, **kwargs)
         # Snapshot names are namespaced in LXD, as
         # instance-name/snapshot-name. We hide that implementation
         # detail.
-        snapshot.name = snapshot.name.split("/")[-1]
+        object.__setattr__(snapshot, "name", snapshot.name.split("/")[-1])
         return snapshot
 
     @classmethod
-    def all(cls, client, instance):
-        response = client.api[instance._endpoint][instance.name].snapshots.get()
+    def all(cls, client, instance, recursion=1):
+        """Get all snapshots of `instance`.
 
-        return [
-            cls(client, name=snapshot.split("/")[-1], instance=instance)
-            for snapshot in response.json()["metadata"]
-        ]
+        :param recursion: 1 (the default) to fetch every snapshot in full in a
+            single request, or 0 to only fetch their names; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        """
+        response = client.api[instance._endpoint][instance.name].snapshots.get(
+            params={"recursion": recursion}
+        )
+
+        return cls._all_from_metadata(client, response.metadata, instance=instance)
 
     @classmethod
     def create(cls, client, instance, name, stateful=False, wait=False):
@@ -971,20 +2210,31 @@ class Snapshot(model.Model):
 
         snapshot = cls(client, instance=instance, name=name)
         if wait:
-            client.operations.wait_for_operation(response.json()["operation"])
+            client.operations.wait_for_operation(response.operation)
+        else:
+            snapshot._operation = OperationFuture._from_response(client, response)
         return snapshot
 
     def rename(self, new_name, wait=False):
-        """Rename a snapshot."""
+        """Rename a snapshot.
+
+        :returns: the future of the operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
+        """
         response = self.api.post(json={"name": new_name})
+        operation = None
         if wait:
-            self.client.operations.wait_for_operation(response.json()["operation"])
+            self.client.operations.wait_for_operation(response.operation)
+        else:
+            operation = OperationFuture._from_response(self.client, response)
         self.name = new_name
+        return operation
 
     def publish(self, public=False, wait=False):
         """Publish a snapshot as an image.
 
-        If wait=True, an Image is returned.
+        If wait=True, an Image is returned; otherwise the future of the
+        operation, whose resources include the image.
         """
         data = {
             "public": public,
@@ -996,11 +2246,9 @@ class Snapshot(model.Model):
 
         response = self.client.api.images.post(json=data)
         if wait:
-            operation = self.client.operations.wait_for_operation(
-                response.json()["operation"]
-            )
+            operation = self.client.operations.wait_for_operation(response.operation)
             return self.client.images.get(operation.metadata["fingerprint"])
-        return None
+        return OperationFuture._from_response(self.client, response)
 
     def restore(self, wait=False):
         """Restore this snapshot.
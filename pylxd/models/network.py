@@ -29,7 +29,7 @@ class NetworkForward(model.Model):
     @classmethod
     def get(cls, client, network, listen_address):
         response = client.api.networks[network.name].forwards[listen_address].get()
-        forward = cls(client, network=network, **response.json()["metadata"])
+        forward = cls(client, network=network, **response.metadata)
         return forward
 
     @classmethod
@@ -40,7 +40,7 @@ class NetworkForward(model.Model):
 
     def save(self, *args, **kwargs):
         self.client.assert_has_api_extension("network")
-        super().save(*args, **kwargs)
+        return super().save(*args, **kwargs)
 
     @property
     def api(self):
@@ -75,11 +75,9 @@ class Network(model.Model):
     project = model.Attribute(readonly=True, optional=True)
     _endpoint = "networks"
 
-    forwards = model.Manager()
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.forwards = managers.NetworkForwardManager(self.client, self)
+    forwards = model.Manager(
+        lambda network: managers.NetworkForwardManager(network.client, network)
+    )
 
     def __eq__(self, other):
         if not isinstance(other, Network):
@@ -123,24 +121,34 @@ class Network(model.Model):
         """
         response = client.api.networks[name].get()
 
-        return cls(client, **response.json()["metadata"])
+        return cls(client, **response.metadata)
 
     @classmethod
-    def all(cls, client):
+    def all(cls, client, recursion=1):
         """
         Get all networks.
 
         :param client: client instance
         :type client: :class:`~pylxd.client.Client`
+        :param recursion: 1 (the default) to fetch every network in full in a
+            single request, or 0 to only fetch their names; the other
+            attributes are then fetched on first access.
+        :type recursion: int
         :rtype: list[:class:`Network`]
         """
-        response = client.api.networks.get()
+        response = client.api.networks.get(params={"recursion": recursion})
+
+        return cls._all_from_metadata(client, response.metadata)
 
-        networks = []
-        for url in response.json()["metadata"]:
-            name = url.split("/")[-1]
-            networks.append(cls(client, name=name))
-        return networks
+    @classmethod
+    def iter_all(cls, client, recursion=1):
+        """Iterate over all networks.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and networks are yielded one at a time.
+        """
+        response = client.api.networks.get(params={"recursion": recursion}, stream=True)
+        yield from cls._iter_from_response(client, response)
 
     @classmethod
     def create(cls, client, name, description=None, type=None, config=None, wait=True):
@@ -179,8 +187,10 @@ class Network(model.Model):
         # against an in-progress background operation.
         if client.has_api_extension("storage_and_network_operations"):
             wait = True
-        cls._handle_async_response_for_client(client, response, wait)
-        return cls.get(client, name)
+        operation = cls._handle_async_response_for_client(client, response, wait)
+        network = cls.get(client, name)
+        network._operation = operation
+        return network
 
     def rename(self, new_name, wait=True):
         """
@@ -213,7 +223,7 @@ class Network(model.Model):
         # before returning, otherwise the caller may observe stale state.
         if self.client.has_api_extension("storage_and_network_operations"):
             wait = True
-        super().save(wait=wait)
+        return super().save(wait=wait)
 
     def delete(self, wait=False):
         self.client.assert_has_api_extension("network")
@@ -222,12 +232,12 @@ class Network(model.Model):
         # background operations (e.g. immediately recreating the network).
         if self.client.has_api_extension("storage_and_network_operations"):
             wait = True
-        super().delete(wait=wait)
+        return super().delete(wait=wait)
 
     def state(self):
         """Get network state."""
         response = self.api.state.get()
-        state = NetworkState(response.json()["metadata"])
+        state = NetworkState(response.metadata)
         return state
 
     @property
@@ -12,16 +12,38 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
+import concurrent.futures
+import math
 import os
+import queue
+import threading
+import time
 import warnings
 from urllib import parse
 
 from pylxd import exceptions
+from pylxd.client import _OperationTracker
 
 # Global used to record which warnings have been issued already for unknown
 # attributes.
 _seen_attribute_warnings: set[str] = set()
 
+# The threads waiting for operations with `GET /operations/<id>/wait` on
+# behalf of OperationFutures, created when first needed.
+_wait_executor = None
+_wait_executor_lock = threading.Lock()
+
+
+def _get_wait_executor():
+    global _wait_executor
+    with _wait_executor_lock:
+        if _wait_executor is None:
+            _wait_executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="pylxd-operation-wait"
+            )
+        return _wait_executor
+
 
 class Operation:
     """An LXD operation.
@@ -52,16 +74,123 @@ class Operation:
     ]
 
     @classmethod
-    def wait_for_operation(cls, client, operation_id):
-        """Get an operation and wait for it to complete."""
+    def wait_for_operation(cls, client, operation_id, timeout=None):
+        """Get an operation and wait for it to complete.
+
+        :param timeout: the number of seconds to wait for at most, or
+            ``None`` to wait until the operation ends.
+        :type timeout: float
+        :raises TimeoutError: if the operation doesn't end in time.
+        :raises: :class:`pylxd.exceptions.LXDAPIException` if the operation
+            fails.
+        """
+        if client.operation_tracker is not None:
+            metadata = client.operation_tracker.wait(
+                cls.extract_operation_id(operation_id), timeout
+            )
+            # Failures are left to /wait below, which raises with the error
+            # response.
+            if metadata is not None and 200 <= metadata["status_code"] < 300:
+                return cls(_client=client, **metadata)
+        operation = cls._wait_request(client, operation_id, timeout)
+        if not operation._ended():
+            raise TimeoutError(f"Operation {operation.id} did not end in {timeout}s")
+        return operation
+
+    @classmethod
+    def _wait_request(cls, client, operation_id, timeout=None):
+        """Wait for an operation with `GET /operations/<id>/wait`.
+
+        With a `timeout`, the returned operation may still be running.
+        """
         operation = cls.get(client, operation_id)
         # wait() returns True when it received and applied metadata from the
         # /wait response. When /wait returns no metadata it returns False and
         # we fall back to a second GET to retrieve the final operation state.
-        if not operation.wait():
+        if not operation.wait(timeout):
             return cls.get(client, operation.id)
         return operation
 
+    @classmethod
+    def _futures(cls, client, operations, deadline):
+        futures = {}
+        for operation in operations:
+            if not isinstance(operation, OperationFuture):
+                operation = OperationFuture(client, operation)
+            operation._limit(deadline)
+            futures[operation.id] = operation
+            operation.start()
+        return futures
+
+    @staticmethod
+    def _outcome(future):
+        if not future.done():
+            return TimeoutError(f"Operation {future.id} did not end in time")
+        return future.exception() or future.result()
+
+    @classmethod
+    def wait_all(cls, client, operations, timeout=None):
+        """Wait for many operations to end.
+
+        The operations are waited for concurrently: with the events
+        websocket of the client if it tracks operations, and otherwise with
+        `GET /operations/<id>/wait` requests made by a pool of threads.
+
+        :param operations: the operations, by id or url, or their futures.
+            Futures not waiting for their operation yet are given the same
+            deadline, and end with :class:`TimeoutError` if it passes.
+        :type operations: list
+        :param timeout: the number of seconds to wait for at most, or
+            ``None`` to wait until all operations end.
+        :type timeout: float
+        :returns: the final :class:`Operation` of each operation id, or the
+            exception of operations which failed
+            (:class:`pylxd.exceptions.LXDAPIException`) or didn't end in
+            time (:class:`TimeoutError`).
+        :rtype: dict
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        futures = cls._futures(client, operations, deadline)
+        concurrent.futures.wait(futures.values(), timeout)
+        return {
+            operation_id: cls._outcome(future)
+            for operation_id, future in futures.items()
+        }
+
+    @classmethod
+    def wait_any(cls, client, operations, timeout=None):
+        """Wait for the first of many operations to end.
+
+        See :meth:`wait_all`.
+
+        :returns: the id of the first operation to end, and its final
+            :class:`Operation`, or its exception if it failed.
+        :rtype: tuple
+        :raises TimeoutError: if no operation ends in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        futures = cls._futures(client, operations, deadline)
+        pending = set(futures.values())
+        while pending:
+            if deadline is not None:
+                timeout = max(0, deadline - time.monotonic())
+            done, pending = concurrent.futures.wait(
+                pending, timeout, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for operation_id, future in futures.items():
+                # Futures may time out as the deadline passes, which isn't
+                # their operation ending.
+                if future in done and not isinstance(future.exception(), TimeoutError):
+                    return operation_id, cls._outcome(future)
+        raise TimeoutError("No operation ended in time")
+
+    def _ended(self):
+        # Operations from servers whose /wait returns no metadata may lack a
+        # status code, but are only fetched once ended.
+        return getattr(self, "status_code", 200) >= 200
+
     @classmethod
     def extract_operation_id(cls, s):
         return os.path.split(parse.urlparse(s).path)[-1]
@@ -71,7 +200,40 @@ class Operation:
         """Get an operation."""
         operation_id = cls.extract_operation_id(operation_id)
         response = client.api.operations[operation_id].get()
-        return cls(_client=client, **response.json()["metadata"])
+        return cls(_client=client, **response.metadata)
+
+    @classmethod
+    def all(cls, client, recursion=1, status=None):
+        """Get the operations of the server.
+
+        :param client: The pylxd client object
+        :type client: :class:`pylxd.client.Client`
+        :param recursion: 1 to fetch complete operations in a single
+            request, or 0 to only fetch their ids.
+        :type recursion: int
+        :param status: Only return the operations with this status, e.g.
+            ``"Running"``, or with any of a list of statuses.
+        :type status: str or list
+        :returns: the operations
+        :rtype: list[:class:`Operation`]
+        """
+        response = client.api.operations.get(params={"recursion": recursion})
+        if isinstance(status, str):
+            status = [status]
+        statuses = None if status is None else {s.lower() for s in status}
+        operations = []
+        # LXD groups operations by their status, e.g. "running".
+        for key, items in (response.metadata or {}).items():
+            if statuses is not None and key not in statuses:
+                continue
+            for item in items:
+                if isinstance(item, dict):
+                    operations.append(cls(_client=client, **item))
+                else:
+                    operations.append(
+                        cls(_client=client, id=cls.extract_operation_id(item))
+                    )
+        return operations
 
     def _set_attributes(self, attributes):
         """Set attributes on self, warning about unknown ones per PYLXD_WARNINGS."""
@@ -94,15 +256,87 @@ class Operation:
         super().__init__()
         self._set_attributes(kwargs)
 
-    def wait(self):
+    def wait(self, timeout=None):
         """Wait for the operation to complete.
 
         Returns True if the /wait response included an operation object that
         was applied to self, or False if the response contained no metadata.
         Raises LXDAPIException on operation failure.
+
+        :param timeout: the number of seconds LXD waits for at most, after
+            which the operation may still be running, or ``None`` to wait
+            until the operation ends.
+        :type timeout: float
+        """
+        if timeout is None:
+            response = self._client.api.operations[self.id].wait.get()
+        else:
+            response = self._client.api.operations[self.id].wait.get(
+                params={"timeout": math.ceil(timeout)}
+            )
+
+        metadata = self._wait_metadata(response)
+        if metadata:
+            # Update self with the final state so callers don't need
+            # a second GET (which could race with LXD cleaning up the operation).
+            self._set_attributes(metadata)
+            return True
+
+        return False
+
+    def cancel(self):
+        """Cancel the operation.
+
+        Only operations whose `may_cancel` is True can be cancelled.
+
+        :raises: :class:`pylxd.exceptions.LXDAPIException` if the operation
+            can't be cancelled.
+        """
+        self._client.api.operations[self.id].delete()
+
+    def iter_progress(self):
+        """Iterate over the progress of the operation until it ends.
+
+        The operation is updated and its `metadata`, e.g. the progress of an
+        image download, is yielded each time LXD reports a change through
+        operation events. The client's events websocket is used if it tracks
+        operations; otherwise a websocket is opened for the iteration. If
+        operation events are unavailable, only the final metadata is yielded.
         """
-        response = self._client.api.operations[self.id].wait.get()
+        tracker = self._client.operation_tracker
+        owned = tracker is None
+        if owned:
+            tracker = _OperationTracker(self._client)
+        events = queue.Queue()
+        try:
+            if not tracker.listen(self.id, events.put):
+                self.wait()
+                yield getattr(self, "metadata", None)
+                return
+            # The operation may have changed before the websocket subscribed.
+            response = self._client.api.operations[self.id].get()
+            self._set_attributes(response.metadata)
+            yield getattr(self, "metadata", None)
+            while not self._ended():
+                metadata = events.get()
+                if metadata is None:
+                    # The websocket was closed.
+                    self.wait()
+                else:
+                    self._set_attributes(metadata)
+                yield getattr(self, "metadata", None)
+        finally:
+            tracker.unlisten(self.id, events.put)
+            if owned:
+                tracker.close()
 
+    @staticmethod
+    def _wait_metadata(response):
+        """Return the operation metadata carried by a /wait response.
+
+        Returns None when the response has no metadata (older LXD servers).
+        Raises LXDAPIException when the response reports a failure.
+        """
         body = response.json()
         metadata = body.get("metadata")
 
@@ -113,16 +347,145 @@ class Operation:
             raise exceptions.LXDAPIException(response)
 
         if metadata:
-            # Failure can be indicated by status_code or status string.
+            # Failure can be indicated by status_code or status string. Codes
+            # below 200 are of operations still running when /wait timed out.
             status_code = metadata.get("status_code")
-            if (status_code is not None and not (200 <= status_code < 300)) or (
+            if (status_code is not None and status_code >= 300) or (
                 metadata.get("status") == "Failure"
             ):
                 raise exceptions.LXDAPIException(response)
 
-            # Update self with the final state so callers don't need
-            # a second GET (which could race with LXD cleaning up the operation).
-            self._set_attributes(metadata)
-            return True
+        return metadata or None
 
-        return False
+
+class OperationFuture(concurrent.futures.Future):
+    """The future of an LXD operation not waited for.
+
+    Calls made with ``wait=False`` return one when LXD runs them as an
+    operation. It is a :class:`concurrent.futures.Future`, which can also be
+    awaited, whose result is the final :class:`Operation`; if the operation
+    fails, :class:`pylxd.exceptions.LXDAPIException` is raised instead.
+
+    The operation is waited for once its result or exception is asked for,
+    a done callback is added, the future is awaited or :meth:`start` is
+    called; call :meth:`start` before passing the future to
+    :func:`concurrent.futures.wait` or :func:`concurrent.futures.as_completed`.
+    If the client tracks operations, the wait uses its events websocket;
+    otherwise a worker thread waits on `GET /operations/<id>/wait`.
+
+    .. attribute:: id
+
+        The id of the operation.
+
+    .. attribute:: metadata
+
+        The metadata of the operation, e.g. its progress, as of when the
+        operation was started or, once done, ended.
+
+    .. attribute:: resources
+
+        The resources of the operation, e.g. the instances it affects, as of
+        when the operation was started or, once done, ended.
+    """
+
+    def __init__(self, client, operation, metadata=None):
+        super().__init__()
+        # The operation is already running; it can't be cancelled as a future.
+        self.set_running_or_notify_cancel()
+        self._client = client
+        self._deadline = None
+        self._started = False
+        self._start_lock = threading.Lock()
+        self.id = Operation.extract_operation_id(operation)
+        metadata = metadata or {}
+        self.metadata = metadata.get("metadata")
+        self.resources = metadata.get("resources")
+
+    @classmethod
+    def _from_response(cls, client, response):
+        """Return the future of the operation of an async response, or None."""
+        response_json = response.json()
+        if response_json.get("type") != "async":
+            return None
+        return cls(client, response_json["operation"], response_json.get("metadata"))
+
+    def _limit(self, deadline):
+        """Stop waiting for the operation at the time.monotonic() `deadline`,
+        unless waiting already or until an earlier one."""
+        if deadline is None:
+            return
+        with self._start_lock:
+            if not self._started and (
+                self._deadline is None or deadline < self._deadline
+            ):
+                self._deadline = deadline
+
+    def start(self):
+        """Start waiting for the operation, if not waiting already."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        tracker = self._client.operation_tracker
+        try:
+            watch = None if tracker is None else tracker.watch(self.id)
+        except Exception as e:
+            self.set_exception(e)
+            return
+        if watch is None:
+            _get_wait_executor().submit(self._wait)
+        else:
+            watch.add_done_callback(self._watched)
+
+    def _watched(self, watch):
+        metadata = watch.result()
+        if metadata is not None and 200 <= metadata["status_code"] < 300:
+            self._set_operation(Operation(_client=self._client, **metadata))
+        else:
+            # Failures are left to /wait, which raises with the error
+            # response. This runs on the events thread, which mustn't block.
+            _get_wait_executor().submit(self._wait)
+
+    def _wait(self):
+        try:
+            if self._deadline is None:
+                operation = Operation._wait_request(self._client, self.id)
+            else:
+                timeout = max(0, self._deadline - time.monotonic())
+                operation = Operation._wait_request(self._client, self.id, timeout)
+                if not operation._ended():
+                    raise TimeoutError(f"Operation {self.id} did not end in time")
+        except BaseException as e:
+            self.set_exception(e)
+        else:
+            self._set_operation(operation)
+
+    def _set_operation(self, operation):
+        self.metadata = getattr(operation, "metadata", None)
+        self.resources = getattr(operation, "resources", None)
+        self.set_result(operation)
+
+    def result(self, timeout=None):
+        self.start()
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        self.start()
+        return super().exception(timeout)
+
+    def add_done_callback(self, fn):
+        self.start()
+        super().add_done_callback(fn)
+
+    def iter_progress(self):
+        """Iterate over the progress of the operation until it ends.
+
+        See :meth:`Operation.iter_progress`.
+        """
+        operation = Operation(_client=self._client, id=self.id)
+        for metadata in operation.iter_progress():
+            self.metadata = metadata
+            yield metadata
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
@@ -46,19 +46,30 @@ class Profile(model.Model):
     def get(cls, client, name):
         """Get a profile."""
         response = client.api.profiles[name].get()
-        return cls(client, **response.json()["metadata"])
+        return cls(client, **response.metadata)
 
     @classmethod
-    def all(cls, client):
-        """Get all profiles."""
-        response = client.api.profiles.get()
+    def all(cls, client, recursion=1):
+        """Get all profiles.
 
-        profiles = []
-        for url in response.json()["metadata"]:
-            name = url.split("/")[-1]
-            name = name.split("?")[0]
-            profiles.append(cls(client, name=name))
-        return profiles
+        :param recursion: 1 (the default) to fetch every profile in full in a
+            single request, or 0 to only fetch their names; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        """
+        response = client.api.profiles.get(params={"recursion": recursion})
+
+        return cls._all_from_metadata(client, response.metadata)
+
+    @classmethod
+    def iter_all(cls, client, recursion=1):
+        """Iterate over all profiles.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and profiles are yielded one at a time.
+        """
+        response = client.api.profiles.get(params={"recursion": recursion}, stream=True)
+        yield from cls._iter_from_response(client, response)
 
     @classmethod
     def create(
@@ -93,8 +104,10 @@ class Profile(model.Model):
 
         response = client.api.profiles.post(json=profile)
         # Handle async response if needed
-        cls._handle_async_response_for_client(client, response, wait)
-        return cls.get(client, name)
+        operation = cls._handle_async_response_for_client(client, response, wait)
+        profile = cls.get(client, name)
+        profile._operation = operation
+        return profile
 
     @property
     def api(self):
@@ -135,7 +148,7 @@ class Profile(model.Model):
         """
         # Note: This overrides the base save method to add documentation
         # but uses the parent's implementation which now handles async responses
-        super().save(wait=wait)
+        return super().save(wait=wait)
 
     def put(self, put_object, wait=False):
         """Put the profile.
@@ -194,4 +207,4 @@ class Profile(model.Model):
         """
         # Note: This overrides the base delete method to add documentation
         # but uses the parent's implementation which now handles async responses
-        super().delete(wait=wait)
+        return super().delete(wait=wait)
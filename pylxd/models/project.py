@@ -40,18 +40,30 @@ class Project(model.Model):
     def get(cls, client, name):
         """Get a project."""
         response = client.api.projects[name].get()
-        return cls(client, **response.json()["metadata"])
+        return cls(client, **response.metadata)
 
     @classmethod
-    def all(cls, client):
-        """Get all projects."""
-        response = client.api.projects.get()
-
-        projects = []
-        for url in response.json()["metadata"]:
-            name = url.split("/")[-1]
-            projects.append(cls(client, name=name))
-        return projects
+    def all(cls, client, recursion=1):
+        """Get all projects.
+
+        :param recursion: 1 (the default) to fetch every project in full in a
+            single request, or 0 to only fetch their names; the other
+            attributes are then fetched on first access.
+        :type recursion: int
+        """
+        response = client.api.projects.get(params={"recursion": recursion})
+
+        return cls._all_from_metadata(client, response.metadata)
+
+    @classmethod
+    def iter_all(cls, client, recursion=1):
+        """Iterate over all projects.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and projects are yielded one at a time.
+        """
+        response = client.api.projects.get(params={"recursion": recursion}, stream=True)
+        yield from cls._iter_from_response(client, response)
 
     @classmethod
     def create(
@@ -33,14 +33,8 @@ class StoragePool(model.Model):
     status = model.Attribute(readonly=True)
     locations = model.Attribute(readonly=True)
 
-    resources = model.Manager()
-    volumes = model.Manager()
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self.resources = managers.StorageResourcesManager(self)
-        self.volumes = managers.StorageVolumeManager(self)
+    resources = model.Manager(managers.StorageResourcesManager)
+    volumes = model.Manager(managers.StorageVolumeManager)
 
     def __eq__(self, other):
         if not isinstance(other, StoragePool):
@@ -68,34 +62,46 @@ class StoragePool(model.Model):
         client.assert_has_api_extension("storage")
         response = client.api.storage_pools[name].get()
 
-        storage_pool = cls(client, **response.json()["metadata"])
+        storage_pool = cls(client, **response.metadata)
         return storage_pool
 
     @classmethod
-    def all(cls, client):
+    def all(cls, client, recursion=1):
         """Get all storage_pools.
 
         Implements GET /1.0/storage-pools
 
-        Note that the returned list is 'sparse' in that only the name of the
-        pool is populated.  If any of the attributes are used, then the `sync`
-        function is called to populate the object fully.
+        With `recursion=0` the returned list is 'sparse' in that only the
+        name of the pool is populated.  If any of the attributes are used,
+        then the `sync` function is called to populate the object fully.
 
         :param client: The pylxd client object
         :type client: :class:`pylxd.client.Client`
+        :param recursion: 1 (the default) to fetch every pool in full in a
+            single request, or 0 to only fetch their names.
+        :type recursion: int
         :returns: a storage pool if successful, raises NotFound if not found
         :rtype: [:class:`pylxd.models.storage_pool.StoragePool`]
         :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable` if the
             'storage' api extension is missing.
         """
         client.assert_has_api_extension("storage")
-        response = client.api.storage_pools.get()
+        response = client.api.storage_pools.get(params={"recursion": recursion})
 
-        storage_pools = []
-        for url in response.json()["metadata"]:
-            name = url.split("/")[-1]
-            storage_pools.append(cls(client, name=name))
-        return storage_pools
+        return cls._all_from_metadata(client, response.metadata)
+
+    @classmethod
+    def iter_all(cls, client, recursion=1):
+        """Iterate over all storage pools.
+
+        This takes the same arguments as `all`, but the listing is parsed as
+        it is received and storage pools are yielded one at a time.
+        """
+        client.assert_has_api_extension("storage")
+        response = client.api.storage_pools.get(
+            params={"recursion": recursion}, stream=True
+        )
+        yield from cls._iter_from_response(client, response)
 
     @classmethod
     def create(cls, client, definition, wait=True):
@@ -139,8 +145,9 @@ class StoragePool(model.Model):
         response = client.api.storage_pools.post(json=definition)
 
         # Use helper method for async handling
-        cls._handle_async_response_for_client(client, response, wait)
+        operation = cls._handle_async_response_for_client(client, response, wait)
         storage_pool = cls.get(client, definition["name"])
+        storage_pool._operation = operation
         return storage_pool
 
     @classmethod
@@ -201,7 +208,7 @@ class StoragePool(model.Model):
             can't be deleted.
         """
         # Note this method exists so that it is documented via sphinx.
-        super().save(wait=wait)
+        return super().save(wait=wait)
 
     def delete(self, wait=False):
         """Delete the storage pool.
@@ -216,7 +223,7 @@ class StoragePool(model.Model):
             can't be deleted.
         """
         # Note this method exists so that it is documented via sphinx.
-        super().delete(wait=wait)
+        return super().delete(wait=wait)
 
     def put(self, put_object, wait=False):
         """Put the storage pool.
@@ -294,7 +301,7 @@ class StorageResources(model.Model):
         """
         storage_pool.client.assert_has_api_extension("resources")
         response = storage_pool.api.resources.get()
-        resources = cls(storage_pool.client, **response.json()["metadata"])
+        resources = cls(storage_pool.client, **response.metadata)
         return resources
 
 
@@ -319,7 +326,7 @@ class StorageVolume(model.Model):
     pool = model.Attribute(readonly=True)
     project = model.Attribute(readonly=True, optional=True)
 
-    snapshots = model.Manager()
+    snapshots = model.Manager(managers.StorageVolumeSnapshotManager)
 
     storage_pool = model.Parent()
 
@@ -336,11 +343,6 @@ class StorageVolume(model.Model):
         """
         return self.storage_pool.api.volumes[self.type][self.name]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self.snapshots = managers.StorageVolumeSnapshotManager(self)
-
     def __eq__(self, other):
         if not isinstance(other, StorageVolume):
             return NotImplemented
@@ -354,15 +356,15 @@ class StorageVolume(model.Model):
     __hash__ = None  # type: ignore  # unhashable, consistent with defining __eq__
 
     @classmethod
-    def all(cls, storage_pool):
+    def all(cls, storage_pool, recursion=1):
         """Get all the volumnes for this storage pool.
 
         Implements GET /1.0/storage-pools/<name>/volumes
 
-        Volumes returned from this method will only have the name
-        set, as that is the only property returned from LXD. If more
-        information is needed, `StorageVolume.sync` is the method call
-        that should be used.
+        With `recursion=0`, volumes returned from this method will only have
+        the name and type set, as that is the only property returned from
+        LXD. If more information is needed, `StorageVolume.sync` is the
+        method call that should be used.
 
         Note that the storage volume types are 'container', 'image' and
         'custom', and these maps to the names 'containers', 'images' and
@@ -370,16 +372,24 @@ class StorageVolume(model.Model):
 
         :param storage_pool: a storage pool object on which to fetch resources
         :type storage_pool: :class:`pylxd.models.storage_pool.StoragePool`
+        :param recursion: 1 (the default) to fetch every volume in full in a
+            single request, or 0 to only fetch their names and types.
+        :type recursion: int
         :returns: a list storage volume if successful
         :rtype: [:class:`pylxd.models.storage_pool.StorageVolume`]
         :raises: :class:`pylxd.exceptions.LXDAPIExtensionNotAvailable` if the
             'storage' api extension is missing.
         """
         storage_pool.client.assert_has_api_extension("storage")
-        response = storage_pool.api.volumes.get()
+        response = storage_pool.api.volumes.get(params={"recursion": recursion})
 
         volumes = []
-        for volume in response.json()["metadata"]:
+        for volume in response.metadata:
+            if isinstance(volume, dict):
+                volumes.append(
+                    cls(storage_pool.client, storage_pool=storage_pool, **volume)
+                )
+                continue
             _type, name = volume.split("/")[-2:]
             # for each type, convert to the string that will work with GET
             if _type == "container":
@@ -429,7 +439,7 @@ class StorageVolume(model.Model):
         volume = cls(
             storage_pool.client,
             storage_pool=storage_pool,
-            **response.json()["metadata"],
+            **response.metadata,
         )
         return volume
 
@@ -494,9 +504,12 @@ class StorageVolume(model.Model):
         response = storage_pool.api.volumes.custom.post(json=definition)
 
         # Use class method helper for async handling
-        cls._handle_async_response_for_client(storage_pool.client, response, wait)
+        operation = cls._handle_async_response_for_client(
+            storage_pool.client, response, wait
+        )
 
         volume = cls.get(storage_pool, "custom", definition["name"])
+        volume._operation = operation
         return volume
 
     def rename(self, _input, wait=False):
@@ -543,7 +556,7 @@ class StorageVolume(model.Model):
         self._handle_async_response(response, wait)
 
         self.name = _input["name"]
-        return response.json()["metadata"]
+        return response.metadata
 
     def put(self, put_object, wait=False):
         """Put the storage volume.
@@ -620,7 +633,7 @@ class StorageVolume(model.Model):
             volume can't be saved.
         """
         # Note this method exists so that it is documented via sphinx.
-        super().save(wait=wait)
+        return super().save(wait=wait)
 
     def delete(self, wait=False):
         """Delete the storage pool.
@@ -639,7 +652,7 @@ class StorageVolume(model.Model):
             can't be deleted.
         """
         # Note this method exists so that it is documented via sphinx.
-        super().delete(wait=wait)
+        return super().delete(wait=wait)
 
     def restore_from(self, snapshot_name, wait=False):
         """Restore this volume from a snapshot using its name.
@@ -764,7 +777,7 @@ class StorageVolumeSnapshot(model.Model):
 
         response = volume.api.snapshots[name].get()
 
-        return cls.__parse_snapshot_json(volume, response.json()["metadata"])
+        return cls.__parse_snapshot_json(volume, response.metadata)
 
     @classmethod
     def all(cls, volume, use_recursion=False):
@@ -794,15 +807,12 @@ class StorageVolumeSnapshot(model.Model):
 
             return [
                 cls.__parse_snapshot_json(volume, snapshot)
-                for snapshot in response.json()["metadata"]
+                for snapshot in response.metadata
             ]
 
         response = volume.api.snapshots.get()
 
-        return [
-            snapshot_name.split("/")[-1]
-            for snapshot_name in response.json()["metadata"]
-        ]
+        return [snapshot_name.split("/")[-1] for snapshot_name in response.metadata]
 
     @classmethod
     def create(cls, volume, name=None, expires_at=None, wait=True):
@@ -884,14 +894,17 @@ class StorageVolumeSnapshot(model.Model):
         :type new_name: str
         :param wait: Whether to wait for async operations to complete
         :type wait: bool
+        :returns: the future of the operation if not waiting for it
+        :rtype: :class:`~pylxd.models.operation.OperationFuture`
         :raises: :class:`pylxd.exceptions.LXDAPIException` if the the operation fails.
         """
         response = self.api.post(json={"name": new_name})
 
         # Use instance method helper for async handling
-        self._handle_async_response(response, wait)
+        operation = self._handle_async_response(response, wait)
 
         self.name = new_name
+        return operation
 
     def restore(self, wait=False):
         """Restore the volume from this snapshot.
@@ -913,4 +926,4 @@ class StorageVolumeSnapshot(model.Model):
         :raises: :class:`pylxd.exceptions.LXDAPIException` if the storage pool
             can't be deleted.
         """
-        super().delete(wait=wait)
+        return super().delete(wait=wait)
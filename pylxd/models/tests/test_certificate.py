@@ -34,6 +34,26 @@ class TestCertificate(testing.PyLXDTestCase):
 
         self.assertIn("an-certificate", [c.fingerprint for c in certs])
 
+    def test_all_hydrated(self):
+        """Certificates are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"fingerprint": "abcd", "type": "client", "name": "a-client"}
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/certificates\?recursion=1$",
+            }
+        )
+
+        result = models.Certificate.all(self.client)
+
+        self.assertEqual("abcd", result[0].fingerprint)
+        self.assertEqual("a-client", result[0].name)
+
     def test_create(self):
         """A certificate is created."""
         with open(
@@ -43,6 +43,24 @@ class TestCluster(testing.PyLXDTestCase):
 
         self.assertEqual("an-member", cluster.server_name)
 
+    def test_members_all_hydrated(self):
+        """Cluster members are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [{"server_name": "an-member", "status": "Online"}],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/cluster/members\?recursion=1$",
+            }
+        )
+
+        members = models.ClusterMember.all(self.client)
+
+        self.assertEqual("an-member", members[0].server_name)
+        self.assertEqual("Online", members[0].status)
+
 
 class TestClusterEquality(testing.PyLXDTestCase):
     """Tests for Cluster equality semantics."""
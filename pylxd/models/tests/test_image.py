@@ -1,9 +1,11 @@
 import hashlib
 import json
-from io import StringIO
+from io import BytesIO, StringIO
 from unittest import mock
+from urllib import parse
 
 from pylxd import exceptions, models
+from pylxd.client import _FileStream
 from pylxd.tests import testing
 
 
@@ -113,6 +115,65 @@ class TestImage(testing.PyLXDTestCase):
 
         self.assertEqual(1, len(images))
 
+    def test_all_hydrated(self):
+        """Images are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [{"fingerprint": "abcd", "size": 123, "public": False}],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/images\?recursion=1$",
+            }
+        )
+
+        result = models.Image.all(self.client)
+
+        self.assertEqual("abcd", result[0].fingerprint)
+        self.assertEqual(123, result[0].size)
+        self.assertFalse(result[0].dirty)
+
+    def test_all_filter_server_side(self):
+        """Filters are sent to servers supporting api_filtering."""
+        testing.add_api_extension_helper(self, ["api_filtering"])
+        self.add_rule(
+            {
+                "json": {"type": "sync", "metadata": []},
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/images\?",
+            }
+        )
+
+        models.Image.all(self.client, filter="properties.os eq Ubuntu")
+
+        query = parse.parse_qs(
+            parse.urlparse(self.requests_mock.last_request.url).query
+        )
+        self.assertEqual(["properties.os eq Ubuntu"], query["filter"])
+
+    def test_all_filter_client_side(self):
+        """Without api_filtering, filters are applied client side."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"fingerprint": "aaaa", "properties": {"os": "Ubuntu"}},
+                        {"fingerprint": "bbbb", "properties": {"os": "Alpine"}},
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/images\?recursion=1$",
+            }
+        )
+
+        images = models.Image.all(
+            self.client, recursion=0, filter={"properties.os": "Ubuntu"}
+        )
+
+        self.assertEqual(["aaaa"], [i.fingerprint for i in images])
+
     def test_create(self):
         """An image is created."""
         fingerprint = hashlib.sha256(b"").hexdigest()
@@ -121,6 +182,15 @@ class TestImage(testing.PyLXDTestCase):
         self.assertIsInstance(a_image, models.Image)
         self.assertEqual(fingerprint, a_image.fingerprint)
 
+    def test_create_from_file(self):
+        """The data of an image created from a file object is streamed."""
+        fingerprint = hashlib.sha256(b"").hexdigest()
+        a_image = models.Image.create(self.client, BytesIO(b""), public=True)
+
+        (post,) = [r for r in self.requests_mock.request_history if r.method == "POST"]
+        self.assertIsInstance(post.body, _FileStream)
+        self.assertEqual(fingerprint, a_image.fingerprint)
+
     def test_create_with_metadata(self):
         """An image with metadata is created."""
         fingerprint = hashlib.sha256(b"").hexdigest()
@@ -384,7 +454,10 @@ class TestImage(testing.PyLXDTestCase):
         a_image = self.client.images.all()[0]
 
         client2 = Client(endpoint="http://pylxd2.test")
-        a_image.copy(client2, public=False, auto_update=False)
+        operation = a_image.copy(client2, public=False, auto_update=False)
+
+        self.assertIsInstance(operation, models.OperationFuture)
+        self.assertEqual("images-create-operation", operation.id)
 
     def test_create_from_simplestreams(self):
         """Try to create an image from simplestreams."""
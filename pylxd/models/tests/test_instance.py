@@ -1,15 +1,27 @@
 import contextlib
+import errno
+import hashlib
+import io
 import json
 import os
+import pathlib
 import shutil
+import stat
+import tarfile
 import tempfile
+import threading
+import warnings
 from unittest import mock
+from urllib import parse
 from urllib.parse import quote as url_quote
 
 import requests
+from ws4py.messaging import BinaryMessage
 
 from pylxd import exceptions, models
+from pylxd.models import instance as instance_module
 from pylxd.tests import testing
+from pylxd.tests.mock_lxd import instances_POST
 
 
 class TestInstance(testing.PyLXDTestCase):
@@ -21,6 +33,73 @@ class TestInstance(testing.PyLXDTestCase):
 
         self.assertEqual(1, len(instances))
 
+    def _add_instance_listing(self):
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "a-worker", "status": "Running", "location": "a"},
+                        {"name": "b-worker", "status": "Running", "location": "b"},
+                        {"name": "a-stopped", "status": "Stopped", "location": "a"},
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances\?",
+            }
+        )
+
+    def test_iter_all(self):
+        """Instances are streamed from the listing one at a time."""
+        self._add_instance_listing()
+
+        instances = models.Instance.iter_all(
+            self.client, recursion=1, filter={"location": "a"}
+        )
+
+        self.assertEqual("a-worker", next(instances).name)
+        self.assertEqual("a-stopped", next(instances).name)
+        self.assertRaises(StopIteration, next, instances)
+
+    def test_all_filter_server_side(self):
+        """Filters are sent to servers supporting api_filtering."""
+        testing.add_api_extension_helper(self, ["api_filtering"])
+        self._add_instance_listing()
+
+        models.Instance.all(
+            self.client, recursion=1, filter={"status": "Running", "location": "a"}
+        )
+
+        query = parse.parse_qs(
+            parse.urlparse(self.requests_mock.last_request.url).query
+        )
+        self.assertEqual(["status eq Running and location eq a"], query["filter"])
+        self.assertEqual(["1"], query["recursion"])
+
+    def test_all_filter_client_side(self):
+        """Without api_filtering, filters are applied client side."""
+        self._add_instance_listing()
+
+        instances = models.Instance.all(
+            self.client, filter={"status": "Running", "location": "a"}
+        )
+
+        self.assertEqual(["a-worker"], [i.name for i in instances])
+        query = parse.parse_qs(
+            parse.urlparse(self.requests_mock.last_request.url).query
+        )
+        self.assertNotIn("filter", query)
+        self.assertEqual(["1"], query["recursion"])
+
+    def test_all_filter_expression_not_supported(self):
+        """Filter expressions require api_filtering."""
+        self.assertRaises(
+            exceptions.LXDAPIExtensionNotAvailable,
+            models.Instance.all,
+            self.client,
+            filter="status eq Running",
+        )
+
     def test_all_with_fields_uses_selective_recursion(self):
         """When the extension is present and fields is given, the selective
         recursion URL (recursion=2;fields=...) is used."""
@@ -69,12 +148,15 @@ class TestInstance(testing.PyLXDTestCase):
             }
         )
 
-        instances = models.Instance.all(
-            self.client, recursion=2, fields=["state.disk", "state.network"]
-        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            instances = models.Instance.all(
+                self.client, recursion=2, fields=["state.disk", "state.network"]
+            )
 
         self.assertEqual(1, len(instances))
         self.assertEqual("an-instance", instances[0].name)
+        self.assertFalse(instances[0].dirty)
 
     def test_all_with_fields_empty_suppresses_state(self):
         """An empty fields list produces recursion=2;fields= (no state sub-fields)."""
@@ -178,6 +260,42 @@ class TestInstance(testing.PyLXDTestCase):
         an_instance = models.Instance.get(self.client, name)
 
         self.assertEqual(name, an_instance.name)
+        self.assertFalse(an_instance.dirty)
+
+    def test_get_location_none(self):
+        """The location of an instance is None when not clustered."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {"name": "an-instance", "location": "none"},
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance$",
+            }
+        )
+
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        self.assertIsNone(an_instance.location)
+
+    def test_get_location_clustered(self):
+        """The location of an instance is kept in a cluster."""
+        self.client.host_info["environment"]["server_clustered"] = True
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {"name": "an-instance", "location": "an-remote"},
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance$",
+            }
+        )
+
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        self.assertEqual("an-remote", an_instance.location)
 
     def test_get_not_found(self):
         """LXDAPIException is raised when the instance doesn't exist."""
@@ -243,6 +361,63 @@ class TestInstance(testing.PyLXDTestCase):
                         # Creating an instance without a name should still work (a random name is assigned).
                         self.assertEqual("an-instance-generated", an_new_instance.name)
 
+    def test_create_many(self):
+        """Instances are created concurrently, failures being returned."""
+
+        def create(request, context):
+            if request.json()["name"] == "a-conflict":
+                context.status_code = 409
+                return json.dumps(
+                    {"type": "error", "error": "exists", "error_code": 409}
+                )
+            return instances_POST(request, context)
+
+        self.add_rule(
+            {
+                "text": create,
+                "method": "POST",
+                "url": r"^http://pylxd.test/1.0/instances$",
+            }
+        )
+
+        results = self.client.instances.create_many(
+            [{"name": "an-instance"}, {"name": "a-conflict"}], max_concurrency=2
+        )
+
+        self.assertEqual("an-instance", results[0].name)
+        self.assertIsInstance(results[1], exceptions.LXDAPIException)
+
+    def test_create_many_start(self):
+        """Instances are started once created."""
+        results = self.client.instances.create_many(
+            [{"name": "an-instance"}], start=True
+        )
+
+        self.assertEqual("Running", results[0].status)
+        self.assertIn(
+            "/1.0/instances/an-instance/state",
+            [r.path for r in self.requests_mock.request_history if r.method == "PUT"],
+        )
+
+    def test_create_many_start_failure(self):
+        """Instances which fail to start are returned with the error."""
+        self.add_rule(
+            {
+                "status_code": 400,
+                "json": {"type": "error", "error": "boom", "error_code": 400},
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/state$",
+            }
+        )
+
+        results = self.client.instances.create_many(
+            [{"name": "an-instance"}], start=True
+        )
+
+        instance, error = results[0]
+        self.assertEqual("an-instance", instance.name)
+        self.assertIsInstance(error, exceptions.LXDAPIException)
+
     def test_create_remote_location(self):
         """A new instance is created at target."""
         config = {"name": "an-new-remote-instance"}
@@ -473,6 +648,38 @@ class TestInstance(testing.PyLXDTestCase):
 
         self.assertEqual("an-renamed-instance", an_instance.name)
 
+    def test_rename_no_wait(self):
+        """The future of the rename is returned when not waiting."""
+        an_instance = models.Instance(self.client, name="an-instance")
+
+        operation = an_instance.rename("an-renamed-instance")
+
+        self.assertIsInstance(operation, models.OperationFuture)
+        self.assertEqual("operation-abc", operation.id)
+        self.assertEqual("an-renamed-instance", an_instance.name)
+
+    def test_create_no_wait(self):
+        """The future of the creation is set on the new instance."""
+        an_new_instance = models.Instance.create(
+            self.client, {"name": "an-new-instance"}, wait=False
+        )
+
+        operation = an_new_instance.operation
+        self.assertIsInstance(operation, models.OperationFuture)
+        self.assertEqual("operation-abc", operation.id)
+        self.assertEqual(
+            {"entity_url": "/1.0/instances/an-new-instance"}, operation.metadata
+        )
+        self.assertEqual("Success", operation.result(timeout=5).status)
+
+    def test_create_wait_no_operation(self):
+        """Instances created waiting have no operation."""
+        an_new_instance = models.Instance.create(
+            self.client, {"name": "an-new-instance"}, wait=True
+        )
+
+        self.assertIsNone(an_new_instance.operation)
+
     def test_delete(self):
         """A instance is deleted."""
         # XXX: rockstar (21 May 2016) - This just executes
@@ -497,6 +704,15 @@ class TestInstance(testing.PyLXDTestCase):
 
         self.assertEqual(0, result.exit_code)
         self.assertEqual("test\n", result.stdout)
+        # stdin is sent once all websockets are connected
+        self.assertEqual(
+            ["connect", "connect", "connect", "send_payload"],
+            [c[0] for c in fake_websocket.method_calls[:4]],
+        )
+        # stdout and stderr are waited for until they finish
+        self.assertEqual(
+            [mock.call(), mock.call()], fake_websocket.wait_finished.call_args_list
+        )
 
     @mock.patch("pylxd.models.instance._StdinWebsocket")
     @mock.patch("pylxd.models.instance._CommandWebsocketClient")
@@ -775,6 +991,38 @@ class TestInstance(testing.PyLXDTestCase):
             mock_sync.assert_not_called()
 
 
+class TestCommandWebsocketClient(testing.PyLXDTestCase):
+    """Tests for pylxd.models.instance._CommandWebsocketClient."""
+
+    def setUp(self):
+        super().setUp()
+        self.websocket = instance_module._CommandWebsocketClient(
+            mock.Mock(), "ws://pylxd.test"
+        )
+        self.addCleanup(self.websocket.sock.close)
+
+    def test_finish_after_empty_message(self):
+        """The stream is finished once drained, if asked to finish."""
+        self.websocket.received_message(BinaryMessage(b"data"))
+        self.websocket.received_message(BinaryMessage(b""))
+        self.assertFalse(self.websocket.wait_finished(0))
+
+        self.websocket.finish_soon()
+
+        self.assertTrue(self.websocket.wait_finished(0))
+        self.assertEqual("data", self.websocket.data)
+
+    def test_closed_wakes_waiter(self):
+        """A waiter returns as soon as the websocket is closed."""
+        self.websocket.finish_soon()
+        timer = threading.Timer(0.01, self.websocket.closed, (1000,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertTrue(self.websocket.wait_finished(5))
+        self.assertTrue(self.websocket.finished)
+
+
 class TestInstanceState(testing.PyLXDTestCase):
     """Tests for pylxd.models.InstanceState."""
 
@@ -794,6 +1042,66 @@ class TestInstanceState(testing.PyLXDTestCase):
 
         an_instance.start(wait=True)
 
+    def instance_requests(self):
+        return [
+            r
+            for r in self.requests_mock.request_history
+            if r.method == "GET" and r.path == "/1.0/instances/an-instance"
+        ]
+
+    def test_freeze_refresh_status(self):
+        """The status is set from the state change without syncing."""
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        an_instance.freeze(wait=True)
+
+        self.assertEqual("Frozen", an_instance.status)
+        self.assertEqual(110, an_instance.status_code)
+        self.assertEqual(1, len(self.instance_requests()))
+        self.assertEqual(set(), an_instance.__dirty__)
+
+    def test_unfreeze_refresh_full(self):
+        """The instance is synced after its state changed."""
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        an_instance.unfreeze(wait=True, refresh="full")
+
+        self.assertEqual(2, len(self.instance_requests()))
+        self.assertEqual("Running", an_instance.status)
+
+    def test_start_refresh_none(self):
+        """The instance is left as is."""
+        an_instance = models.Instance(self.client, name="an-instance")
+
+        an_instance.start(wait=True, refresh="none")
+
+        self.assertIsNone(an_instance._raw_attr("status"))
+        self.assertEqual([], self.instance_requests())
+
+    def test_start_refresh_unknown(self):
+        """Unknown refresh modes are rejected before changing state."""
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        self.assertRaises(ValueError, an_instance.start, refresh="some")
+
+    def test_refresh_status_unknown_action(self):
+        """The status is left as is for actions not known to pylxd."""
+        an_instance = models.Instance.get(self.client, "an-instance")
+        status = an_instance.status
+
+        an_instance._set_state("some-action", wait=True)
+
+        self.assertEqual(status, an_instance.status)
+
+    def test_start_no_wait(self):
+        """The future of the state change is returned when not waiting."""
+        an_instance = models.Instance.get(self.client, "an-instance")
+
+        operation = an_instance.start()
+
+        self.assertIsInstance(operation, models.OperationFuture)
+        self.assertEqual("operation-abc", operation.id)
+
     def test_stop(self):
         """A instance is stopped."""
         an_instance = models.Instance.get(self.client, "an-instance")
@@ -818,6 +1126,186 @@ class TestInstanceState(testing.PyLXDTestCase):
 
         an_instance.unfreeze()
 
+    def test_set_state_all_bulk(self):
+        """Servers supporting bulk state changes are sent a single request."""
+        testing.add_api_extension_helper(self, ["instance_bulk_state_change"])
+        self.add_rule(
+            {
+                "status_code": 202,
+                "json": {
+                    "type": "async",
+                    "operation": "/1.0/operations/operation-abc?project=default",
+                },
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances$",
+            }
+        )
+
+        futures = self.client.instances.set_state_all("stop", timeout=10)
+
+        self.assertEqual(["operation-abc"], [f.id for f in futures])
+        self.assertEqual(
+            {"state": {"action": "stop", "timeout": 10, "force": True}},
+            self.requests_mock.last_request.json(),
+        )
+
+    def test_set_state_all_filter(self):
+        """The state of each matching instance is changed."""
+        testing.add_api_extension_helper(self, ["instance_bulk_state_change"])
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "a-worker", "status": "Running"},
+                        {"name": "b-worker", "status": "Running"},
+                        {"name": "a-stopped", "status": "Stopped"},
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances\?recursion=1$",
+            }
+        )
+        self.add_rule(
+            {
+                "status_code": 202,
+                "json": {
+                    "type": "async",
+                    "operation": "/1.0/operations/operation-abc?project=default",
+                },
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances/[ab]-worker/state$",
+            }
+        )
+
+        self.client.instances.set_state_all(
+            "stop", filter={"status": "Running"}, wait=True
+        )
+
+        changed = [
+            r.path for r in self.requests_mock.request_history if r.method == "PUT"
+        ]
+        self.assertEqual(
+            ["/1.0/instances/a-worker/state", "/1.0/instances/b-worker/state"],
+            sorted(changed),
+        )
+
+    def test_set_state_all_type(self):
+        """Only instances of the type of the model are changed."""
+        testing.add_api_extension_helper(self, ["instance_bulk_state_change"])
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "a-container", "type": "container"},
+                        {"name": "a-vm", "type": "virtual-machine"},
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances\?recursion=1$",
+            }
+        )
+        self.add_rule(
+            {
+                "status_code": 202,
+                "json": {
+                    "type": "async",
+                    "operation": "/1.0/operations/operation-abc?project=default",
+                },
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances/a-container/state$",
+            }
+        )
+
+        futures = self.client.containers.set_state_all("stop")
+
+        self.assertEqual(["operation-abc"], [f.id for f in futures])
+        changed = [
+            r.path for r in self.requests_mock.request_history if r.method == "PUT"
+        ]
+        self.assertEqual(["/1.0/instances/a-container/state"], changed)
+        # The type comes from the listing, without fetching each instance.
+        fetched = [
+            r.path
+            for r in self.requests_mock.request_history
+            if r.method == "GET" and r.path.startswith("/1.0/instances/")
+        ]
+        self.assertEqual([], fetched)
+
+    def test_set_state_all_request_failure(self):
+        """Every instance is changed before the first failure is raised."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [{"name": "a-bad"}, {"name": "b-good"}],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances\?recursion=1$",
+            }
+        )
+        self.add_rule(
+            {
+                "status_code": 400,
+                "json": {"type": "error", "error": "boom", "error_code": 400},
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances/a-bad/state$",
+            }
+        )
+        self.add_rule(
+            {
+                "status_code": 202,
+                "json": {
+                    "type": "async",
+                    "operation": "/1.0/operations/operation-abc?project=default",
+                },
+                "method": "PUT",
+                "url": r"^http://pylxd.test/1.0/instances/b-good/state$",
+            }
+        )
+
+        with self.assertRaises(exceptions.LXDAPIException) as cm:
+            self.client.instances.set_state_all("stop")
+
+        self.assertEqual("boom", str(cm.exception))
+        changed = [
+            r.path for r in self.requests_mock.request_history if r.method == "PUT"
+        ]
+        self.assertEqual(
+            ["/1.0/instances/a-bad/state", "/1.0/instances/b-good/state"],
+            sorted(changed),
+        )
+
+    def test_set_state_all_failure(self):
+        """Without bulk state changes, the first failure is raised."""
+        self.add_rule(
+            {
+                "json": {"type": "sync", "metadata": [{"name": "an-instance"}]},
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances\?recursion=1$",
+            }
+        )
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "id": "operation-abc",
+                        "status": "Failure",
+                        "status_code": 400,
+                        "err": "boom",
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc/wait$",
+            }
+        )
+
+        with self.assertRaises(exceptions.LXDAPIException) as cm:
+            self.client.instances.set_state_all("start", wait=True)
+        self.assertEqual("boom", str(cm.exception))
+
 
 class TestInstanceSnapshots(testing.PyLXDTestCase):
     """Tests for pylxd.models.Instance.snapshots."""
@@ -841,6 +1329,27 @@ class TestInstanceSnapshots(testing.PyLXDTestCase):
         self.assertEqual(self.client, snapshots[0].client)
         self.assertEqual(self.instance, snapshots[0].instance)
 
+    def test_all_hydrated(self):
+        """Snapshots are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "an-instance/an-snapshot", "stateful": False}
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/snapshots\?recursion=1$",
+            }
+        )
+
+        result = self.instance.snapshots.all()
+
+        self.assertEqual("an-snapshot", result[0].name)
+        self.assertFalse(result[0].stateful)
+        self.assertFalse(result[0].dirty)
+
     def test_create(self):
         """Create a snapshot."""
         snapshot = self.instance.snapshots.create(
@@ -849,6 +1358,13 @@ class TestInstanceSnapshots(testing.PyLXDTestCase):
 
         self.assertEqual("an-snapshot", snapshot.name)
 
+    def test_create_no_wait(self):
+        """The future of the creation is set on the new snapshot."""
+        snapshot = self.instance.snapshots.create("an-snapshot")
+
+        self.assertEqual("an-snapshot", snapshot.name)
+        self.assertIsInstance(snapshot.operation, models.OperationFuture)
+
 
 class TestSnapshot(testing.PyLXDTestCase):
     """Tests for pylxd.models.Snapshot."""
@@ -867,15 +1383,26 @@ class TestSnapshot(testing.PyLXDTestCase):
 
         self.assertEqual("an-renamed-snapshot", snapshot.name)
 
-    def test_delete(self):
-        """A snapshot is deleted."""
+    def test_rename_no_wait(self):
+        """The future of the rename is returned when not waiting."""
         snapshot = models.Snapshot(
             self.client, instance=self.instance, name="an-snapshot"
         )
 
-        snapshot.delete(wait=True)
+        operation = snapshot.rename("an-renamed-snapshot")
 
-        # TODO: add an assertion here
+        self.assertIsInstance(operation, models.OperationFuture)
+        self.assertEqual("an-renamed-snapshot", snapshot.name)
+
+    def test_delete(self):
+        """A snapshot is deleted."""
+        snapshot = models.Snapshot(
+            self.client, instance=self.instance, name="an-snapshot"
+        )
+
+        snapshot.delete(wait=True)
+
+        # TODO: add an assertion here
 
     def test_delete_failure(self):
         """If the response indicates delete failure, raise an exception."""
@@ -1080,6 +1607,84 @@ class TestFiles(testing.PyLXDTestCase):
         with self.assertRaises(ValueError):
             self.instance.files.put("/tmp/putted", data, mode=object)
 
+    def capture_put(self):
+        """Capture the headers and streamed body of file pushes."""
+        captures = []
+
+        def capture(request, context):
+            body = request._request.body
+            captures.append(
+                {
+                    "headers": request._request.headers,
+                    "body": body if isinstance(body, bytes) else b"".join(body),
+                }
+            )
+            context.status_code = 200
+
+        self.add_rule(
+            {
+                "text": capture,
+                "method": "POST",
+                "url": (
+                    r"^http://pylxd.test/1.0/instances/an-instance/files"
+                    r"\?path=%2Ftmp%2Fputted$"
+                ),
+            }
+        )
+        return captures
+
+    def test_put_file_object(self):
+        """File objects are streamed with their remaining size."""
+        captures = self.capture_put()
+        with tempfile.TemporaryFile() as fp:
+            fp.write(b"#!/bin/sh\necho hello\n")
+            fp.seek(10)
+
+            self.instance.files.put("/tmp/putted", fp)
+
+        self.assertEqual(b"echo hello\n", captures[0]["body"])
+        self.assertEqual("11", captures[0]["headers"]["Content-Length"])
+
+    def test_put_path(self):
+        """Local files are streamed, preserving their mode if asked to."""
+        captures = self.capture_put()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir, "script")
+            path.write_bytes(b"echo hello\n")
+            path.chmod(0o751)
+
+            self.instance.files.put("/tmp/putted", path, mode=True)
+
+        self.assertEqual(b"echo hello\n", captures[0]["body"])
+        self.assertEqual("0100751", captures[0]["headers"]["X-LXD-mode"])
+
+    def test_put_progress(self):
+        """The progress callback is called after each chunk."""
+        captures = self.capture_put()
+        progress = mock.Mock()
+
+        with mock.patch("pylxd.client._FILE_CHUNK_SIZE", 4):
+            self.instance.files.put("/tmp/putted", "0123456789", progress=progress)
+
+        self.assertEqual(b"0123456789", captures[0]["body"])
+        self.assertEqual("10", captures[0]["headers"]["Content-Length"])
+        self.assertEqual(
+            [mock.call(4), mock.call(8), mock.call(10)], progress.call_args_list
+        )
+
+    def test_put_unknown_size(self):
+        """Streams of unknown size are sent with chunked encoding."""
+        captures = self.capture_put()
+        read, write = os.pipe()
+        with open(read, "rb") as fp:
+            with open(write, "wb") as w:
+                w.write(b"piped")
+
+            self.instance.files.put("/tmp/putted", fp)
+
+        self.assertEqual(b"piped", captures[0]["body"])
+        self.assertEqual("chunked", captures[0]["headers"]["Transfer-Encoding"])
+
     def test_mk_dir(self):
         """Tests pushing an empty directory"""
         _capture = {}
@@ -1136,10 +1741,12 @@ class TestFiles(testing.PyLXDTestCase):
         _captures = []
 
         def capture(request, context):
+            body = request._request.body
             _captures.append(
                 {
                     "headers": getattr(request._request, "headers"),
-                    "body": request._request.body,
+                    # Files are streamed
+                    "body": body if body is None else b"".join(body),
                 }
             )
             context.status_code = 200
@@ -1180,12 +1787,573 @@ class TestFiles(testing.PyLXDTestCase):
             self.assertEqual(_captures[2]["headers"]["X-LXD-type"], "directory")
             self.assertEqual(_captures[3]["body"], b"This is file2")
 
+    def put_tree(self, tmpdir):
+        for name in ("file1", "dir/file2", "dir/sub/file3"):
+            path = os.path.join(tmpdir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"This is {name}")
+
+    def test_recursive_put_max_workers(self):
+        """Directories are created before files are pushed concurrently."""
+        captures = []
+
+        def capture(request, context):
+            captures.append(
+                (
+                    request.qs["path"][0],
+                    request._request.headers.get("X-LXD-type"),
+                    b"".join(request._request.body or []),
+                )
+            )
+            context.status_code = 200
+
+        self.add_rule(
+            {
+                "text": capture,
+                "method": "POST",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+        progress = mock.Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+
+            self.instance.files.recursive_put(
+                tmpdir, "/target", max_workers=4, progress=progress
+            )
+
+        self.assertEqual(
+            [
+                ("/target", "directory"),
+                ("/target/dir", "directory"),
+                ("/target/dir/sub", "directory"),
+            ],
+            [(path, type_) for path, type_, _ in captures[:3]],
+        )
+        self.assertEqual(
+            {
+                ("/target/file1", b"This is file1"),
+                ("/target/dir/file2", b"This is dir/file2"),
+                ("/target/dir/sub/file3", b"This is dir/sub/file3"),
+            },
+            {(path, body) for path, _, body in captures[3:]},
+        )
+        self.assertEqual(
+            [mock.call(1, 3), mock.call(2, 3), mock.call(3, 3)],
+            progress.call_args_list,
+        )
+
+    def test_recursive_put_max_workers_errors(self):
+        """Every file is pushed and the errors are raised together."""
+
+        def push(request, context):
+            if request.qs["path"][0].endswith("file2"):
+                context.status_code = 500
+                return json.dumps({"type": "error", "error": "boom"})
+            context.status_code = 200
+
+        self.add_rule(
+            {
+                "text": push,
+                "method": "POST",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+
+            with self.assertRaises(exceptions.FileTransferError) as cm:
+                self.instance.files.recursive_put(tmpdir, "/target", max_workers=2)
+
+        self.assertEqual(["/target/dir/file2"], list(cm.exception.errors))
+        pushed = [
+            r.qs["path"][0]
+            for r in self.requests_mock.request_history
+            if r.method == "POST"
+        ]
+        self.assertIn("/target/dir/sub/file3", pushed)
+
+    def add_remote_tree(self):
+        """Serve /tree, holding file1 and dir/file2, and a missing entry."""
+        entries = {
+            "/tree": ("directory", json.dumps({"metadata": ["file1", "dir", "gone"]})),
+            "/tree/file1": ("file", "This is file1"),
+            "/tree/dir": ("directory", json.dumps({"metadata": ["file2"]})),
+            "/tree/dir/file2": ("file", "This is file2"),
+        }
+
+        def get(request, context):
+            path = request.qs["path"][0]
+            if path not in entries:
+                context.status_code = 404
+                return json.dumps({"type": "error", "error": "not found"})
+            type_, content = entries[path]
+            context.headers.update({"X-LXD-type": type_, "X-LXD-mode": "0750"})
+            return content
+
+        self.add_rule(
+            {
+                "text": get,
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+
+    def test_recursive_get_max_workers(self):
+        """Entries are pulled concurrently, the errors raised together."""
+        self.add_remote_tree()
+        progress = mock.Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local = os.path.join(tmpdir, "tree")
+
+            with self.assertRaises(exceptions.FileTransferError) as cm:
+                self.instance.files.recursive_get(
+                    "/tree", local, max_workers=4, progress=progress
+                )
+
+            with open(os.path.join(local, "file1")) as f:
+                self.assertEqual("This is file1", f.read())
+            with open(os.path.join(local, "dir", "file2")) as f:
+                self.assertEqual("This is file2", f.read())
+        self.assertEqual(["/tree/gone"], list(cm.exception.errors))
+        self.assertIsInstance(cm.exception.errors["/tree/gone"], exceptions.NotFound)
+        self.assertEqual(
+            [mock.call(1, None), mock.call(2, None)], progress.call_args_list
+        )
+
+    def test_recursive_get_progress(self):
+        """Files pulled one at a time are reported too."""
+        self.add_remote_tree()
+        progress = mock.Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertRaises(
+                exceptions.NotFound,
+                self.instance.files.recursive_get,
+                "/tree",
+                os.path.join(tmpdir, "tree"),
+                progress=progress,
+            )
+
+        self.assertEqual(
+            [mock.call(1, None), mock.call(2, None)], progress.call_args_list
+        )
+
+    def test_tar_stream(self):
+        """Trees are archived with their modes and symlinks."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+            os.chmod(os.path.join(tmpdir, "file1"), 0o751)
+            os.symlink("file1", os.path.join(tmpdir, "link"))
+            os.symlink("dir", os.path.join(tmpdir, "dirlink"))
+
+            with mock.patch("pylxd.models.instance._FILE_CHUNK_SIZE", 4):
+                archive = b"".join(instance_module._tar_stream(tmpdir, 1000, 100))
+
+        self.assertEqual(0, len(archive) % tarfile.RECORDSIZE)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            members = {m.name: m for m in tar.getmembers()}
+            self.assertEqual(
+                {
+                    ".",
+                    "file1",
+                    "link",
+                    "dirlink",
+                    "dir",
+                    "dir/file2",
+                    "dir/sub",
+                    "dir/sub/file3",
+                },
+                set(members),
+            )
+            self.assertEqual(0o751, members["file1"].mode)
+            self.assertEqual((1000, 100), (members["file1"].uid, members["file1"].gid))
+            self.assertTrue(members["dir"].isdir())
+            self.assertEqual("file1", members["link"].linkname)
+            self.assertTrue(members["dirlink"].issym())
+            self.assertEqual(
+                b"This is dir/sub/file3", tar.extractfile("dir/sub/file3").read()
+            )
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_put_tree(self, execute):
+        """Trees are unpacked by tar in the instance from a single stream."""
+        payloads = []
+
+        def run(commands, stdin_payload=None):
+            payloads.append(b"".join(stdin_payload))
+            return instance_module._InstanceExecuteResult(0, "", "")
+
+        execute.side_effect = run
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+
+            self.instance.files.put_tree(tmpdir, "/target")
+
+        command = execute.call_args.args[0]
+        self.assertEqual(["sh", "-c"], command[:2])
+        self.assertEqual("/target", command[-1])
+        with tarfile.open(fileobj=io.BytesIO(payloads[0])) as tar:
+            self.assertIn("dir/sub/file3", tar.getnames())
+            self.assertEqual(0, tar.getmember("file1").uid)
+
+    @mock.patch.object(models.Instance.FilesManager, "recursive_put")
+    @mock.patch.object(models.Instance, "execute")
+    def test_put_tree_without_tar(self, execute, recursive_put):
+        """Files are pushed one by one if tar can't be run."""
+        execute.return_value = instance_module._InstanceExecuteResult(
+            127, "", "sh: tar: not found"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.instance.files.put_tree(tmpdir, "/target", uid=1)
+
+            recursive_put.assert_called_once_with(
+                tmpdir, "/target", mode=True, uid=1, gid=None
+            )
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_put_tree_without_tar_symlinks(self, execute):
+        """Symlinks pushed one by one are pushed as symlinks."""
+        execute.return_value = instance_module._InstanceExecuteResult(
+            127, "", "sh: tar: not found"
+        )
+        pushed = {}
+
+        def capture(request, context):
+            body = request._request.body
+            if body is not None and not isinstance(body, bytes):
+                # Files are streamed
+                body = b"".join(body)
+            pushed[request.qs["path"][0]] = (
+                request._request.headers.get("X-LXD-type"),
+                body,
+            )
+            context.status_code = 200
+
+        self.add_rule(
+            {
+                "text": capture,
+                "method": "POST",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+            os.symlink("file1", os.path.join(tmpdir, "link"))
+            os.symlink("dir", os.path.join(tmpdir, "dirlink"))
+
+            self.instance.files.put_tree(tmpdir, "/target")
+
+        self.assertEqual((None, b"This is file1"), pushed["/target/file1"])
+        self.assertEqual(("symlink", b"file1"), pushed["/target/link"])
+        self.assertEqual(("symlink", b"dir"), pushed["/target/dirlink"])
+        self.assertNotIn("/target/dirlink/file2", pushed)
+
+    @mock.patch.object(models.Instance.FilesManager, "recursive_put")
+    @mock.patch.object(models.Instance, "execute")
+    def test_put_tree_exec_refused(self, execute, recursive_put):
+        """Files are pushed one by one if LXD can't run commands."""
+        response = mock.Mock(status_code=400)
+        response.json.return_value = {"error": "Instance is not running"}
+        execute.side_effect = exceptions.LXDAPIException(response)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.instance.files.put_tree(tmpdir, "/target")
+
+            recursive_put.assert_called_once_with(
+                tmpdir, "/target", mode=True, uid=None, gid=None
+            )
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_put_tree_failure(self, execute):
+        """Errors unpacking are raised."""
+        execute.return_value = instance_module._InstanceExecuteResult(
+            2, "", "tar: /target: Cannot open\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(exceptions.FileTransferError) as cm:
+                self.instance.files.put_tree(tmpdir, "/target")
+
+        error = cm.exception.errors["/target"]
+        self.assertEqual((2, "tar: /target: Cannot open"), error.args)
+
+    def test_put_tree_not_a_directory(self):
+        self.assertRaises(
+            NotADirectoryError, self.instance.files.put_tree, __file__, "/target"
+        )
+
+    def test_tree_manifest(self):
+        """Hashes are cached with the size and mtime of files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir, "src")
+            cache_path = os.path.join(tmpdir, "cache", "manifest.json")
+            self.put_tree(src)
+            os.symlink("file1", os.path.join(src, "link"))
+
+            manifest = instance_module._tree_manifest(src, cache_path)
+
+            self.assertEqual(
+                {"file1", "link", "dir/file2", "dir/sub/file3"}, set(manifest)
+            )
+            self.assertEqual(
+                hashlib.sha256(b"This is file1").hexdigest(), manifest["file1"][2]
+            )
+            self.assertEqual(13, manifest["file1"][0])
+
+            # Cached hashes are used for unchanged files only.
+            manifest["file1"][2] = manifest["dir/file2"][2] = "cached"
+            with open(cache_path, "w") as f:
+                json.dump(manifest, f)
+            with open(os.path.join(src, "dir", "file2"), "a") as f:
+                f.write("!")
+
+            manifest = instance_module._tree_manifest(src, cache_path)
+
+            self.assertEqual("cached", manifest["file1"][2])
+            self.assertEqual(
+                hashlib.sha256(b"This is dir/file2!").hexdigest(),
+                manifest["dir/file2"][2],
+            )
+
+    def sync_tree(self, tmpdir, remote, **kwargs):
+        """Sync a tree to the instance, whose files have the `remote` hashes."""
+        self.put_tree(tmpdir)
+        pushed = {}
+
+        def put(request, context):
+            pushed[request.qs["path"][0]] = request
+            context.status_code = 200
+
+        self.add_rule(
+            {
+                "text": put,
+                "method": "POST",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+        self.add_rule(
+            {
+                "text": json.dumps(remote),
+                "method": "GET",
+                "url": (
+                    r"^http://pylxd.test/1.0/instances/an-instance/files"
+                    r"\?path=%2Ftarget%2F.pylxd-manifest.json$"
+                ),
+            }
+        )
+        with tempfile.TemporaryDirectory() as cache_home:
+            with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_home}):
+                result = self.instance.files.sync_tree(tmpdir, "/target", **kwargs)
+        return result, pushed
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree(self, execute):
+        """Only new and changed files are pushed, removed files deleted."""
+        payloads = []
+
+        def run(commands, stdin_payload=None):
+            if not isinstance(stdin_payload, bytes):
+                stdin_payload = b"".join(stdin_payload)
+            payloads.append(stdin_payload)
+            return instance_module._InstanceExecuteResult(0, "", "")
+
+        execute.side_effect = run
+        file1 = hashlib.sha256(b"This is file1").hexdigest()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result, pushed = self.sync_tree(
+                tmpdir, {"file1": file1, "dir/file2": "old", "gone": "old"}
+            )
+
+        self.assertEqual(["dir/file2", "dir/sub/file3"], sorted(result.transferred))
+        self.assertEqual(["gone"], result.deleted)
+        self.assertEqual(38, result.bytes_transferred)
+        self.assertEqual(13, result.bytes_saved)
+        with tarfile.open(fileobj=io.BytesIO(payloads[0])) as tar:
+            self.assertEqual(
+                {".", "dir", "dir/sub", "dir/file2", "dir/sub/file3"},
+                set(tar.getnames()),
+            )
+        self.assertEqual(b"gone", payloads[1])
+        manifest = json.loads(pushed["/target/.pylxd-manifest.json"].body)
+        self.assertEqual(file1, manifest["file1"])
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree_without_tar(self, execute):
+        """Files and symlinks are pushed one by one if tar can't be run."""
+        execute.return_value = instance_module._InstanceExecuteResult(
+            127, "", "sh: tar: not found"
+        )
+        file1 = hashlib.sha256(b"This is file1").hexdigest()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.symlink("file1", os.path.join(tmpdir, "link"))
+            result, pushed = self.sync_tree(tmpdir, {"file1": file1})
+
+        self.assertEqual(
+            ["dir/file2", "dir/sub/file3", "link"], sorted(result.transferred)
+        )
+        self.assertNotIn("/target/file1", pushed)
+        self.assertEqual("directory", pushed["/target/dir"].headers["X-LXD-type"])
+        self.assertIn("/target/dir/file2", pushed)
+        self.assertEqual("symlink", pushed["/target/link"].headers["X-LXD-type"])
+        self.assertEqual(b"file1", pushed["/target/link"].body)
+        manifest = json.loads(pushed["/target/.pylxd-manifest.json"].body)
+        self.assertIn("link", manifest)
+
+    @mock.patch.object(models.Instance.FilesManager, "delete")
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree_exec_refused(self, execute, delete):
+        """Without exec, files are pushed and deleted one by one, and the
+        files in the instance can't be hashed."""
+        response = mock.Mock(status_code=400)
+        response.json.return_value = {"error": "Instance is not running"}
+        execute.side_effect = exceptions.LXDAPIException(response)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result, pushed = self.sync_tree(tmpdir, {"gone": "old"})
+
+            self.assertEqual(["gone"], result.deleted)
+            delete.assert_called_once_with("/target/gone")
+            self.assertIn("/target/file1", pushed)
+
+            result, _ = self.sync_tree(tmpdir, {}, verify=True, delete=False)
+
+        self.assertEqual(
+            ["dir/file2", "dir/sub/file3", "file1"], sorted(result.transferred)
+        )
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree_unchanged(self, execute):
+        """Nothing is pushed when the instance is up to date."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.put_tree(tmpdir)
+            remote = {
+                path: digest
+                for path, (_, _, digest) in instance_module._tree_manifest(
+                    tmpdir
+                ).items()
+            }
+
+            result, _ = self.sync_tree(tmpdir, remote)
+
+        execute.assert_not_called()
+        self.assertEqual([], result.transferred)
+        self.assertEqual(0, result.bytes_transferred)
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree_verify(self, execute):
+        """The files in the instance are hashed there if asked to."""
+        file1 = hashlib.sha256(b"This is file1").hexdigest()
+        execute.return_value = instance_module._InstanceExecuteResult(
+            0, f"{file1}  ./file1\n", ""
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result, _ = self.sync_tree(tmpdir, {}, verify=True, delete=False)
+
+        self.assertIn("sha256sum", execute.call_args_list[0].args[0][2])
+        self.assertNotIn("file1", result.transferred)
+        self.assertEqual(13, result.bytes_saved)
+
+    @mock.patch.object(models.Instance, "execute")
+    def test_sync_tree_verify_symlinks(self, execute):
+        """Symlinks in the instance are compared by target, and deleted."""
+        link = hashlib.sha256(b"symlink:file1").hexdigest()
+        execute.return_value = instance_module._InstanceExecuteResult(
+            0, f"{link}  ./link\n{link}  ./gone-link\n", ""
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.symlink("file1", os.path.join(tmpdir, "link"))
+            result, _ = self.sync_tree(tmpdir, {}, verify=True)
+
+        self.assertIn("find . -type l", execute.call_args_list[0].args[0][2])
+        self.assertNotIn("link", result.transferred)
+        self.assertEqual(["gone-link"], result.deleted)
+
     def test_get(self):
         """A file is retrieved from the instance."""
         data = self.instance.files.get("/tmp/getted")
 
         self.assertEqual(b"This is a getted file", data)
 
+    def add_getted_file(self):
+        self.add_rule(
+            {
+                "text": "This is a getted file",
+                "method": "GET",
+                "url": (
+                    r"^http://pylxd.test/1.0/instances/an-instance/files"
+                    r"\?path=%2Ftmp%2Fgetted$"
+                ),
+                "headers": {
+                    "X-LXD-type": "file",
+                    "X-LXD-mode": "0640",
+                    "X-LXD-uid": "1000",
+                    "X-LXD-gid": "100",
+                },
+            }
+        )
+
+    def test_iter_get(self):
+        """A file is retrieved from the instance in chunks."""
+        chunks = list(self.instance.files.iter_get("/tmp/getted", chunk_size=8))
+
+        self.assertEqual(b"This is a getted file", b"".join(chunks))
+        self.assertEqual(8, len(chunks[0]))
+
+    def test_get_to_path(self):
+        """A file is retrieved to a local file with its mode."""
+        self.add_getted_file()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "getted")
+
+            info = self.instance.files.get_to("/tmp/getted", path, chunk_size=8)
+
+            with open(path, "rb") as f:
+                self.assertEqual(b"This is a getted file", f.read())
+            umask = os.umask(0)
+            os.umask(umask)
+            self.assertEqual(0o640 & ~umask, stat.S_IMODE(os.stat(path).st_mode))
+        self.assertEqual({"mode": 0o640, "uid": 1000, "gid": 100}, info)
+
+    def test_get_to_file_object(self):
+        """A file is retrieved to a file object."""
+        self.add_getted_file()
+        f = io.BytesIO()
+
+        info = self.instance.files.get_to("/tmp/getted", f)
+
+        self.assertEqual(b"This is a getted file", f.getvalue())
+        self.assertEqual(0o640, info["mode"])
+
+    def test_get_to_not_found(self):
+        """Errors are raised without creating the local file."""
+        self.add_rule(
+            {
+                "json": {"type": "error", "error": "not found", "error_code": 404},
+                "status_code": 404,
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/instances/an-instance/files",
+            }
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "missing")
+
+            self.assertRaises(
+                exceptions.NotFound, self.instance.files.get_to, "/tmp/missing", path
+            )
+            self.assertFalse(os.path.exists(path))
+
     def test_recursive_get(self):
         """A folder is retrieved recursively from the instance"""
         response = requests.models.Response()
@@ -1193,18 +2361,21 @@ class TestFiles(testing.PyLXDTestCase):
         response.headers["X-LXD-type"] = "directory"
         response.headers["X-LXD-mode"] = "750"
         response._content = json.dumps({"metadata": ["file1", "file2"]}).encode("utf-8")
+        response._content_consumed = True
 
         response1 = requests.models.Response()
         response1.status_code = 200
         response1.headers["X-LXD-type"] = "file"
         response1.headers["X-LXD-mode"] = "762"
         response1._content = b"This is file1"
+        response1._content_consumed = True
 
         response2 = requests.models.Response()
         response2.status_code = 200
         response2.headers["X-LXD-type"] = "file"
         response2.headers["X-LXD-mode"] = "744"
         response2._content = b"This is file2"
+        response2._content_consumed = True
 
         return_values = [response, response1, response2]
 
@@ -1227,6 +2398,31 @@ class TestFiles(testing.PyLXDTestCase):
             mock_os_open.assert_any_call("/tmp/file2", flags, mode=0o744)
             self.assertEqual(mock_os_open.call_count, 2)
 
+    def test_recursive_get_symlink(self):
+        """Symlinks are skipped, not counted, and their response closed."""
+        directory = mock.MagicMock(
+            headers={"X-LXD-type": "directory", "X-LXD-mode": "750"},
+            content=json.dumps({"metadata": ["link"]}).encode("utf-8"),
+        )
+        link = mock.MagicMock(headers={"X-LXD-type": "symlink", "X-LXD-mode": "777"})
+        progress = mock.Mock()
+
+        with (
+            mock.patch("pylxd.client._APINode.get") as get_mocked,
+            mock.patch("os.makedirs"),
+            mock.patch("os.open") as mock_os_open,
+        ):
+            get_mocked.side_effect = [directory, link]
+
+            self.instance.files.recursive_get(
+                "/tmp/dir", "/local/dir", progress=progress
+            )
+
+        mock_os_open.assert_not_called()
+        progress.assert_not_called()
+        directory.close.assert_called_once_with()
+        link.close.assert_called_once_with()
+
     def test_recursive_get_sanitizes_traversal_entries(self):
         """Path traversal entries in directory listings are skipped."""
         response = requests.models.Response()
@@ -1236,12 +2432,14 @@ class TestFiles(testing.PyLXDTestCase):
         response._content = json.dumps(
             {"metadata": ["safe_file", "..", ".", "/etc/passwd", "../evil"]}
         ).encode("utf-8")
+        response._content_consumed = True
 
         response1 = requests.models.Response()
         response1.status_code = 200
         response1.headers["X-LXD-type"] = "file"
         response1.headers["X-LXD-mode"] = "644"
         response1._content = b"safe content"
+        response1._content_consumed = True
 
         with (
             mock.patch("pylxd.client._APINode.get") as get_mocked,
@@ -1308,6 +2506,264 @@ class TestFiles(testing.PyLXDTestCase):
         self.assertEqual(b'{"some": "value"}', data)
 
 
+def _sftp_attrs(mode, uid=0, gid=0):
+    return mock.Mock(st_mode=mode, st_uid=uid, st_gid=gid)
+
+
+class TestFilesSFTP(testing.PyLXDTestCase):
+    """Tests for the SFTP transport of pylxd.models.Instance.files."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.host_info["api_extensions"] = ["instances_sftp"]
+        self.instance = models.Instance.get(self.client, "an-instance")
+        self.instance.files.use_sftp = True
+        self.sftp = mock.MagicMock()
+        patcher = mock.patch.object(
+            instance_module, "_open_sftp", return_value=self.sftp
+        )
+        self.open_sftp = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_session_reused(self):
+        """One SFTP session of the instance is opened and reused."""
+        self.instance.files.put("/tmp/a", b"a")
+        self.instance.files.put("/tmp/b", "b", mode="0755", uid=1000)
+
+        self.open_sftp.assert_called_once_with(self.instance.files._sftp_endpoint)
+        self.assertEqual(
+            "http://pylxd.test/1.0/instances/an-instance/sftp",
+            self.instance.files._sftp_endpoint._api_endpoint,
+        )
+        self.assertEqual(
+            [mock.call("/tmp/a", "wb"), mock.call("/tmp/b", "wb")],
+            self.sftp.open.call_args_list,
+        )
+        f = self.sftp.open.return_value
+        f.set_pipelined.assert_called_with(True)
+        self.assertEqual([mock.call(b"a"), mock.call(b"b")], f.write.call_args_list)
+        self.sftp.chmod.assert_called_once_with("/tmp/b", 0o755)
+        self.sftp.chown.assert_called_once_with("/tmp/b", 1000, 0)
+        self.assertFalse(
+            [r for r in self.requests_mock.request_history if "/files" in r.path]
+        )
+
+    def test_put_mode_before_write(self):
+        """The mode of a file is set before its content is written."""
+        calls = mock.Mock()
+        self.sftp.chmod.side_effect = lambda *args: calls.chmod(*args)
+        self.sftp.open.return_value.write.side_effect = calls.write
+
+        self.instance.files.put("/tmp/a", b"a", mode=0o600)
+
+        self.assertEqual(
+            [mock.call.chmod("/tmp/a", 0o600), mock.call.write(b"a")],
+            calls.mock_calls,
+        )
+
+    def test_put_progress(self):
+        """The bytes sent are reported as they are written."""
+        progress = mock.Mock()
+
+        self.instance.files.put("/tmp/a", b"abc", progress=progress)
+
+        progress.assert_called_once_with(3)
+
+    def test_no_extension(self):
+        """The files API is used if LXD has no SFTP support."""
+        self.client.host_info["api_extensions"] = []
+
+        data = self.instance.files.get("/tmp/json-get")
+
+        self.assertEqual(b'{"some": "value"}', data)
+        self.open_sftp.assert_not_called()
+
+    def test_use_sftp_default(self):
+        """SFTP isn't used unless use_sftp is set."""
+        del self.instance.files.use_sftp
+
+        self.instance.files.get("/tmp/json-get")
+
+        self.open_sftp.assert_not_called()
+
+    def test_paramiko_missing(self):
+        """The files API is used, without retrying, if paramiko is missing."""
+        self.open_sftp.return_value = None
+
+        self.instance.files.get("/tmp/json-get")
+        data = self.instance.files.get("/tmp/json-get")
+
+        self.assertEqual(b'{"some": "value"}', data)
+        self.open_sftp.assert_called_once()
+
+    def test_upgrade_fails(self):
+        """The files API is used if the SFTP session can't be opened."""
+        self.open_sftp.side_effect = OSError("refused")
+
+        with self.assertLogs(instance_module.logger, "WARNING"):
+            data = self.instance.files.get("/tmp/json-get")
+
+        self.assertEqual(b'{"some": "value"}', data)
+
+    def test_close(self):
+        """close() closes the session, and the next transfer reopens one."""
+        self.instance.files.delete("/tmp/a")
+        self.instance.files.close()
+        self.instance.files.delete("/tmp/b")
+
+        self.sftp.close.assert_called_once_with()
+        self.assertEqual(2, self.open_sftp.call_count)
+        self.sftp.remove.assert_called_with("/tmp/b")
+
+    def test_get(self):
+        """A file is read over SFTP."""
+        self.sftp.open.return_value.read.side_effect = [b"content", b""]
+
+        self.assertEqual(b"content", self.instance.files.get("/tmp/a"))
+
+    def test_iter_get(self):
+        """A file is read in chunks from a prefetched SFTP file."""
+        f = self.sftp.open.return_value
+        f.read.side_effect = [b"ab", b"c", b""]
+
+        chunks = list(self.instance.files.iter_get("/tmp/a", chunk_size=2))
+
+        self.assertEqual([b"ab", b"c"], chunks)
+        self.sftp.open.assert_called_once_with("/tmp/a", "rb")
+        f.prefetch.assert_called_once_with()
+        f.close.assert_called_once_with()
+
+    def test_get_to(self):
+        """A file is written to a file object, and its mode returned."""
+        self.sftp.lstat.return_value = _sftp_attrs(stat.S_IFREG | 0o640, 1, 2)
+        self.sftp.open.return_value.read.side_effect = [b"content", b""]
+        dst = io.BytesIO()
+
+        info = self.instance.files.get_to("/tmp/a", dst)
+
+        self.assertEqual({"mode": 0o640, "uid": 1, "gid": 2}, info)
+        self.assertEqual(b"content", dst.getvalue())
+
+    def test_stat(self):
+        """The type, mode and owner of a file are returned."""
+        self.sftp.lstat.return_value = _sftp_attrs(stat.S_IFLNK | 0o777)
+
+        info = self.instance.files.stat("/tmp/link")
+
+        self.assertEqual({"type": "symlink", "mode": 0o777, "uid": 0, "gid": 0}, info)
+
+    def test_listdir(self):
+        """The entries of a directory are listed over SFTP."""
+        self.sftp.listdir.return_value = ["a", "b"]
+
+        self.assertEqual(["a", "b"], self.instance.files.listdir("/tmp"))
+
+    def test_mk_dir_exists(self):
+        """Creating a directory which exists succeeds."""
+        self.sftp.mkdir.side_effect = OSError("exists")
+        self.sftp.lstat.return_value = _sftp_attrs(stat.S_IFDIR | 0o755)
+
+        self.instance.files.mk_dir("/tmp/dir", mode=0o700)
+
+        self.sftp.chmod.assert_called_once_with("/tmp/dir", 0o700)
+
+    def test_mk_dir_file_exists(self):
+        """Creating a directory where a file exists fails."""
+        self.sftp.mkdir.side_effect = OSError("exists")
+        self.sftp.lstat.return_value = _sftp_attrs(stat.S_IFREG | 0o644)
+
+        self.assertRaises(
+            exceptions.LXDAPIException, self.instance.files.mk_dir, "/tmp/file"
+        )
+
+    def test_recursive_get(self):
+        """A directory is pulled, skipping entries which escape it."""
+        attrs = {
+            "/tmp/dir": _sftp_attrs(stat.S_IFDIR | 0o755),
+            "/tmp/dir/a": _sftp_attrs(stat.S_IFREG | 0o600),
+        }
+        self.sftp.lstat.side_effect = attrs.__getitem__
+        self.sftp.listdir.return_value = ["a", "..", "b/c"]
+        self.sftp.open.return_value.read.side_effect = [b"a", b""]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local = os.path.join(tmpdir, "dir")
+            self.instance.files.recursive_get("/tmp/dir", local)
+
+            self.assertEqual(["a"], os.listdir(local))
+            with open(os.path.join(local, "a"), "rb") as f:
+                self.assertEqual(b"a", f.read())
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(f.name).st_mode))
+
+    def test_recursive_put(self):
+        """Directories are created and files written over SFTP."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.mkdir(os.path.join(tmpdir, "sub"))
+            with open(os.path.join(tmpdir, "sub", "a"), "wb") as f:
+                f.write(b"a")
+
+            self.instance.files.recursive_put(tmpdir, "/tmp/dst", max_workers=2)
+
+        self.assertEqual(
+            [mock.call("/tmp/dst"), mock.call("/tmp/dst/sub")],
+            self.sftp.mkdir.call_args_list,
+        )
+        self.sftp.open.assert_called_once_with("/tmp/dst/sub/a", "wb")
+
+    def test_get_to_symlink(self):
+        """The target of a symlink is written, as with the files API."""
+        self.sftp.lstat.return_value = _sftp_attrs(stat.S_IFLNK | 0o777)
+        self.sftp.readlink.return_value = "/etc/hosts"
+        dst = io.BytesIO()
+
+        self.instance.files.get_to("/tmp/link", dst)
+
+        self.assertEqual(b"/etc/hosts", dst.getvalue())
+        self.sftp.open.assert_not_called()
+
+    def test_session_per_thread(self):
+        """Transfers at once use sessions of their own, kept for reuse."""
+        sessions = [mock.MagicMock(), mock.MagicMock()]
+        self.open_sftp.side_effect = list(sessions)
+        files = self.instance.files
+
+        with files._sftp_session() as first:
+            with files._sftp_session() as second:
+                self.assertEqual(sessions, [first, second])
+        files.delete("/tmp/a")
+        files.delete("/tmp/b")
+
+        self.assertEqual(2, self.open_sftp.call_count)
+        files.close()
+        for sftp in sessions:
+            sftp.close.assert_called_once_with()
+
+    def test_not_found(self):
+        """A missing file raises NotFound, and the session is kept."""
+        self.sftp.lstat.side_effect = FileNotFoundError(errno.ENOENT, "No such file")
+
+        self.assertRaises(exceptions.NotFound, self.instance.files.stat, "/tmp/a")
+        self.assertRaises(exceptions.NotFound, self.instance.files.stat, "/tmp/b")
+
+        self.open_sftp.assert_called_once()
+        self.sftp.close.assert_not_called()
+
+    def test_connection_lost(self):
+        """A session whose connection failed is closed, not reused."""
+        self.sftp.remove.side_effect = ConnectionResetError(
+            errno.ECONNRESET, "Connection reset"
+        )
+
+        with self.assertRaises(exceptions.LXDAPIException) as cm:
+            self.instance.files.delete("/tmp/a")
+
+        self.assertEqual(500, cm.exception.response.status_code)
+        self.sftp.close.assert_called_once_with()
+        self.sftp.remove.side_effect = None
+        self.instance.files.delete("/tmp/a")
+        self.assertEqual(2, self.open_sftp.call_count)
+
+
 class TestSnapshotEquality(testing.PyLXDTestCase):
     """Tests for Snapshot equality semantics."""
 
@@ -12,7 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from unittest import mock
+from unittest import TestCase, mock
 
 from pylxd.models import _model as model
 from pylxd.tests import testing
@@ -160,6 +160,57 @@ class TestModel(testing.PyLXDTestCase):
 
         self.assertEqual(1000, item.age)
 
+    def test_set_attribute_no_sync(self):
+        """Reading attributes that are set doesn't call sync."""
+        item = Item(self.client, name="an-item", age=15)
+
+        with mock.patch.object(Item, "sync") as mock_sync:
+            self.assertEqual(15, item.age)
+
+        mock_sync.assert_not_called()
+
+    def test_get_unknown_attribute_no_sync(self):
+        """Reading unknown attributes doesn't call sync."""
+        item = Item(self.client, name="an-item")
+
+        with mock.patch.object(Item, "sync") as mock_sync:
+            self.assertRaises(AttributeError, getattr, item, "nonexistent")
+
+        mock_sync.assert_not_called()
+
+    def test_from_api(self):
+        """Objects built from API data are complete and not dirty."""
+        item = Item._from_api(
+            self.client, {"name": "an-item", "age": 15, "data": {"key": "val"}}
+        )
+
+        self.assertEqual(self.client, item.client)
+        self.assertEqual("an-item", item.name)
+        self.assertEqual(15, item.age)
+        self.assertFalse(item.dirty)
+
+    def test_from_api_skips_validators(self):
+        """Values from the API are stored without running validators."""
+        item = Item._from_api(self.client, {"name": "an-item", "age": "15"})
+
+        self.assertEqual("15", item.age)
+
+    def test_from_api_child_class(self):
+        """Child classes are built with their own attributes."""
+        item = ChildItem._from_api(self.client, {"name": "an-item", "age": 15})
+
+        self.assertIsInstance(item, ChildItem)
+        self.assertEqual(15, item.age)
+
+    @mock.patch.dict("os.environ", {"PYLXD_WARNINGS": "always"})
+    @mock.patch("warnings.warn")
+    def test_from_api_unknown_attribute(self, mock_warn):
+        """Unknown attributes from the API are warned about and not set."""
+        item = Item._from_api(self.client, {"name": "an-item", "unknown": "value"})
+
+        mock_warn.assert_called_once_with(mock.ANY)
+        self.assertRaises(AttributeError, getattr, item, "unknown")
+
     def test_iter(self):
         """Test models can be iterated over."""
         item = Item(self.client, name="an-item")
@@ -553,5 +604,93 @@ class TestModel(testing.PyLXDTestCase):
             self.client.operations, "wait_for_operation"
         ) as mock_wait:
             item = Item(self.client, name="an-item")
-            item.post(json={"foo": "bar"}, wait=False)
+            operation = item.post(json={"foo": "bar"}, wait=False)
             mock_wait.assert_not_called()
+
+        self.assertEqual("abc123", operation.id)
+
+    def test_post_sync_returns_none(self):
+        """Model.post returns no future for sync responses."""
+        self.add_rule(
+            {
+                "json": {"type": "sync", "metadata": {}},
+                "status_code": 200,
+                "method": "post",
+                "url": r"^http://pylxd.test/1.0/items/an-item$",
+            }
+        )
+
+        item = Item(self.client, name="an-item")
+
+        self.assertIsNone(item.post(json={"foo": "bar"}))
+
+    def test_operation_unset(self):
+        """Objects have no operation unless created without waiting."""
+        item = Item(self.client, name="an-item")
+
+        self.assertIsNone(item.operation)
+
+
+class ManagedItem(model.Model):
+    """A fake model with a lazily created manager."""
+
+    name = model.Attribute()
+    children = model.Manager(lambda item: mock.Mock(item=item))
+
+
+class TestManager(TestCase):
+    """Tests for pylxd.models._model.Manager."""
+
+    def test_lazy(self):
+        """A manager with a factory is created on first access, once."""
+        item = ManagedItem(mock.Mock(), name="an-item")
+
+        self.assertIs(item, item.children.item)
+        self.assertIs(item.children, item.children)
+        self.assertFalse(item.dirty)
+
+    def test_set(self):
+        """A lazy manager can be replaced."""
+        item = ManagedItem(mock.Mock(), name="an-item")
+        item.children = "a-manager"
+
+        self.assertEqual("a-manager", item.children)
+
+
+class TestFilters(TestCase):
+    """Tests for the filter helpers of pylxd.models._model."""
+
+    def test_expression(self):
+        """A dict of filters becomes an expression."""
+        self.assertEqual(
+            'status eq Running and config.user.role eq "a worker"'
+            " and ephemeral eq false",
+            model._filter_expression(
+                {
+                    "status": "Running",
+                    "config.user.role": "a worker",
+                    "ephemeral": False,
+                }
+            ),
+        )
+
+    def test_expression_str(self):
+        """Expressions are passed through."""
+        self.assertEqual("name eq a", model._filter_expression("name eq a"))
+
+    def test_matches(self):
+        """Dotted fields are looked up in nested dicts, with dotted keys."""
+        data = {
+            "status": "Running",
+            "ephemeral": False,
+            "config": {"user.role": "worker", "image.os": "Ubuntu"},
+        }
+        self.assertTrue(
+            model._filter_matches(
+                data,
+                {"status": "Running", "config.user.role": "worker", "ephemeral": False},
+            )
+        )
+        self.assertFalse(model._filter_matches(data, {"status": "Stopped"}))
+        self.assertFalse(model._filter_matches(data, {"config.user.other": "x"}))
+        self.assertFalse(model._filter_matches(data, {"location": "x"}))
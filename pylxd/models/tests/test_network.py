@@ -112,6 +112,25 @@ class TestNetwork(testing.PyLXDTestCase):
 
         self.assertEqual(2, len(networks))
 
+    def test_all_hydrated(self):
+        """Networks are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [{"name": "lxdbr0", "type": "bridge", "managed": True}],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/networks\?recursion=1$",
+            }
+        )
+
+        result = models.Network.all(self.client)
+
+        self.assertEqual("lxdbr0", result[0].name)
+        self.assertEqual("bridge", result[0].type)
+        self.assertFalse(result[0].dirty)
+
     def test_create_with_parameters(self):
         with mock.patch.object(self.client, "assert_has_api_extension"):
             network = models.Network.create(
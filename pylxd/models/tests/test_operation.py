@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
+import concurrent.futures
 import json
 from unittest import mock
 
@@ -219,3 +221,495 @@ class TestOperation(testing.PyLXDTestCase):
 
         self.assertEqual(2, mock_get.call_count)
         self.assertEqual("operation-abc", op.id)
+
+    def test_wait_for_operation_tracked(self):
+        """wait_for_operation() uses the operation tracker when enabled."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.wait.return_value = {
+            "id": "operation-abc",
+            "status": "Success",
+            "status_code": 200,
+        }
+
+        op = models.Operation.wait_for_operation(
+            self.client, "/1.0/operations/operation-abc?project=default"
+        )
+
+        self.client.operation_tracker.wait.assert_called_once_with(
+            "operation-abc", None
+        )
+        self.assertEqual("Success", op.status)
+        self.assertFalse(
+            any(r.path.endswith("/wait") for r in self.requests_mock.request_history)
+        )
+
+    def test_wait_for_operation_tracked_failure(self):
+        """wait_for_operation() raises failures reported by the tracker via /wait."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.wait.return_value = {
+            "id": "operation-abc",
+            "status": "Failure",
+            "status_code": 400,
+        }
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "id": "operation-abc",
+                        "status": "Failure",
+                        "status_code": 400,
+                        "err": "boom",
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc/wait$",
+            }
+        )
+
+        with self.assertRaises(exceptions.LXDAPIException) as cm:
+            models.Operation.wait_for_operation(self.client, "operation-abc")
+        self.assertEqual("boom", str(cm.exception))
+
+    def test_wait_for_operation_tracker_unavailable(self):
+        """wait_for_operation() falls back to /wait without operation events."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.wait.return_value = None
+
+        op = models.Operation.wait_for_operation(self.client, "operation-abc")
+
+        self.assertEqual("Success", op.status)
+
+
+class TestOperationFuture(testing.PyLXDTestCase):
+    """Tests for pylxd.models.OperationFuture."""
+
+    def future(self):
+        return models.OperationFuture(
+            self.client,
+            "/1.0/operations/operation-abc?project=default",
+            {"metadata": {"progress": "50%"}, "resources": {"instances": []}},
+        )
+
+    def wait_requests(self):
+        return [
+            r
+            for r in self.requests_mock.request_history
+            if r.path.endswith("/operation-abc/wait")
+        ]
+
+    def test_from_response(self):
+        """Futures are made from async responses."""
+        response = mock.Mock()
+        response.json.return_value = {
+            "type": "async",
+            "operation": "/1.0/operations/operation-abc",
+            "metadata": {"id": "operation-abc", "resources": {"instances": []}},
+        }
+
+        future = models.OperationFuture._from_response(self.client, response)
+
+        self.assertEqual("operation-abc", future.id)
+        self.assertEqual({"instances": []}, future.resources)
+        self.assertIsNone(future.metadata)
+
+    def test_from_response_sync(self):
+        """Sync responses have no future."""
+        response = mock.Mock()
+        response.json.return_value = {"type": "sync", "metadata": {}}
+
+        self.assertIsNone(models.OperationFuture._from_response(self.client, response))
+
+    def test_lazy(self):
+        """The operation isn't waited for until asked to."""
+        future = self.future()
+
+        self.assertFalse(future.done())
+        self.assertEqual([], self.wait_requests())
+        self.assertEqual({"progress": "50%"}, future.metadata)
+
+    def test_cancel(self):
+        """Futures of running operations can't be cancelled."""
+        self.assertFalse(self.future().cancel())
+
+    def test_result(self):
+        """The result is the final operation."""
+        future = self.future()
+
+        operation = future.result(timeout=5)
+
+        self.assertEqual("Success", operation.status)
+        self.assertEqual(1, len(self.wait_requests()))
+        self.assertEqual({"return": 0}, future.metadata)
+
+    def test_result_failure(self):
+        """Failed operations raise LXDAPIException."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "id": "operation-abc",
+                        "status": "Failure",
+                        "status_code": 400,
+                        "err": "boom",
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc/wait$",
+            }
+        )
+        future = self.future()
+
+        self.assertIsInstance(future.exception(timeout=5), exceptions.LXDAPIException)
+        self.assertRaises(exceptions.LXDAPIException, future.result, 5)
+
+    def test_add_done_callback(self):
+        """Adding a callback starts the wait."""
+        done = []
+        future = self.future()
+
+        future.add_done_callback(done.append)
+        future.result(timeout=5)
+
+        self.assertEqual([future], done)
+
+    def test_start(self):
+        """Started futures work with concurrent.futures.wait()."""
+        futures = [self.future(), self.future()]
+        for future in futures:
+            future.start()
+            future.start()
+
+        done, not_done = concurrent.futures.wait(futures, timeout=5)
+
+        self.assertEqual(2, len(done))
+        self.assertEqual(2, len(self.wait_requests()))
+
+    def test_await(self):
+        """Futures can be awaited."""
+
+        async def main():
+            return await self.future()
+
+        self.assertEqual("Success", asyncio.run(main()).status)
+
+    def test_tracked(self):
+        """Operations are waited for with the tracker when enabled."""
+        watch = concurrent.futures.Future()
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.watch.return_value = watch
+        future = self.future()
+
+        future.start()
+        self.assertFalse(future.done())
+        watch.set_result(
+            {"id": "operation-abc", "status": "Success", "status_code": 200}
+        )
+
+        self.assertEqual("Success", future.result(timeout=5).status)
+        self.client.operation_tracker.watch.assert_called_once_with("operation-abc")
+        self.assertEqual([], self.wait_requests())
+
+    def test_tracked_closed(self):
+        """The wait falls back to /wait when the tracker's websocket closes."""
+        watch = concurrent.futures.Future()
+        watch.set_result(None)
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.watch.return_value = watch
+
+        self.assertEqual("Success", self.future().result(timeout=5).status)
+        self.assertEqual(1, len(self.wait_requests()))
+
+    def test_tracked_error(self):
+        """Errors of the tracker are raised by the future."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.watch.side_effect = exceptions.NotFound(
+            mock.Mock()
+        )
+
+        self.assertRaises(exceptions.NotFound, self.future().result, 5)
+
+
+class TestWaitMany(testing.PyLXDTestCase):
+    """Tests for waiting with timeouts and for many operations."""
+
+    def setUp(self):
+        super().setUp()
+        for operation_id, status, status_code in (
+            ("operation-fail", "Failure", 400),
+            ("operation-slow", "Running", 103),
+        ):
+            metadata = {
+                "id": operation_id,
+                "status": status,
+                "status_code": status_code,
+                "err": "boom" if status_code == 400 else "",
+            }
+            self.add_rule(
+                {
+                    "json": {"type": "sync", "metadata": metadata},
+                    "method": "GET",
+                    "url": rf"^http://pylxd.test/1.0/operations/{operation_id}(/wait)?(\?timeout=\d+)?$",
+                }
+            )
+
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "id": "operation-abc",
+                        "status": "Success",
+                        "status_code": 200,
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc/wait\?timeout=\d+$",
+            }
+        )
+
+    def test_wait_timeout(self):
+        """The timeout is passed to /wait, which may end before the operation."""
+        operation = models.Operation.get(self.client, "operation-slow")
+
+        self.assertTrue(operation.wait(timeout=2.5))
+
+        self.assertEqual("Running", operation.status)
+        self.assertEqual({"timeout": ["3"]}, self.requests_mock.request_history[-1].qs)
+
+    def test_wait_for_operation_timeout(self):
+        """TimeoutError is raised when the operation doesn't end in time."""
+        self.assertRaises(
+            TimeoutError,
+            models.Operation.wait_for_operation,
+            self.client,
+            "operation-slow",
+            timeout=1,
+        )
+
+    def test_wait_for_operation_timeout_ended(self):
+        """Operations ending in time are returned."""
+        operation = models.Operation.wait_for_operation(
+            self.client, "operation-abc", timeout=1
+        )
+
+        self.assertEqual("Success", operation.status)
+
+    def test_wait_all(self):
+        """The outcome of each operation is returned."""
+        future = models.OperationFuture(self.client, "operation-abc")
+
+        results = self.client.operations.wait_all(
+            [future, "/1.0/operations/operation-fail"]
+        )
+
+        self.assertEqual({"operation-abc", "operation-fail"}, set(results))
+        self.assertIs(future.result(), results["operation-abc"])
+        self.assertEqual("Success", results["operation-abc"].status)
+        self.assertIsInstance(results["operation-fail"], exceptions.LXDAPIException)
+
+    def test_wait_all_timeout(self):
+        """Operations not ended in time have a TimeoutError."""
+        results = self.client.operations.wait_all(
+            ["operation-abc", "operation-slow"], timeout=5
+        )
+
+        self.assertEqual("Success", results["operation-abc"].status)
+        self.assertIsInstance(results["operation-slow"], TimeoutError)
+
+    def test_wait_all_timeout_futures(self):
+        """Futures passed in are given the deadline, and stop waiting."""
+        future = models.OperationFuture(self.client, "operation-slow")
+
+        results = self.client.operations.wait_all([future], timeout=1)
+
+        self.assertIsInstance(results["operation-slow"], TimeoutError)
+        self.assertIsInstance(future.exception(timeout=5), TimeoutError)
+        self.assertEqual(
+            {"timeout": ["1"]},
+            self.requests_mock.request_history[-1].qs,
+        )
+
+    def test_wait_any(self):
+        """The first operation to end is returned."""
+        operation_id, result = self.client.operations.wait_any(
+            ["operation-slow", "operation-fail"], timeout=5
+        )
+
+        self.assertEqual("operation-fail", operation_id)
+        self.assertIsInstance(result, exceptions.LXDAPIException)
+
+    def test_wait_any_timeout(self):
+        """TimeoutError is raised when no operation ends in time."""
+        self.assertRaises(
+            TimeoutError,
+            self.client.operations.wait_any,
+            ["operation-slow"],
+            timeout=1,
+        )
+
+
+class TestOperationProgress(testing.PyLXDTestCase):
+    """Tests for listing operations and following their progress."""
+
+    def add_listing(self):
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "running": [{"id": "operation-1", "status": "Running"}],
+                        "success": [{"id": "operation-2", "status": "Success"}],
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations\?recursion=1$",
+            }
+        )
+
+    def test_all(self):
+        """Operations of every status are returned."""
+        self.add_listing()
+
+        operations = self.client.operations.all()
+
+        self.assertEqual(
+            [("operation-1", "Running"), ("operation-2", "Success")],
+            [(o.id, o.status) for o in operations],
+        )
+
+    def test_all_status(self):
+        """Operations can be filtered by status."""
+        self.add_listing()
+
+        operations = self.client.operations.all(status="Running")
+
+        self.assertEqual(["operation-1"], [o.id for o in operations])
+        self.assertEqual(
+            [], self.client.operations.all(status=["Failure", "Cancelled"])
+        )
+
+    def test_all_recursion_0(self):
+        """Only the ids of the operations are known without recursion."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {"running": ["/1.0/operations/operation-1"]},
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations\?recursion=0$",
+            }
+        )
+
+        operations = self.client.operations.all(recursion=0)
+
+        self.assertEqual(["operation-1"], [o.id for o in operations])
+
+    def test_cancel(self):
+        """Operations are cancelled by deleting them."""
+        self.add_rule(
+            {
+                "json": {"type": "sync", "metadata": {}},
+                "method": "DELETE",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc$",
+            }
+        )
+        operation = models.Operation.get(self.client, "operation-abc")
+
+        operation.cancel()
+
+        self.assertEqual("DELETE", self.requests_mock.request_history[-1].method)
+
+    def tracker(self, *events):
+        """Return a tracker replaying `events` to listeners."""
+        tracker = mock.Mock()
+
+        def listen(operation_id, listener):
+            for event in events:
+                listener(event)
+            return True
+
+        tracker.listen.side_effect = listen
+        return tracker
+
+    def test_iter_progress(self):
+        """The metadata of each event is yielded until the operation ends."""
+        self.client.operation_tracker = self.tracker(
+            {"id": "operation-abc", "status_code": 103, "metadata": {"p": "50%"}},
+            {"id": "operation-abc", "status_code": 200, "metadata": {"p": "100%"}},
+        )
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {
+                        "id": "operation-abc",
+                        "status_code": 103,
+                        "metadata": {"p": "10%"},
+                    },
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc$",
+            }
+        )
+        operation = models.Operation(_client=self.client, id="operation-abc")
+
+        progress = list(operation.iter_progress())
+
+        self.assertEqual([{"p": "10%"}, {"p": "50%"}, {"p": "100%"}], progress)
+        self.assertEqual(200, operation.status_code)
+        self.client.operation_tracker.unlisten.assert_called_once()
+
+    def test_iter_progress_closed(self):
+        """The operation is waited for when the websocket is closed."""
+        self.client.operation_tracker = self.tracker(None)
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": {"id": "operation-abc", "status_code": 103},
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/operations/operation-abc$",
+            }
+        )
+        operation = models.Operation(_client=self.client, id="operation-abc")
+
+        progress = list(operation.iter_progress())
+
+        self.assertEqual("Success", operation.status)
+        self.assertEqual(2, len(progress))
+
+    def test_iter_progress_events_unavailable(self):
+        """Only the final metadata is yielded without operation events."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.listen.return_value = False
+        operation = models.Operation(_client=self.client, id="operation-abc")
+
+        progress = list(operation.iter_progress())
+
+        self.assertEqual(1, len(progress))
+        self.assertEqual("Success", operation.status)
+
+    @mock.patch("pylxd.models.operation._OperationTracker")
+    def test_iter_progress_untracked(self, Tracker):
+        """A websocket is opened for the iteration of untracked clients."""
+        Tracker.return_value.listen.return_value = False
+        operation = models.Operation(_client=self.client, id="operation-abc")
+
+        list(operation.iter_progress())
+
+        Tracker.assert_called_once_with(self.client)
+        Tracker.return_value.close.assert_called_once_with()
+
+    def test_future_iter_progress(self):
+        """Futures follow the progress of their operation."""
+        self.client.operation_tracker = mock.Mock()
+        self.client.operation_tracker.listen.return_value = False
+        future = models.OperationFuture(self.client, "operation-abc")
+
+        progress = list(future.iter_progress())
+
+        self.assertEqual(progress[-1], future.metadata)
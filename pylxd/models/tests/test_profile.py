@@ -87,6 +87,44 @@ class TestProfile(testing.PyLXDTestCase):
 
         self.assertEqual(1, len(profiles))
 
+    def test_all_hydrated(self):
+        """Profiles are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {
+                            "name": "default",
+                            "description": "Default",
+                            "config": {},
+                            "devices": {},
+                        }
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/profiles\?recursion=1$",
+            }
+        )
+
+        result = models.Profile.all(self.client)
+
+        self.assertEqual("Default", result[0].description)
+        self.assertFalse(result[0].dirty)
+
+    def test_iter_all(self):
+        """Profiles are streamed from the listing one at a time."""
+        profiles = list(models.Profile.iter_all(self.client))
+
+        self.assertEqual(["an-profile"], [p.name for p in profiles])
+
+    def test_all_names(self):
+        """With recursion=0 only the names are fetched."""
+        profiles = models.Profile.all(self.client, recursion=0)
+
+        self.assertEqual("an-profile", profiles[0].name)
+        self.assertEqual("recursion=0", self.requests_mock.last_request.query)
+
     def test_create(self):
         """A new profile is created."""
         an_profile = models.Profile.create(
@@ -300,7 +338,7 @@ class TestProfileAsync(testing.PyLXDTestCase):
                     "metadata": [f"/1.0/profiles/{name}" for name in profiles],
                 },
                 "method": "GET",
-                "url": r"^http://pylxd.test/1.0/profiles$",
+                "url": r"^http://pylxd.test/1.0/profiles(\?recursion=\d)?$",
             }
         )
 
@@ -87,6 +87,26 @@ class TestProject(testing.PyLXDTestCase):
 
         self.assertEqual(1, len(projects))
 
+    def test_all_hydrated(self):
+        """Projects are fetched in full with a single request."""
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "default", "description": "Default", "config": {}}
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/projects\?recursion=1$",
+            }
+        )
+
+        result = models.Project.all(self.client)
+
+        self.assertEqual("Default", result[0].description)
+        self.assertFalse(result[0].dirty)
+
     def test_create(self):
         """A new project is created."""
 
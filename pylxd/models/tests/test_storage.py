@@ -37,6 +37,25 @@ class TestStoragePool(testing.PyLXDTestCase):
         storage_pools = models.StoragePool.all(self.client)
         self.assertEqual(1, len(storage_pools))
 
+    def test_all_hydrated(self):
+        """Storage pools are fetched in full with a single request."""
+        testing.add_api_extension_helper(self, ["storage"])
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [{"name": "default", "driver": "zfs", "config": {}}],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/storage-pools\?recursion=1$",
+            }
+        )
+
+        result = models.StoragePool.all(self.client)
+
+        self.assertEqual("zfs", result[0].driver)
+        self.assertFalse(result[0].dirty)
+
     def test_get(self):
         """Return a container."""
         name = "lxd"
@@ -194,6 +213,28 @@ class TestStorageVolume(testing.PyLXDTestCase):
         self.assertEqual(volumes[8].type, "custom")
         self.assertEqual(volumes[8].name, "cu1")
 
+    def test_all_hydrated(self):
+        """Storage volumes are fetched in full with a single request."""
+        testing.add_api_extension_helper(self, ["storage"])
+        self.add_rule(
+            {
+                "json": {
+                    "type": "sync",
+                    "metadata": [
+                        {"name": "cu1", "type": "custom", "config": {"size": "1GiB"}}
+                    ],
+                },
+                "method": "GET",
+                "url": r"^http://pylxd.test/1.0/storage-pools/lxd/volumes\?recursion=1$",
+            }
+        )
+
+        result = models.StoragePool(self.client, name="lxd").volumes.all()
+
+        self.assertEqual("cu1", result[0].name)
+        self.assertEqual({"size": "1GiB"}, result[0].config)
+        self.assertEqual("lxd", result[0].storage_pool.name)
+
     def test_get(self):
         a_storage_pool = models.StoragePool(self.client, name="lxd")
 
@@ -210,7 +210,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/certificates$",
+        "url": r"^http://pylxd.test/1.0/certificates(\?recursion=\d)?$",
     },
     {
         "method": "POST",
@@ -299,7 +299,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/cluster/members$",
+        "url": r"^http://pylxd.test/1.0/cluster/members(\?recursion=\d)?$",
     },
     {
         "text": json.dumps(
@@ -573,7 +573,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/instances/an-instance/snapshots$",
+        "url": r"^http://pylxd.test/1.0/instances/an-instance/snapshots(\?recursion=\d)?$",
     },
     {
         "text": json.dumps(
@@ -645,7 +645,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/images$",
+        "url": r"^http://pylxd.test/1.0/images(\?recursion=\d)?$",
     },
     {
         "text": images_POST,
@@ -811,7 +811,7 @@ RULES = [
             ],
         },
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/networks$",
+        "url": r"^http://pylxd.test/1.0/networks(\?recursion=\d)?$",
     },
     {
         "text": networks_POST,
@@ -923,7 +923,7 @@ RULES = [
             ],
         },
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/storage-pools$",
+        "url": r"^http://pylxd.test/1.0/storage-pools(\?recursion=\d)?$",
     },
     {
         "json": {
@@ -988,7 +988,7 @@ RULES = [
             ],
         },
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/storage-pools/lxd/volumes$",
+        "url": r"^http://pylxd.test/1.0/storage-pools/lxd/volumes(\?recursion=\d)?$",
     },
     # create a sync storage volume
     {
@@ -1098,7 +1098,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/profiles$",
+        "url": r"^http://pylxd.test/1.0/profiles(\?recursion=\d)?$",
     },
     {
         "text": profiles_POST,
@@ -1136,7 +1136,7 @@ RULES = [
             }
         ),
         "method": "GET",
-        "url": r"^http://pylxd.test/1.0/projects$",
+        "url": r"^http://pylxd.test/1.0/projects(\?recursion=\d)?$",
     },
     {
         "text": projects_GET,
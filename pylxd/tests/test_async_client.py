@@ -0,0 +1,402 @@
+# Copyright (c) 2026 Canonical Ltd
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import asyncio
+import json
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from urllib import parse
+
+from pylxd import exceptions, models
+from pylxd.async_client import AsyncClient
+
+HOST_INFO = {
+    "auth": "trusted",
+    "environment": {"certificate": "a-pem-cert"},
+    "api_extensions": ["projects"],
+}
+
+INSTANCE = {
+    "name": "an-instance",
+    "architecture": "x86_64",
+    "config": {},
+    "devices": {},
+    "status": "Running",
+    "status_code": 103,
+}
+
+
+class FakeLXD:
+    """A minimal HTTP/1.1 server standing in for LXD on a unix socket."""
+
+    def __init__(self, path):
+        self.path = path
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self.close_after_response = False
+        self.chunked = False
+
+    def route(self, method, path, body, status=200, headers=None):
+        self.routes[(method, path)] = (status, body, headers or {})
+
+    async def start(self):
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ")
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                parsed = parse.urlparse(target)
+                self.requests.append(
+                    (method, parsed.path, parse.parse_qs(parsed.query), body)
+                )
+
+                status, payload, extra_headers = self.routes.get(
+                    (method, parsed.path),
+                    (
+                        404,
+                        {"type": "error", "error": "not found", "error_code": 404},
+                        {},
+                    ),
+                )
+                if callable(payload):
+                    payload = await payload()
+                content = json.dumps(payload).encode()
+                head = f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                head += "".join(f"{k}: {v}\r\n" for k, v in extra_headers.items())
+                if self.chunked:
+                    half = len(content) // 2
+                    writer.write(
+                        f"{head}Transfer-Encoding: chunked\r\n\r\n".encode()
+                        + f"{half:x}\r\n".encode()
+                        + content[:half]
+                        + f"\r\n{len(content) - half:x}\r\n".encode()
+                        + content[half:]
+                        + b"\r\n0\r\n\r\n"
+                    )
+                else:
+                    writer.write(
+                        f"{head}Content-Length: {len(content)}\r\n\r\n".encode()
+                        + content
+                    )
+                await writer.drain()
+                if self.close_after_response:
+                    break
+        finally:
+            writer.close()
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+    """Tests for pylxd.async_client.AsyncClient."""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "unix.socket")
+        self.lxd = FakeLXD(self.socket_path)
+        self.lxd.route("GET", "/1.0", {"type": "sync", "metadata": HOST_INFO})
+        self.lxd.route(
+            "GET",
+            "/1.0/instances/an-instance",
+            {"type": "sync", "metadata": INSTANCE},
+        )
+        await self.lxd.start()
+
+    async def asyncTearDown(self):
+        await self.lxd.stop()
+        self.tmpdir.cleanup()
+
+    async def test_connect(self):
+        """Connecting fetches the host information."""
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            self.assertTrue(client.trusted)
+            self.assertTrue(client.has_api_extension("projects"))
+
+    async def test_connect_failed(self):
+        """A missing socket raises ClientConnectionFailed."""
+        client = AsyncClient(endpoint=os.path.join(self.tmpdir.name, "missing"))
+        with self.assertRaises(exceptions.ClientConnectionFailed):
+            await client.connect()
+
+    async def test_connect_project_not_supported(self):
+        """Projects require the 'projects' api extension."""
+        self.lxd.route(
+            "GET",
+            "/1.0",
+            {"type": "sync", "metadata": {**HOST_INFO, "api_extensions": []}},
+        )
+        client = AsyncClient(endpoint=self.socket_path, project="other")
+        with self.assertRaises(exceptions.ClientConnectionFailed):
+            await client.connect()
+
+    async def test_get_instance(self):
+        """Managers return populated pylxd models."""
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            instance = await client.instances.get("an-instance")
+
+        self.assertIsInstance(instance, models.Instance)
+        self.assertEqual("Running", instance.status)
+        self.assertFalse(instance.dirty)
+
+    async def test_unsupported_arguments(self):
+        """Request arguments the session doesn't support raise TypeError."""
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            with self.assertRaises(TypeError):
+                await client.api.instances["an-instance"].get(stream=True)
+
+    async def test_get_not_found(self):
+        """A missing object raises NotFound."""
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            with self.assertRaises(exceptions.NotFound):
+                await client.instances.get("missing")
+            self.assertFalse(await client.instances.exists("missing"))
+            self.assertTrue(await client.instances.exists("an-instance"))
+
+    async def test_all_hydrated(self):
+        """all() fetches complete objects in one request."""
+        self.lxd.route(
+            "GET", "/1.0/instances", {"type": "sync", "metadata": [INSTANCE]}
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            instances = await client.instances.all()
+
+        self.assertEqual("an-instance", instances[0].name)
+        self.assertEqual("x86_64", instances[0].architecture)
+        self.assertEqual({"recursion": ["1"]}, self.lxd.requests[-1][2])
+
+    async def test_all_names(self):
+        """all(recursion=0) only sets the name."""
+        self.lxd.route(
+            "GET",
+            "/1.0/profiles",
+            {"type": "sync", "metadata": ["/1.0/profiles/default?project=p"]},
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            profiles = await client.profiles.all(recursion=0)
+
+        self.assertEqual("default", profiles[0].name)
+
+    async def test_project(self):
+        """The project is passed as a query parameter."""
+        async with AsyncClient(endpoint=self.socket_path, project="p") as client:
+            await client.instances.get("an-instance")
+
+        self.assertEqual({"project": ["p"]}, self.lxd.requests[-1][2])
+
+    async def test_gather_reuses_connections(self):
+        """Concurrent requests share a bounded pool of connections."""
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return {"type": "sync", "metadata": INSTANCE}
+
+        self.lxd.route("GET", "/1.0/instances/an-instance", slow)
+        async with AsyncClient(endpoint=self.socket_path, pool_maxsize=4) as client:
+            results = await asyncio.gather(
+                *(client.instances.get("an-instance") for _ in range(50))
+            )
+
+        self.assertEqual(50, len(results))
+        self.assertLessEqual(self.lxd.connections, 4)
+
+    async def test_server_closes_connection(self):
+        """An idle connection closed by the server is replaced."""
+        self.lxd.close_after_response = True
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            await asyncio.sleep(0.01)
+            instance = await client.instances.get("an-instance")
+
+        self.assertEqual("an-instance", instance.name)
+        self.assertEqual(2, self.lxd.connections)
+
+    async def test_chunked_response(self):
+        """Chunked transfer encoding is decoded."""
+        self.lxd.chunked = True
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            instance = await client.instances.get("an-instance")
+
+        self.assertEqual("an-instance", instance.name)
+
+    async def test_create_wait(self):
+        """Creating an instance waits for the operation."""
+        self.lxd.route(
+            "POST",
+            "/1.0/instances",
+            {"type": "async", "operation": "/1.0/operations/op-1", "metadata": {}},
+            status=202,
+        )
+        self.lxd.route(
+            "GET",
+            "/1.0/operations/op-1/wait",
+            {
+                "type": "sync",
+                "metadata": {"id": "op-1", "status": "Success", "status_code": 200},
+            },
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            instance = await client.containers.create(
+                {"name": "an-instance"}, wait=True
+            )
+
+        self.assertEqual("Running", instance.status)
+        post = [r for r in self.lxd.requests if r[0] == "POST"][0]
+        self.assertEqual(
+            {"name": "an-instance", "type": "container"}, json.loads(post[3])
+        )
+
+    async def test_wait_for_operation_failure(self):
+        """A failed operation raises LXDAPIException."""
+        self.lxd.route(
+            "GET",
+            "/1.0/operations/op-1/wait",
+            {
+                "type": "sync",
+                "metadata": {"id": "op-1", "status": "Failure", "err": "boom"},
+            },
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            with self.assertRaises(exceptions.LXDAPIException) as cm:
+                await client.operations.wait_for_operation("op-1")
+
+        self.assertEqual("boom", str(cm.exception))
+
+    async def test_set_state(self):
+        """Instance state changes are sent to the state endpoint."""
+        self.lxd.route(
+            "PUT",
+            "/1.0/instances/an-instance/state",
+            {"type": "async", "operation": "/1.0/operations/op-1"},
+            status=202,
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            await client.instances.stop("an-instance")
+
+        method, path, _, body = self.lxd.requests[-1]
+        self.assertEqual(("PUT", "/1.0/instances/an-instance/state"), (method, path))
+        self.assertEqual("stop", json.loads(body)["action"])
+
+    async def test_json_codec(self):
+        """Bodies are encoded and decoded with the JSON codec."""
+        calls = []
+
+        class Codec:
+            def loads(self, data):
+                calls.append("loads")
+                return json.loads(data)
+
+            def dumps(self, obj):
+                calls.append("dumps")
+                return json.dumps(obj)
+
+        self.lxd.route(
+            "POST", "/1.0/profiles", {"type": "sync", "metadata": {}}, status=201
+        )
+        self.lxd.route(
+            "GET",
+            "/1.0/profiles/a-profile",
+            {"type": "sync", "metadata": {"name": "a-profile"}},
+        )
+        async with AsyncClient(endpoint=self.socket_path, json_codec=Codec()) as client:
+            await client.profiles.create({"name": "a-profile"})
+
+        self.assertEqual({"name": "a-profile"}, json.loads(self.lxd.requests[1][3]))
+        self.assertIn("dumps", calls)
+        self.assertIn("loads", calls)
+
+    async def test_create_key_from_location(self):
+        """Objects whose key LXD assigns are found from the Location."""
+        fingerprint = "eaf55b72fc23aa516d709271df9b0116064bf8cfa009cf34c67c33ad32c2320c"
+        self.lxd.route(
+            "POST",
+            "/1.0/certificates",
+            {"type": "sync", "metadata": {}},
+            status=201,
+            headers={"Location": f"/1.0/certificates/{fingerprint}"},
+        )
+        self.lxd.route(
+            "GET",
+            f"/1.0/certificates/{fingerprint}",
+            {"type": "sync", "metadata": {"fingerprint": fingerprint}},
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            certificate = await client.certificates.create(
+                {"type": "client", "certificate": "a-cert"}
+            )
+
+        self.assertEqual(fingerprint, certificate.fingerprint)
+
+    async def test_create_key_from_operation(self):
+        """The key of objects created asynchronously is found from the
+        resources of the operation."""
+        self.lxd.route(
+            "POST",
+            "/1.0/storage-pools",
+            {"type": "async", "operation": "/1.0/operations/op-1", "metadata": {}},
+            status=202,
+            headers={"Location": "/1.0/operations/op-1"},
+        )
+        self.lxd.route(
+            "GET",
+            "/1.0/operations/op-1/wait",
+            {
+                "type": "sync",
+                "metadata": {
+                    "id": "op-1",
+                    "status": "Success",
+                    "status_code": 200,
+                    "resources": {"storage_pools": ["/1.0/storage-pools/a-pool"]},
+                },
+            },
+        )
+        self.lxd.route(
+            "GET",
+            "/1.0/storage-pools/a-pool",
+            {"type": "sync", "metadata": {"name": "a-pool", "driver": "dir"}},
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            pool = await client.storage_pools.create({"driver": "dir"})
+
+        self.assertEqual("a-pool", pool.name)
+
+    async def test_all_filter(self):
+        """Filters are applied client side without api_filtering."""
+        self.lxd.route(
+            "GET",
+            "/1.0/instances",
+            {
+                "type": "sync",
+                "metadata": [INSTANCE, {**INSTANCE, "name": "b", "status": "Stopped"}],
+            },
+        )
+        async with AsyncClient(endpoint=self.socket_path) as client:
+            instances = await client.instances.all(filter={"status": "Stopped"})
+
+        self.assertEqual(["b"], [i.name for i in instances])
+        self.assertNotIn("filter", self.lxd.requests[-1][2])
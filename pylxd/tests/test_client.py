@@ -12,8 +12,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 import base64
+import hashlib
+import http.server
+import io
 import json
 import os
+import socket
+import socketserver
+import ssl
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, mock
 from urllib import parse
 
@@ -22,6 +31,7 @@ import requests
 import requests.adapters
 
 from pylxd import client, exceptions
+from pylxd.tests import testing
 
 
 class TestClient(TestCase):
@@ -206,7 +216,7 @@ class TestClient(TestCase):
             },
             {"metadata": {"auth": "trusted"}},
         ]
-        self.get.return_value = response
+        self.get.side_effect = lambda *args, **kwargs: client._APIResponse(response)
 
         certs = (
             os.path.join(os.path.dirname(__file__), "lxd.crt"),
@@ -241,7 +251,7 @@ class TestClient(TestCase):
                 }
             },
         ]
-        self.get.return_value = response
+        self.get.side_effect = lambda *args, **kwargs: client._APIResponse(response)
 
         certs = (
             os.path.join(os.path.dirname(__file__), "lxd.crt"),
@@ -294,7 +304,7 @@ class TestClient(TestCase):
                 }
             },
         ]
-        self.get.return_value = response
+        self.get.side_effect = lambda *args, **kwargs: client._APIResponse(response)
 
         certs = (
             os.path.join(os.path.dirname(__file__), "lxd.crt"),
@@ -326,6 +336,26 @@ class TestClient(TestCase):
         ws_client = an_client.events()
 
         self.assertEqual("/1.0/events", ws_client.resource)
+        self.assertIsNone(ws_client.json_codec)
+
+    def test_events_project(self):
+        """Events are subscribed to for the project of the client."""
+        an_client = client.Client(project="default")
+
+        ws_client = an_client.events(event_types={client.EventType.Operation})
+
+        self.assertEqual(
+            "/1.0/events?project=default&type=operation", ws_client.resource
+        )
+
+    def test_events_json_codec(self):
+        """The events client decodes with the client's JSON codec."""
+        codec = _FakeCodec()
+        an_client = client.Client(json_codec=codec)
+
+        ws_client = an_client.events()
+
+        self.assertIs(codec, ws_client.json_codec)
 
     def test_events_unix_socket(self):
         """A unix socket compatible websocket client is returned."""
@@ -519,6 +549,52 @@ class TestAPINode(TestCase):
         node.get()
         session.get.assert_called_once_with("http://test.com", timeout=None)
 
+    def test_json_codec(self):
+        """Request and response bodies use the JSON codec."""
+        codec = _FakeCodec()
+        response = mock.Mock(
+            status_code=200, content=b'{"type": "sync", "metadata": {"a": 1}}'
+        )
+        session = mock.Mock(**{"put.return_value": response})
+        node = client._APINode("http://test.com", session, json_codec=codec)
+
+        result = node.instances.put(json={"b": 2})
+
+        session.put.assert_called_once_with(
+            "http://test.com/instances",
+            timeout=None,
+            data=b'{"b": 2}',
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual({"a": 1}, result.metadata)
+        self.assertEqual(["dumps", "loads"], codec.calls)
+        response.json.assert_not_called()
+
+    def test_response_envelope(self):
+        """The response body is decoded once and its envelope exposed."""
+        response = mock.Mock(
+            **{
+                "status_code": 202,
+                "headers": {"ETag": "an-etag"},
+                "json.return_value": {
+                    "type": "async",
+                    "operation": "/1.0/operations/op",
+                    "metadata": {"id": "op"},
+                },
+            }
+        )
+        session = mock.Mock(**{"put.return_value": response})
+        node = client._APINode("http://test.com", session)
+
+        result = node.put()
+
+        self.assertEqual("async", result.type)
+        self.assertEqual("/1.0/operations/op", result.operation)
+        self.assertEqual({"id": "op"}, result.metadata)
+        self.assertEqual("an-etag", result.etag)
+        self.assertEqual(202, result.status_code)
+        self.assertEqual(1, response.json.call_count)
+
     @mock.patch("pylxd.client.requests.Session")
     def test_post(self, Session):
         """Perform a session post."""
@@ -608,6 +684,99 @@ class TestAPINode(TestCase):
         session.delete.assert_called_once_with("http://test.com", timeout=None)
 
 
+class _FakeCodec:
+    """A JSON codec counting its calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def loads(self, data):
+        self.calls.append("loads")
+        return json.loads(data)
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return json.dumps(obj).encode("utf-8")
+
+
+class TestGetJSONCodec(TestCase):
+    """Tests for pylxd.client._get_json_codec."""
+
+    def test_stdlib(self):
+        """The standard library is the default."""
+        self.assertIsNone(client._get_json_codec(None))
+        self.assertIsNone(client._get_json_codec("json"))
+
+    def test_custom(self):
+        """Any object with loads and dumps is a codec."""
+        codec = _FakeCodec()
+        self.assertIs(codec, client._get_json_codec(codec))
+
+    def test_unknown(self):
+        """Unknown codecs raise ValueError."""
+        self.assertRaises(ValueError, client._get_json_codec, "simplejson")
+        self.assertRaises(ValueError, client._get_json_codec, object())
+
+    @mock.patch("pylxd.client.importlib.import_module")
+    def test_named(self, import_module):
+        """Named codecs are imported."""
+        self.assertIs(import_module.return_value, client._get_json_codec("orjson"))
+        import_module.assert_called_once_with("orjson")
+
+    @mock.patch("pylxd.client.importlib.import_module")
+    def test_auto(self, import_module):
+        """auto picks the first installed codec."""
+        ujson = mock.Mock()
+        import_module.side_effect = [ImportError, ujson]
+        self.assertIs(ujson, client._get_json_codec("auto"))
+
+    @mock.patch("pylxd.client.importlib.import_module")
+    def test_auto_none_installed(self, import_module):
+        """auto falls back to the standard library."""
+        import_module.side_effect = ImportError
+        self.assertIsNone(client._get_json_codec("auto"))
+
+
+class TestIterJSONMetadata(TestCase):
+    """Tests for pylxd.client._iter_json_metadata."""
+
+    def test_chunks(self):
+        """Items are parsed across chunk boundaries, whatever their size."""
+        body = json.dumps(
+            {
+                "type": "sync",
+                "status_code": 200,
+                "metadata": [{"name": f"\u00e9-{i}", "n": i} for i in range(20)],
+                "operation": "",
+            }
+        ).encode("utf-8")
+        for size in (1, 7, 1024):
+            chunks = [body[i : i + size] for i in range(0, len(body), size)]
+            self.assertEqual(
+                json.loads(body)["metadata"], list(client._iter_json_metadata(chunks))
+            )
+
+    def test_numbers_split(self):
+        """Numbers split across chunks, e.g. after "." or "e", are whole."""
+        body = b'{"metadata": [15000000000.0, 1e5, -2.5E-3, 42, [7]]}'
+        for size in (1, 2, 3):
+            chunks = [body[i : i + size] for i in range(0, len(body), size)]
+            self.assertEqual(
+                [15000000000.0, 1e5, -2.5e-3, 42, [7]],
+                list(client._iter_json_metadata(chunks)),
+            )
+
+    def test_no_listing(self):
+        """Nothing is yielded if metadata is not an array."""
+        for body in (b"{}", b'{"metadata": []}', b'{"metadata": {"a": [1]}}'):
+            self.assertEqual([], list(client._iter_json_metadata([body])))
+
+    def test_invalid(self):
+        """A truncated body raises ValueError."""
+        with self.assertRaises(ValueError):
+            list(client._iter_json_metadata([b'{"metadata": [{"a": 1},']))
+
+
 class TestWebsocketClient(TestCase):
     """Tests for pylxd.client.WebsocketClient."""
 
@@ -625,6 +794,234 @@ class TestWebsocketClient(TestCase):
         ws_client.received_message(message)
         self.assertEqual({"test": "data"}, ws_client.messages[0])
 
+    def test_received_message_json_codec(self):
+        """Messages are decoded with the JSON codec."""
+        message = mock.Mock(data=json.dumps({"test": "data"}).encode("utf-8"))
+        ws_client = client._WebsocketClient("ws://an/fake/path")
+        ws_client.json_codec = _FakeCodec()
+        ws_client.handshake_ok()
+        ws_client.received_message(message)
+        self.assertEqual({"test": "data"}, ws_client.messages[0])
+        self.assertEqual(["loads"], ws_client.json_codec.calls)
+
+
+class TestOperationTracker(testing.PyLXDTestCase):
+    """Tests for pylxd.client._OperationTracker."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = client.Client(endpoint="http://pylxd.test", track_operations=True)
+        self.tracker = self.client.operation_tracker
+        self.websocket = mock.Mock()
+        self.events_patcher = mock.patch.object(
+            client.Client, "events", return_value=self.websocket
+        )
+        self.events = self.events_patcher.start()
+
+    def tearDown(self):
+        self.events_patcher.stop()
+        super().tearDown()
+
+    def add_operation(self, status_code, callback=None):
+        def operation(request, context):
+            if callback is not None:
+                callback()
+            return {
+                "type": "sync",
+                "metadata": {"id": "operation-1", "status_code": status_code},
+            }
+
+        self.requests_mock.register_uri(
+            "GET", "http://pylxd.test/1.0/operations/operation-1", json=operation
+        )
+
+    def test_disabled_by_default(self):
+        """Clients don't track operations unless asked to."""
+        self.assertIsNone(client.Client(endpoint="http://pylxd.test").operation_tracker)
+
+    def test_wait(self):
+        """Waiters are woken by the event reporting the operation's end."""
+        event = {
+            "type": "operation",
+            "metadata": {"id": "operation-1", "status": "Success", "status_code": 200},
+        }
+        self.add_operation(103, lambda: self.tracker._received(event))
+
+        metadata = self.tracker.wait("operation-1")
+
+        self.assertEqual(event["metadata"], metadata)
+        self.events.assert_called_once_with(
+            websocket_client=client._OperationEventsClient,
+            event_types={client.EventType.Operation},
+        )
+        self.websocket.connect.assert_called_once_with()
+        self.assertIs(self.tracker, self.websocket.tracker)
+        self.assertEqual({}, self.tracker._waiters)
+
+    def test_connect_without_lock(self):
+        """The websocket handshake is done without holding the lock."""
+        self.add_operation(200)
+        self.websocket.connect.side_effect = lambda: self.assertFalse(
+            self.tracker._lock.locked()
+        )
+
+        self.tracker.wait("operation-1")
+
+        self.websocket.connect.assert_called_once_with()
+
+    def test_wait_ignores_running(self):
+        """Events of operations still running don't wake waiters."""
+        self.add_operation(
+            103,
+            lambda: self.tracker._received(
+                {"metadata": {"id": "operation-1", "status_code": 103}}
+            ),
+        )
+
+        with ThreadPoolExecutor(1) as executor:
+            future = executor.submit(self.tracker.wait, "operation-1")
+            while not self.tracker._waiters:
+                threading.Event().wait(0.01)
+            self.assertFalse(future.done())
+            self.tracker._received(
+                {"metadata": {"id": "operation-1", "status_code": 400}}
+            )
+
+            self.assertEqual(400, future.result(timeout=5)["status_code"])
+
+    def test_wait_timeout(self):
+        """TimeoutError is raised when the operation doesn't end in time."""
+        self.add_operation(103)
+
+        self.assertRaises(TimeoutError, self.tracker.wait, "operation-1", 0.01)
+        self.assertEqual({}, self.tracker._waiters)
+
+    def test_wait_ended(self):
+        """Operations which ended before subscribing aren't waited for."""
+        self.add_operation(200)
+
+        metadata = self.tracker.wait("operation-1")
+
+        self.assertEqual(200, metadata["status_code"])
+        self.assertEqual({}, self.tracker._waiters)
+
+    def test_wait_not_found(self):
+        """Errors fetching the operation are raised, forgetting the waiter."""
+        self.requests_mock.register_uri(
+            "GET",
+            "http://pylxd.test/1.0/operations/operation-1",
+            status_code=404,
+            json={"type": "error", "error": "not found", "error_code": 404},
+        )
+
+        self.assertRaises(exceptions.LXDAPIException, self.tracker.wait, "operation-1")
+        self.assertEqual({}, self.tracker._waiters)
+
+    def test_wait_reuses_websocket(self):
+        """A single websocket is opened for all operations."""
+        self.add_operation(200)
+
+        self.tracker.wait("operation-1")
+        self.tracker.wait("operation-1")
+
+        self.events.assert_called_once()
+
+    def test_wait_events_unavailable(self):
+        """None is returned when the websocket can't be opened."""
+        self.websocket.connect.side_effect = OSError
+
+        self.assertIsNone(self.tracker.wait("operation-1"))
+        self.assertEqual({}, self.tracker._waiters)
+
+    def test_wait_events_unavailable_backoff(self):
+        """The websocket isn't opened again until retry_interval passed."""
+        self.websocket.connect.side_effect = OSError
+
+        with mock.patch.object(client.time, "monotonic", return_value=100):
+            self.assertIsNone(self.tracker.wait("operation-1"))
+            self.assertIsNone(self.tracker.wait("operation-1"))
+        self.websocket.connect.assert_called_once_with()
+
+        self.websocket.connect.side_effect = None
+        self.add_operation(200)
+        with mock.patch.object(
+            client.time, "monotonic", return_value=100 + self.tracker.retry_interval
+        ):
+            self.assertEqual(200, self.tracker.wait("operation-1")["status_code"])
+        self.assertEqual(2, self.websocket.connect.call_count)
+
+    def test_closed(self):
+        """Waiters are given None when the websocket is closed."""
+        self.add_operation(103, lambda: self.tracker._closed(self.websocket))
+
+        self.assertIsNone(self.tracker.wait("operation-1"))
+        self.assertEqual({}, self.tracker._waiters)
+
+        # The websocket is opened again for the next operation.
+        self.tracker.wait("operation-1")
+        self.assertEqual(2, self.events.call_count)
+
+    def test_closed_stale(self):
+        """Closing a websocket no longer in use doesn't affect waiters."""
+        self.add_operation(200)
+        self.tracker.wait("operation-1")
+
+        self.tracker._closed(mock.Mock())
+
+        self.assertIs(self.websocket, self.tracker._websocket)
+
+    def test_close(self):
+        """The websocket is closed."""
+        self.add_operation(200)
+        self.tracker.wait("operation-1")
+
+        self.tracker.close()
+
+        self.websocket.close.assert_called_once_with()
+
+    def test_listen(self):
+        """Listeners are called with every event of their operation."""
+        listener = mock.Mock()
+        event = {"metadata": {"id": "operation-1", "status_code": 103}}
+
+        self.assertTrue(self.tracker.listen("operation-1", listener))
+        self.tracker._received(event)
+        self.tracker._received({"metadata": {"id": "operation-2"}})
+        self.tracker.unlisten("operation-1", listener)
+        self.tracker._received(event)
+
+        listener.assert_called_once_with(event["metadata"])
+        self.assertEqual({}, self.tracker._listeners)
+
+    def test_listen_closed(self):
+        """Listeners are called with None when the websocket is closed."""
+        listener = mock.Mock()
+        self.tracker.listen("operation-1", listener)
+
+        self.tracker._closed(self.websocket)
+
+        listener.assert_called_once_with(None)
+        self.assertEqual({}, self.tracker._listeners)
+
+    def test_listen_events_unavailable(self):
+        """False is returned when the websocket can't be opened."""
+        self.websocket.connect.side_effect = OSError
+
+        self.assertFalse(self.tracker.listen("operation-1", mock.Mock()))
+        self.assertEqual({}, self.tracker._listeners)
+
+    def test_events_client(self):
+        """The events websocket forwards events to the tracker."""
+        message = mock.Mock(data=json.dumps({"metadata": {}}).encode("utf-8"))
+        ws_client = client._OperationEventsClient("ws://an/fake/path")
+        ws_client.tracker = mock.Mock()
+
+        ws_client.received_message(message)
+        ws_client.closed(1006)
+
+        ws_client.tracker._received.assert_called_once_with({"metadata": {}})
+        ws_client.tracker._closed.assert_called_once_with(ws_client)
+
 
 class TestGetSessionForUrl(TestCase):
     """Tests for pylxd.client.get_session_for_url."""
@@ -653,12 +1050,315 @@ class TestGetSessionForUrl(TestCase):
         session = client.get_session_for_url("http://test.com", cert=certs)
         self.assertEqual(session.cert, certs)
 
+    def test_session_pool_size(self):
+        """pool_maxsize and pool_block are passed to the adapter."""
+        session = client.get_session_for_url(
+            "http+unix://test.com", pool_maxsize=32, pool_block=True
+        )
+        adapter = session.get_adapter("http+unix://")
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+
+        session = client.get_session_for_url("https://test.com", pool_maxsize=32)
+        self.assertEqual(32, session.get_adapter("https://test.com")._pool_maxsize)
+
     def test_session_verify(self):
         """If verify is given, it's set on the Session."""
         session = client.get_session_for_url("http://test.com", verify=True)
         self.assertIs(session.verify, True)
 
 
+class TestLXDSSLAdapter(TestCase):
+    """Tests for pylxd.client.LXDSSLAdapter."""
+
+    def setUp(self):
+        self.verify = os.path.join(os.path.dirname(__file__), "lxd.crt")
+        self.adapter = client.LXDSSLAdapter()
+        self.conn = mock.Mock()
+        load = mock.patch(
+            "pylxd.client.x509.load_pem_x509_certificate",
+            wraps=client.x509.load_pem_x509_certificate,
+        )
+        self.load = load.start()
+        self.addCleanup(load.stop)
+
+    def test_fingerprint_cached(self):
+        """The pinned certificate is only read once."""
+        for _ in range(3):
+            self.adapter.cert_verify(self.conn, "https://lxd", self.verify, None)
+
+        self.assertEqual(1, self.load.call_count)
+        self.assertEqual(64, len(self.conn.assert_fingerprint))
+        self.assertEqual("CERT_NONE", self.conn.cert_reqs)
+
+    def test_reload_fingerprint(self):
+        """reload_fingerprint() reads the certificate again."""
+        self.adapter.cert_verify(self.conn, "https://lxd", self.verify, None)
+        self.adapter.reload_fingerprint(self.verify)
+        self.adapter.cert_verify(self.conn, "https://lxd", self.verify, None)
+
+        self.assertEqual(2, self.load.call_count)
+
+    def test_shared_ssl_context(self):
+        """Every pooled connection uses the same SSL context."""
+        pool = self.adapter.poolmanager.connection_from_url("https://lxd:8443")
+        self.assertIs(self.adapter._ssl_context, pool.conn_kw["ssl_context"])
+
+    def test_client_cert_loaded_once(self):
+        """The client certificate is loaded into the SSL context once, not
+        for each new connection."""
+        directory = os.path.dirname(__file__)
+        cert = (os.path.join(directory, "lxd.crt"), os.path.join(directory, "lxd.key"))
+        # The server closes every connection, so each request opens one.
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ClosingHTTPSHandler)
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(*cert)
+        server.socket = server_context.wrap_socket(server.socket, server_side=True)
+        server.connections = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"https://127.0.0.1:{server.server_port}"
+
+        load_cert_chain = mock.Mock(wraps=ssl.SSLContext.load_cert_chain)
+
+        def counting_load_cert_chain(context, *args, **kwargs):
+            return load_cert_chain(context, *args, **kwargs)
+
+        with mock.patch.object(
+            ssl.SSLContext, "load_cert_chain", counting_load_cert_chain
+        ):
+            session = client.get_session_for_url(url, verify=self.verify, cert=cert)
+            for _ in range(3):
+                # requests prefers REQUESTS_CA_BUNDLE to session.verify.
+                session.get(url + "/1.0", verify=self.verify).raise_for_status()
+
+        self.assertEqual(1, load_cert_chain.call_count)
+        self.assertEqual(3, len(server.connections))
+
+    def test_session_client_cert(self):
+        """Sessions pin the server certificate and load the client one."""
+        directory = os.path.dirname(__file__)
+        cert = (os.path.join(directory, "lxd.crt"), os.path.join(directory, "lxd.key"))
+
+        session = client.get_session_for_url(
+            "https://lxd:8443", verify=self.verify, cert=cert
+        )
+
+        adapter = session.get_adapter("https://lxd:8443")
+        self.assertIsInstance(adapter, client.LXDSSLAdapter)
+        self.assertEqual(cert, adapter._cert)
+
+
+class _ClosingHTTPSHandler(http.server.BaseHTTPRequestHandler):
+    """Reply to GETs, closing the connection after each."""
+
+    def setup(self):
+        super().setup()
+        self.server.connections.append(self.client_address)
+
+    def do_GET(self):
+        content = b'{"type": "sync", "metadata": {}}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixHTTPHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = parse.urlparse(self.path).path
+        if path.endswith("/sftp") and self.headers["Upgrade"] == "sftp":
+            self.send_response(101)
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Upgrade", "sftp")
+            self.end_headers()
+            self.wfile.flush()
+            # Echo what the client sends, upper-cased, until it hangs up.
+            self.close_connection = True
+            while True:
+                data = self.connection.recv(1024)
+                if not data:
+                    return
+                self.connection.sendall(data.upper())
+        content = b'{"type": "sync", "metadata": {}}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        # Reply with the length and sha256 of the body.
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        content = json.dumps(
+            {"type": "sync", "metadata": [len(body), hashlib.sha256(body).hexdigest()]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUnixAdapter(TestCase):
+    """Tests for the pooled unix socket transport."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "unix.socket")
+        self.server = socketserver.ThreadingUnixStreamServer(path, _UnixHTTPHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http+unix://{}".format(parse.quote(path, safe=""))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_pool_shared_across_paths(self):
+        """Requests to different paths reuse one connection."""
+        session = client.get_session_for_url(self.url)
+        for path in ("/1.0", "/1.0/instances", "/1.0/images"):
+            session.get(self.url + path).raise_for_status()
+
+        adapter = session.get_adapter(self.url)
+        self.assertEqual(1, len(adapter.pools))
+        self.assertEqual({"opened": 1, "reused": 2}, adapter.connection_stats())
+
+    def test_pool_maxsize(self):
+        """The pool is sized by pool_maxsize and pool_block."""
+        session = client.get_session_for_url(self.url, pool_maxsize=4, pool_block=True)
+        pool = session.get_adapter(self.url).get_connection(self.url + "/1.0", None)
+        self.assertEqual(4, pool.pool.maxsize)
+        self.assertTrue(pool.block)
+
+    def test_threads_reuse_connections(self):
+        """Threads sharing a session never open more than pool_maxsize."""
+        session = client.get_session_for_url(self.url, pool_maxsize=4, pool_block=True)
+
+        def get(_):
+            session.get(self.url + "/1.0").raise_for_status()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(get, range(64)))
+
+        stats = session.get_adapter(self.url).connection_stats()
+        self.assertLessEqual(stats["opened"], 4)
+        self.assertEqual(64, stats["opened"] + stats["reused"])
+
+    def post_file(self, fp, progress=None):
+        """POST `fp` as a _FileStream, returning the length and sha256 the
+        server received, and whether sendfile was used."""
+        session = client.get_session_for_url(self.url)
+        with mock.patch.object(
+            socket.socket, "sendfile", autospec=True, side_effect=socket.socket.sendfile
+        ) as sendfile:
+            response = session.post(
+                self.url + "/1.0/images", data=client._FileStream(fp, progress)
+            )
+        return response.json()["metadata"], sendfile.called
+
+    def test_sendfile(self):
+        """The rest of a regular file is sent with sendfile."""
+        data = os.urandom(3 * 1024 * 1024 + 10)
+        path = os.path.join(self.tmpdir.name, "file")
+        with open(path, "wb") as f:
+            f.write(data)
+        progress = mock.Mock()
+
+        with open(path, "rb") as fp:
+            fp.read(5)
+            received, used_sendfile = self.post_file(fp, progress)
+            self.assertEqual(len(data), fp.tell())
+
+        self.assertTrue(used_sendfile)
+        self.assertEqual(
+            [len(data) - 5, hashlib.sha256(data[5:]).hexdigest()], received
+        )
+        self.assertEqual(
+            [mock.call(n * 1024 * 1024) for n in (1, 2, 3)]
+            + [mock.call(len(data) - 5)],
+            progress.call_args_list,
+        )
+
+    def test_sendfile_not_a_file(self):
+        """Other file objects are read and sent in chunks."""
+        received, used_sendfile = self.post_file(io.BytesIO(b"data"))
+
+        self.assertFalse(used_sendfile)
+        self.assertEqual([4, hashlib.sha256(b"data").hexdigest()], received)
+
+    def test_file_grown(self):
+        """No more than the length found up front is sent."""
+        fp = io.BytesIO(b"data")
+        stream = client._FileStream(fp)
+        fp.seek(0, io.SEEK_END)
+        fp.write(b" and more")
+        fp.seek(0)
+
+        self.assertEqual(b"data", b"".join(stream))
+
+    def test_chunked_not_forwarded(self):
+        """`chunked` is only passed on if set, as urllib3 < 2 lacks it."""
+        conn = client._UnixSocketHTTPConnection(self.url)
+        with mock.patch.object(
+            client.urllib3.connection.HTTPConnection, "request"
+        ) as request:
+            conn.request("GET", "/1.0")
+            conn.request("POST", "/1.0", body=b"data", chunked=True)
+
+        self.assertEqual(
+            [
+                mock.call("GET", "/1.0", body=None, headers=None),
+                mock.call("POST", "/1.0", body=b"data", headers=None, chunked=True),
+            ],
+            request.call_args_list,
+        )
+
+    def test_upgrade(self):
+        """The socket of an upgraded connection speaks the new protocol."""
+        session = client.get_session_for_url(self.url)
+        node = client._APINode(self.url + "/1.0", session, project="a-project")
+
+        response, sock = node.instances["an-instance"].sftp.upgrade("sftp")
+        sock.sendall(b"hello")
+        self.assertEqual(b"HELLO", sock.recv(5))
+        response.close()
+
+        self.assertEqual(101, response.status_code)
+        self.assertEqual(-1, sock.fileno())
+        # The upgraded connection was not returned to the pool for reuse.
+        session.get(self.url + "/1.0").raise_for_status()
+        stats = session.get_adapter(self.url).connection_stats()
+        self.assertEqual({"opened": 2, "reused": 0}, stats)
+
+    def test_upgrade_timeout(self):
+        """The upgraded socket keeps the read timeout of the client."""
+        session = client.get_session_for_url(self.url)
+        node = client._APINode(self.url + "/1.0", session, timeout=(3, 7))
+
+        response, sock = node.instances["an-instance"].sftp.upgrade("sftp")
+        self.addCleanup(response.close)
+
+        self.assertEqual(7, sock.gettimeout())
+
+    def test_upgrade_refused(self):
+        """An LXDAPIException is raised if the protocol isn't switched."""
+        session = client.get_session_for_url(self.url)
+        node = client._APINode(self.url + "/1.0", session)
+
+        self.assertRaises(exceptions.LXDAPIException, node.upgrade, "sftp")
+
+
 class TestWsExcludeOrigin:
     """Tests for pylxd.client._ws_exclude_origin."""
 
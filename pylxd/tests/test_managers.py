@@ -0,0 +1,47 @@
+# Copyright (c) 2026 Canonical Ltd
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+from unittest import TestCase, mock
+
+from pylxd import managers, models
+
+
+class TestBaseManager(TestCase):
+    """Tests for pylxd.managers.BaseManager."""
+
+    def test_methods_bound(self):
+        """Model class methods are bound to the manager's arguments."""
+        client = mock.Mock()
+        manager = managers.ProfileManager(client)
+
+        self.assertEqual(models.Profile.get, manager.get.func)
+        self.assertEqual((client,), manager.get.args)
+        self.assertIs(manager.get, manager.get)
+
+    def test_methods_cached(self):
+        """Model classes are only inspected once."""
+        managers.ProfileManager(mock.Mock()).get
+        with mock.patch("pylxd.managers.inspect.getmembers") as getmembers:
+            for _ in range(3):
+                managers.ProfileManager(mock.Mock()).all
+
+        getmembers.assert_not_called()
+
+    def test_unknown_method(self):
+        """Unknown attributes raise AttributeError."""
+        manager = managers.ProfileManager(mock.Mock())
+        self.assertFalse(hasattr(manager, "not_a_method"))
+
+    def test_dir(self):
+        """The model's class methods are listed."""
+        self.assertIn("all", dir(managers.ProfileManager(mock.Mock())))